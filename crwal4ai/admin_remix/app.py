@@ -17,7 +17,22 @@ Kullanım:
 """
 
 from flask import Flask, render_template, jsonify, request, make_response
+from browser_pool import get_browser_pool, pool_size_from_env
 from db_manager import db
+from listing_search import relevance_sort, search_condition
+from location_utils import district_condition
+from neighborhood_stats import mahalle_key_sql, rebuild_neighborhood_stats
+from price_sketch import merge_sketches, quartile_fields
+from response_cache import cached_response, response_cache
+from pagination import (
+    LISTING_SORTS,
+    NEW_LISTING_SORT,
+    REMOVED_LISTING_SORT,
+    InvalidCursor,
+    cached_count,
+    keyset_page,
+    order_by,
+)
 import json
 from dotenv import load_dotenv
 import os
@@ -46,6 +61,8 @@ os.environ["DATABASE_URL"] = DATABASE_URL
 # Crawler state
 crawler_running = False
 current_job_id = None
+# Havuzlu (in-process) job'un iptal bayrağı; alt süreç job'larında None
+crawler_stop_event = None
 
 
 # ============================================================================
@@ -97,10 +114,38 @@ def get_transaction_display(transaction: str) -> str:
         "kiralik": "Kiralık",
         "devren": "Devren",
         "gunluk_kiralik": "Günlük Kiralık",
+        "all": "Tümü",
     }
     return mapping.get(transaction.lower(), transaction.title())
 
 
+def fetch_page(table: str, where: str, params: list, spec, page: int, per_page: int):
+    """
+    Sayfa numarası veya cursor (?cursor=...) moduyla satırları ve
+    pagination bilgisini getir. Cursor modunda ilk sayfa için ?cursor= boş verilir.
+    """
+    cursor = request.args.get("cursor")
+    total, approximate = cached_count(table, where, params)
+    pagination = {
+        "per_page": per_page,
+        "total": total,
+        "total_pages": (total + per_page - 1) // per_page,
+        "total_approximate": approximate,
+    }
+
+    if cursor is not None:
+        rows, next_cursor = keyset_page(table, where, params, spec, per_page, cursor)
+        pagination.update(
+            {"mode": "cursor", "next_cursor": next_cursor, "has_more": bool(next_cursor)}
+        )
+        return rows, pagination
+
+    sql = f"SELECT * FROM {table} WHERE {where}{order_by(spec)} LIMIT %s OFFSET %s"
+    rows = db.execute_query(sql, list(params) + [per_page, (page - 1) * per_page])
+    pagination.update({"mode": "page", "page": page})
+    return rows or [], pagination
+
+
 # ============================================================================
 # ROUTES - PAGES
 # ============================================================================
@@ -257,10 +302,59 @@ def api_crawler_start():
 
         # Crawler'ı background thread'de başlat
         def run_crawler():
-            global crawler_running
+            global crawler_running, crawler_stop_event
             crawler_running = True
 
             try:
+                pool = get_browser_pool()
+                if pool:
+                    # Havuzlu mod: Chrome oturumları bu süreçte açık kalır,
+                    # job alt süreç yerine burada ısınmış oturumla çalışır.
+                    # Alt süreç timeout'u yok: süre sınırı ve /api/crawler/stop
+                    # sayfalar arasında kontrol edilir
+                    from sahibinden_crawler import (
+                        CRAWL_JOB_TIMEOUT,
+                        CrawlStopped,
+                        run_crawl_job,
+                    )
+
+                    stop_event = threading.Event()
+                    crawler_stop_event = stop_event
+                    try:
+                        result = run_crawl_job(
+                            categories,
+                            district=district,
+                            max_pages=max_pages,
+                            job_id=job_id,
+                            force=force,
+                            reverse_sort=reverse_sort,
+                            sync=sync,
+                            turbo=turbo,
+                            browser_pool=pool,
+                            stop_event=stop_event,
+                            timeout=CRAWL_JOB_TIMEOUT,
+                        )
+                    except CrawlStopped as e:
+                        print(f"⏹️ {e}")
+                        db.execute_query(
+                            "UPDATE mining_jobs SET status = %s, error = %s WHERE id = %s",
+                            (
+                                "cancelled" if stop_event.is_set() else "failed",
+                                str(e),
+                                job_id,
+                            ),
+                            fetch=False,
+                        )
+                        return
+                    finally:
+                        crawler_stop_event = None
+                    db.execute_query(
+                        "UPDATE mining_jobs SET status = 'completed', error = %s WHERE id = %s",
+                        (json.dumps(result)[-5000:], job_id),
+                        fetch=False,
+                    )
+                    return
+
                 # Python script yolu (Sahibinden Crawler)
                 script_path = os.path.join(
                     os.path.dirname(__file__), "sahibinden_crawler.py"
@@ -402,7 +496,17 @@ def api_crawler_start():
 
 @app.route("/api/crawler/stop", methods=["POST"])
 def api_crawler_stop():
-    """Crawler durdur (şu an desteklenmiyor)"""
+    """Crawler durdur (sadece havuzlu in-process job'lar, bir sonraki sayfadan önce)"""
+    stop_event = crawler_stop_event
+    if crawler_running and stop_event is not None:
+        stop_event.set()
+        return jsonify(
+            {
+                "success": True,
+                "message": "Durdurma istendi, mevcut sayfa bitince duracak",
+                "job_id": current_job_id,
+            }
+        )
     return jsonify(
         {"success": False, "error": "Crawler durdurulamaz. Tamamlanmasını bekleyin."}
     ), 400
@@ -410,7 +514,7 @@ def api_crawler_stop():
 
 @app.route("/api/crawler/start-parallel", methods=["POST"])
 def api_crawler_start_parallel():
-    """Paralel Crawler başlat (2 Chrome worker)"""
+    """Paralel Crawler başlat (N Chrome worker, sayfa kuyruğu)"""
     global crawler_running, current_job_id
 
     if crawler_running:
@@ -423,6 +527,7 @@ def api_crawler_start_parallel():
         max_pages = data.get("max_pages", 100)
         turbo = data.get("turbo", False)
         sync = data.get("sync", False)
+        workers = max(1, int(data.get("workers", 2)))
 
         # Job ID oluştur
         job_id = str(uuid.uuid4())
@@ -444,7 +549,7 @@ def api_crawler_start_parallel():
                         "categories": categories,
                         "district": district,  # YENİ: İlçe config'e eklendi
                         "max_pages": max_pages,
-                        "workers": 2,
+                        "workers": workers,
                         "turbo": turbo,
                         "sync": sync,
                     }
@@ -457,10 +562,39 @@ def api_crawler_start_parallel():
 
         # Paralel Crawler'ı background thread'de başlat
         def run_parallel_crawler():
-            global crawler_running
+            global crawler_running, crawler_stop_event
             crawler_running = True
 
             try:
+                pool = get_browser_pool()
+                if pool:
+                    # Havuzlu mod: worker'lar havuzdan ısınmış oturum kiralar,
+                    # runner job kaydını kendisi tamamlar (durdurulunca
+                    # cancelled / zaman aşımında failed)
+                    from parallel_crawler import ParallelCrawlerRunner
+                    from sahibinden_crawler import CRAWL_JOB_TIMEOUT, CrawlStopped
+
+                    stop_event = threading.Event()
+                    crawler_stop_event = stop_event
+                    try:
+                        ParallelCrawlerRunner(
+                            job_id=job_id,
+                            categories=categories,
+                            max_pages=max_pages,
+                            turbo=turbo,
+                            sync=sync,
+                            workers=workers,
+                            district=district,
+                            browser_pool=pool,
+                            stop_event=stop_event,
+                            timeout=CRAWL_JOB_TIMEOUT,
+                        ).run()
+                    except CrawlStopped as e:
+                        print(f"⏹️ {e}")
+                    finally:
+                        crawler_stop_event = None
+                    return
+
                 # Paralel crawler script yolu
                 script_path = os.path.join(
                     os.path.dirname(__file__), "parallel_crawler.py"
@@ -478,6 +612,8 @@ def api_crawler_start_parallel():
                     str(max_pages),
                     "--job-id",
                     job_id,
+                    "--workers",
+                    str(workers),
                 ]
 
                 if turbo:
@@ -552,7 +688,7 @@ def api_crawler_start_parallel():
         return jsonify(
             {
                 "success": True,
-                "message": "Paralel Crawler başlatıldı (2 Worker)",
+                "message": f"Paralel Crawler başlatıldı ({workers} Worker)",
                 "job_id": job_id,
             }
         )
@@ -597,6 +733,7 @@ def api_category_counts():
 
 
 @app.route("/api/dashboard")
+@cached_response()
 def api_dashboard():
     """Dashboard özet verileri - İlçe Filtreleme Destekli"""
     try:
@@ -604,47 +741,15 @@ def api_dashboard():
         days = int(request.args.get("days", 1))
         district = request.args.get("district", "all")  # YENİ: İlçe parametresi
 
-        # ISO formatında tarih sınırı
-        days_ago = (datetime.now() - timedelta(days=days)).isoformat()
-
-        # İlçe filtresi için SQL condition
-        district_condition = ""
-        district_params = []
-
-        if district and district != "all":
-            district_condition = " AND LOWER(konum) LIKE %s"
-            district_params = [f"%{district.lower()}%"]
-
-        # 1. Toplam İlan Sayısı
-        total_sql = f"SELECT COUNT(*) as count FROM sahibinden_liste WHERE 1=1{district_condition}"
-        total_res = db.execute_one(
-            total_sql, district_params if district_params else None
-        )
-        total_count = total_res["count"] if total_res else 0
-
-        # 2. Yeni İlanlar
-        new_sql = f"SELECT COUNT(*) as count FROM new_listings WHERE created_at >= %s{district_condition}"
-        new_params = [days_ago] + district_params
-        new_res = db.execute_one(new_sql, new_params if district_params else [days_ago])
-        new_listings_count = new_res["count"] if new_res else 0
-
-        # 3. Kaldırılan İlanlar
-        rem_sql = f"SELECT COUNT(*) as count FROM removed_listings WHERE removed_at >= %s{district_condition}"
-        rem_params = [days_ago] + district_params
-        rem_res = db.execute_one(rem_sql, rem_params if district_params else [days_ago])
-        removed_listings_count = rem_res["count"] if rem_res else 0
-
-        # 4. Kategori Dağılımı (db_manager fonksiyonunu kullan)
-        category_data = db.get_category_stats(district=district)
-
-        # 5. Son İşlem (Mining Jobs)
-        last_job_data = db.execute_one(
-            "SELECT * FROM mining_jobs ORDER BY created_at DESC LIMIT 1"
-        )
+        # Sayılar, kategori dağılımı ve son job tek sorguda (tek round-trip);
+        # istekler arası yanıt cache'i crawl olana kadar geçerli
+        summary = db.get_dashboard_summary(district=district, days=days)
+        if summary is None:
+            raise RuntimeError("Dashboard özeti okunamadı")
 
+        job = summary["last_job"]
         last_job = None
-        if last_job_data:
-            job = last_job_data
+        if job:
             last_job = {
                 "id": job.get("id"),
                 "status": job.get("status"),
@@ -661,10 +766,10 @@ def api_dashboard():
             {
                 "success": True,
                 "data": {
-                    "total_listings": total_count,
-                    "new_listings": new_listings_count,
-                    "removed_listings": removed_listings_count,
-                    "categories": category_data,
+                    "total_listings": summary["total_listings"],
+                    "new_listings": summary["new_listings"],
+                    "removed_listings": summary["removed_listings"],
+                    "categories": summary["categories"],
                     "last_job": last_job,
                     "days": days,
                     "district": district,  # YENİ: Seçili ilçe bilgisi
@@ -695,52 +800,50 @@ def api_listings():
         max_price = request.args.get("max_price", type=int)
         start_date = request.args.get("start_date")
         end_date = request.args.get("end_date")
-        sort_by = request.args.get("sort_by", "date_desc")
+        # Arama varken varsayılan sıralama ilgililik (ts_rank)
+        sort_by = request.args.get("sort_by", "relevance" if search else "date_desc")
 
-        sql = "SELECT *, COUNT(*) OVER() as full_count FROM sahibinden_liste WHERE 1=1"
+        where = "1=1"
 
         params = []
 
         if category:
-            sql += " AND category = %s"
+            where += " AND category = %s"
             params.append(category)
         if transaction:
-            sql += " AND transaction = %s"
+            where += " AND transaction = %s"
             params.append(transaction)
         if district:
-            sql += " AND (ilce = %s OR LOWER(konum) LIKE %s)"
-            params.extend([district, f"%{district.lower()}%"])
-        if search:
-            sql += " AND baslik ILIKE %s"
-            params.append(f"%{search}%")
+            district_filter, district_params = district_condition(district)
+            where += district_filter
+            params.extend(district_params)
+        # Başlık araması: Türkçe katlamalı tsvector + GIN (ILIKE taraması yok)
+        search_filter, search_params = search_condition(search)
+        where += search_filter
+        params.extend(search_params)
 
         if min_price is not None:
-            sql += " AND fiyat >= %s"
+            where += " AND fiyat >= %s"
             params.append(min_price)
         if max_price is not None:
-            sql += " AND fiyat <= %s"
+            where += " AND fiyat <= %s"
             params.append(max_price)
         if start_date:
-            sql += " AND crawled_at >= %s"
+            where += " AND crawled_at >= %s"
             params.append(start_date)
         if end_date:
-            sql += " AND crawled_at <= %s"
+            where += " AND crawled_at <= %s"
             params.append(end_date)
 
-        if sort_by == "price_asc":
-            sql += " ORDER BY fiyat ASC"
-        elif sort_by == "price_desc":
-            sql += " ORDER BY fiyat DESC"
+        if sort_by == "relevance" and search_filter:
+            spec = relevance_sort(search)
         else:
-            sql += " ORDER BY crawled_at DESC"
-
-        sql += " LIMIT %s OFFSET %s"
-
-        params.extend([per_page, (page - 1) * per_page])
+            spec = LISTING_SORTS.get(sort_by, LISTING_SORTS["date_desc"])
 
-        # Execute
-        results = db.execute_query(sql, params)
-        total_count = results[0]["full_count"] if results else 0
+        # Execute (sayfa numarası veya cursor modu)
+        results, pagination = fetch_page(
+            "sahibinden_liste", where, params, spec, page, per_page
+        )
 
         # Format
         listings = []
@@ -765,19 +868,10 @@ def api_listings():
                 }
             )
 
-        return jsonify(
-            {
-                "success": True,
-                "data": listings,
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": total_count,
-                    "total_pages": (total_count + per_page - 1) // per_page,
-                },
-            }
-        )
+        return jsonify({"success": True, "data": listings, "pagination": pagination})
 
+    except InvalidCursor as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         return jsonify({"success": False, "error": f"İlanlar alınamadı: {str(e)}"}), 500
 
@@ -790,15 +884,12 @@ def api_new_listings():
         per_page = int(request.args.get("per_page", 20))
         days = int(request.args.get("days", 7))
 
-        # Son X gün
-        date_threshold = (datetime.now() - timedelta(days=days)).isoformat()
-
-        # Query
-        sql = "SELECT *, COUNT(*) OVER() as full_count FROM new_listings WHERE first_seen_at >= %s ORDER BY first_seen_at DESC LIMIT %s OFFSET %s"
-        params = [date_threshold, per_page, (page - 1) * per_page]
+        # Son X gün (eşik DB saatiyle; sayı cache anahtarı sabit kalır)
+        where = "first_seen_at >= NOW() - %s * INTERVAL '1 day'"
 
-        results = db.execute_query(sql, params)
-        total_count = results[0]["full_count"] if results else 0
+        results, pagination = fetch_page(
+            "new_listings", where, [days], NEW_LISTING_SORT, page, per_page
+        )
 
         # Format
         listings = []
@@ -821,19 +912,10 @@ def api_new_listings():
                 }
             )
 
-        return jsonify(
-            {
-                "success": True,
-                "data": listings,
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": total_count,
-                    "total_pages": (total_count + per_page - 1) // per_page,
-                },
-            }
-        )
+        return jsonify({"success": True, "data": listings, "pagination": pagination})
 
+    except InvalidCursor as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         return jsonify(
             {"success": False, "error": f"Yeni ilanlar alınamadı: {str(e)}"}
@@ -848,15 +930,12 @@ def api_removed_listings():
         per_page = int(request.args.get("per_page", 20))
         days = int(request.args.get("days", 30))
 
-        # Son X gün
-        date_threshold = (datetime.now() - timedelta(days=days)).isoformat()
-
-        # Query
-        sql = "SELECT *, COUNT(*) OVER() as full_count FROM removed_listings WHERE removed_at >= %s ORDER BY removed_at DESC LIMIT %s OFFSET %s"
-        params = [date_threshold, per_page, (page - 1) * per_page]
+        # Son X gün (eşik DB saatiyle; sayı cache anahtarı sabit kalır)
+        where = "removed_at >= NOW() - %s * INTERVAL '1 day'"
 
-        results = db.execute_query(sql, params)
-        total_count = results[0]["full_count"] if results else 0
+        results, pagination = fetch_page(
+            "removed_listings", where, [days], REMOVED_LISTING_SORT, page, per_page
+        )
 
         # Format
         listings = []
@@ -885,19 +964,10 @@ def api_removed_listings():
                 }
             )
 
-        return jsonify(
-            {
-                "success": True,
-                "data": listings,
-                "pagination": {
-                    "page": page,
-                    "per_page": per_page,
-                    "total": total_count,
-                    "total_pages": (total_count + per_page - 1) // per_page,
-                },
-            }
-        )
+        return jsonify({"success": True, "data": listings, "pagination": pagination})
 
+    except InvalidCursor as e:
+        return jsonify({"success": False, "error": str(e)}), 400
     except Exception as e:
         return jsonify(
             {"success": False, "error": f"Kaldırılan ilanlar alınamadı: {str(e)}"}
@@ -955,6 +1025,11 @@ def run_maintenance():
         # 2. Geçersiz (fiyatı 0 olan) ilanları temizle
         db.execute_query("DELETE FROM sahibinden_liste WHERE fiyat <= 0", fetch=False)
 
+        # 3. Harita mahalle özetlerini baştan kur, bugünün fiyat özetini yenile
+        rebuild_neighborhood_stats()
+        db.refresh_price_rollup()
+        response_cache.invalidate("maintenance")
+
 
         return jsonify(
             {
@@ -984,26 +1059,38 @@ def stats():
 
 
 @app.route("/api/category-stats")
+@cached_response()
 def api_category_stats():
     """Kategori istatistikleri - Gerçek Zamanlı Veritabanı Sayımlı"""
     try:
-        # Kategori istatistiklerini çek
+        # Kategori istatistikleri + veritabanındaki GERÇEK sayılar tek sorguda
+        # (tek GROUP BY, idx_sahibinden_liste_cat_trans_ilce ile index-only scan;
+        # transaction='all' satırları kategori toplamı ile karşılaştırılır)
         result = db.execute_query(
-            "SELECT * FROM category_stats ORDER BY last_checked_at DESC"
+            """
+            WITH counts AS (
+                SELECT
+                    category,
+                    CASE WHEN GROUPING(transaction) = 1 THEN 'all' ELSE transaction END AS transaction,
+                    COUNT(*) AS count
+                FROM sahibinden_liste
+                GROUP BY GROUPING SETS ((category, transaction), (category))
+            )
+            SELECT cs.*, COALESCE(c.count, 0) AS real_db_count
+            FROM category_stats cs
+            LEFT JOIN counts c
+              ON c.category = cs.category AND c.transaction = cs.transaction
+            ORDER BY cs.last_checked_at DESC
+            """
         )
+        if result is None:
+            raise RuntimeError("category_stats okunamadı")
 
         stats = []
-        for item in result or []:
+        for item in result:
             cat = item["category"]
             trans = item["transaction"]
-
-            # Veritabanındaki GERÇEK sayıyı anlık olarak say (Tutarsızlığı önle)
-            real_db_res = db.execute_one(
-                "SELECT COUNT(*) as count FROM sahibinden_liste WHERE category = %s AND transaction = %s",
-                (cat, trans),
-            )
-
-            real_db_count = real_db_res["count"] if real_db_res else 0
+            real_db_count = item["real_db_count"]
 
             # Farkı yeniden hesapla
             diff = item["sahibinden_count"] - real_db_count
@@ -1111,95 +1198,75 @@ def api_jobs():
         ), 500
 
 
-@app.route("/api/map/neighborhoods")
-def api_map_neighborhoods():
-    """Mahalle bazlı ilan istatistikleri"""
+@app.route("/api/db/pool")
+def api_db_pool():
+    """Veritabanı bağlantı pool metrikleri (bekleme süresi, kullanımdaki, checkout/sn)"""
     try:
-        # Tüm ilanları çek ve mahalle bazlı grupla
-        # Tüm ilanları çek ve mahalle bazlı grupla
-        result = db.execute_query(
-            "SELECT konum, category, transaction, fiyat FROM sahibinden_liste"
-        )
-
-        # Mahalle bazlı gruplama
-        neighborhoods = {}
-
-        for item in result or []:
-            konum = item.get("konum", "")
-            if not konum:
-                continue
-
-            # Mahalle adını parse et (örn: "MerkezYeni Mah." -> "Yeni")
-            mahalle = (
-                konum.replace("Merkez", "")
-                .replace("Köyler", "")
-                .replace(" Mah.", "")
-                .replace(" Mh.", "")
-                .strip()
-            )
+        return jsonify({"success": True, "data": db.pool_stats()})
+    except Exception as e:
+        return jsonify(
+            {"success": False, "error": f"Pool metrikleri alınamadı: {str(e)}"}
+        ), 500
 
-            if not mahalle:
-                continue
-
-            if mahalle not in neighborhoods:
-                neighborhoods[mahalle] = {
-                    "name": mahalle,
-                    "total": 0,
-                    "satilik": 0,
-                    "kiralik": 0,
-                    "konut": 0,
-                    "arsa": 0,
-                    "isyeri": 0,
-                    "bina": 0,
-                    "avg_price": 0,
-                    "min_price": float("inf"),
-                    "max_price": 0,
-                    "prices": [],
-                }
 
-            neighborhoods[mahalle]["total"] += 1
-
-            # Transaction type
-            if item.get("transaction") == "satilik":
-                neighborhoods[mahalle]["satilik"] += 1
-            elif item.get("transaction") == "kiralik":
-                neighborhoods[mahalle]["kiralik"] += 1
-
-            # Category
-            category = item.get("category", "")
-            if category in neighborhoods[mahalle]:
-                neighborhoods[mahalle][category] += 1
-
-            # Price
-            fiyat = item.get("fiyat", 0)
-            if fiyat and fiyat > 0:
-                neighborhoods[mahalle]["prices"].append(fiyat)
-                neighborhoods[mahalle]["min_price"] = min(
-                    neighborhoods[mahalle]["min_price"], fiyat
-                )
-                neighborhoods[mahalle]["max_price"] = max(
-                    neighborhoods[mahalle]["max_price"], fiyat
-                )
+@app.route("/api/browser-pool")
+def api_browser_pool():
+    """Tarayıcı havuzu metrikleri (oturum başına sayfa, bellek, yenilemeler)"""
+    if pool_size_from_env() <= 0:
+        return jsonify({"success": True, "data": {"enabled": False}})
+    try:
+        return jsonify(
+            {"success": True, "data": {"enabled": True, **get_browser_pool().stats()}}
+        )
+    except Exception as e:
+        return jsonify(
+            {"success": False, "error": f"Havuz metrikleri alınamadı: {str(e)}"}
+        ), 500
 
-        # Ortalama fiyat hesapla
-        for mahalle in neighborhoods.values():
-            if mahalle["prices"]:
-                mahalle["avg_price"] = int(
-                    sum(mahalle["prices"]) / len(mahalle["prices"])
-                )
-            else:
-                mahalle["avg_price"] = 0
 
-            if mahalle["min_price"] == float("inf"):
-                mahalle["min_price"] = 0
+@app.route("/api/cache/stats")
+def api_cache_stats():
+    """Yanıt cache'i sayaçları (hit/miss/304, generation, dinleyici durumu)"""
+    return jsonify({"success": True, "data": response_cache.stats()})
 
-            # prices listesini kaldır (gereksiz)
-            del mahalle["prices"]
 
-        # Liste olarak döndür
-        neighborhood_list = sorted(
-            neighborhoods.values(), key=lambda x: x["total"], reverse=True
+@app.route("/api/map/neighborhoods")
+@cached_response()
+def api_map_neighborhoods():
+    """Mahalle bazlı ilan istatistikleri"""
+    try:
+        # Crawler'ın güncel tuttuğu özet tablodan oku (birkaç yüz satır)
+        ilce = request.args.get("ilce")
+        where = "WHERE ilce = %s" if ilce else ""
+
+        neighborhood_list = db.execute_query(
+            f"""
+            SELECT
+                mahalle AS name,
+                SUM(listing_count)::int AS total,
+                COALESCE(SUM(listing_count) FILTER (WHERE transaction = 'satilik'), 0)::int AS satilik,
+                COALESCE(SUM(listing_count) FILTER (WHERE transaction = 'kiralik'), 0)::int AS kiralik,
+                COALESCE(SUM(listing_count) FILTER (WHERE category = 'konut'), 0)::int AS konut,
+                COALESCE(SUM(listing_count) FILTER (WHERE category = 'arsa'), 0)::int AS arsa,
+                COALESCE(SUM(listing_count) FILTER (WHERE category = 'isyeri'), 0)::int AS isyeri,
+                COALESCE(SUM(listing_count) FILTER (WHERE category = 'bina'), 0)::int AS bina,
+                COALESCE(TRUNC(SUM(price_sum) / NULLIF(SUM(priced_count), 0)), 0)::bigint AS avg_price,
+                COALESCE(MIN(min_price), 0) AS min_price,
+                COALESCE(MAX(max_price), 0) AS max_price,
+                array_agg(price_sketch) AS sketches
+            FROM neighborhood_stats
+            {where}
+            GROUP BY mahalle
+            ORDER BY total DESC
+            """,
+            (ilce,) if ilce else None,
         )
+        if neighborhood_list is None:
+            raise RuntimeError("neighborhood_stats okunamadı")
+
+        # p25 / medyan / p75: anahtar sketch'leri birleştirilir (ham fiyat sıralanmaz)
+        for row in neighborhood_list:
+            row.update(quartile_fields(merge_sketches(row.pop("sketches"))))
 
         return jsonify(
             {
@@ -1217,6 +1284,7 @@ def api_map_neighborhoods():
 
 
 @app.route("/api/map/listings")
+@cached_response()
 def api_map_listings():
     """Harita için ilan listesi (mahalle filtrelemeli)"""
     try:
@@ -1229,10 +1297,10 @@ def api_map_listings():
         sql = "SELECT * FROM sahibinden_liste WHERE 1=1"
         params = []
 
-        # Filters
+        # Filters (mahalle adı /api/map/neighborhoods anahtarıyla aynı ifade, indexli)
         if neighborhood:
-            sql += " AND konum ILIKE %s"
-            params.append(f"%{neighborhood}%")
+            sql += f" AND {mahalle_key_sql()} = %s"
+            params.append(neighborhood.strip())
 
         if category:
             sql += " AND category = %s"
@@ -1291,6 +1359,7 @@ def api_map_listings():
 
 
 @app.route("/api/stats/price-trends")
+@cached_response()
 def api_price_trends():
     try:
         days = request.args.get("days", default=30, type=int)
@@ -1306,6 +1375,9 @@ def api_price_trends():
                     if hasattr(row["date"], "isoformat")
                     else str(row["date"]),
                     "avg_price": row["avg_price"],
+                    "p25_price": row["p25_price"],
+                    "median_price": row["median_price"],
+                    "p75_price": row["p75_price"],
                     "count": row["count"],
                 }
             )
@@ -1325,6 +1397,7 @@ def api_price_trends():
 
 
 @app.route("/api/stats/neighborhoods")
+@cached_response()
 def api_neighborhood_stats():
     try:
         district = request.args.get("district", default="all")
@@ -0,0 +1,161 @@
+"""
+Konum Backfill - ilce / semt / mahalle Kolonları
+================================================
+İlçe / mahalle filtreleri artık sadece normalize edilmiş kolonları kullanır.
+Bu script eski kayıtlarda boş kalan veya normalize edilmemiş ("hendek")
+ilce / semt / mahalle değerlerini konum metninden türetip doldurur.
+
+- new_listings / removed_listings önce sahibinden_liste'deki aynı ilandan kopyalanır
+- Kalanlar konum'dan türetilir (crawler ile aynı kurallar, location_utils)
+- Mevcut semt / mahalle değerleri korunur, sadece boşlar doldurulur
+- Satırlar sunucu tarafı cursor ile akıtılır, güncellemeler batch halinde yazılır
+
+Kullanım:
+    python backfill_locations.py                          # Tüm tablolar
+    python backfill_locations.py --dry-run                # Sadece say
+    python backfill_locations.py --table sahibinden_liste --batch-size 2000
+"""
+
+import argparse
+import sys
+
+from psycopg2.extras import execute_values
+
+from db_manager import db
+from location_utils import derive_location, normalize_district
+from neighborhood_stats import rebuild_neighborhood_stats
+
+# tablo -> ilan id kolonu
+TABLES = {
+    "sahibinden_liste": "id",
+    "new_listings": "listing_id",
+    "removed_listings": "listing_id",
+}
+
+
+def copy_from_listings(table_name: str, key: str, dry_run: bool = False) -> int:
+    """Boş konum kolonlarını sahibinden_liste'deki aynı ilandan kopyala"""
+    match = f"""
+        s.id = t.{key}
+        AND (t.ilce IS NULL OR t.ilce = '')
+        AND s.ilce IS NOT NULL AND s.ilce != ''
+    """
+    if dry_run:
+        row = db.execute_one(
+            f"SELECT COUNT(*) AS count FROM {table_name} t "
+            f"JOIN sahibinden_liste s ON {match}"
+        )
+        return row["count"] if row else 0
+
+    result = db.execute_returning(
+        f"""
+        WITH updated AS (
+            UPDATE {table_name} t
+            SET ilce = s.ilce,
+                semt = COALESCE(NULLIF(t.semt, ''), s.semt),
+                mahalle = COALESCE(NULLIF(t.mahalle, ''), s.mahalle)
+            FROM sahibinden_liste s
+            WHERE {match}
+            RETURNING 1
+        )
+        SELECT COUNT(*) AS count FROM updated
+        """
+    )
+    if result is None:
+        raise RuntimeError(f"{table_name} kopyalanamadı")
+    return result[0]["count"]
+
+
+def derive_updates(rows):
+    """(key, konum, ilce, semt, mahalle) satırlarından değişen (key, ilce, semt, mahalle)"""
+    for key, konum, ilce, semt, mahalle in rows:
+        new_ilce, new_semt, new_mahalle = derive_location(konum, ilce or None)
+        if ilce:
+            new_ilce = normalize_district(ilce)
+        new_semt = semt or new_semt
+        new_mahalle = mahalle or new_mahalle
+
+        if (new_ilce, new_semt, new_mahalle) != (ilce, semt, mahalle):
+            yield key, new_ilce, new_semt, new_mahalle
+
+
+def backfill_table(
+    table_name: str, batch_size: int = 1000, dry_run: bool = False
+) -> int:
+    """Tek tabloyu doldur, güncellenen satır sayısını döndür"""
+    key = TABLES[table_name]
+
+    print(f"\n{'='*60}")
+    print(f"🧭 KONUM BACKFILL: {table_name}")
+    print(f"{'='*60}\n")
+
+    copied = 0
+    if table_name != "sahibinden_liste":
+        copied = copy_from_listings(table_name, key, dry_run)
+        print(f"📋 sahibinden_liste'den kopyalanan: {copied:,}")
+
+    update_sql = f"""
+        UPDATE {table_name} AS t
+        SET ilce = v.ilce, semt = v.semt, mahalle = v.mahalle
+        FROM (VALUES %s) AS v(key, ilce, semt, mahalle)
+        WHERE t.{key} = v.key
+    """
+
+    derived = 0
+    batch = []
+    rows = db.stream_query(
+        f"SELECT {key}, konum, ilce, semt, mahalle FROM {table_name}",
+        itersize=batch_size,
+    )
+    for update in derive_updates(rows):
+        derived += 1
+        if dry_run:
+            if derived <= 10:
+                print(f"   [DRY RUN] {update[0]}: {update[1]} / {update[2]} / {update[3]}")
+            continue
+        batch.append(update)
+        if len(batch) >= batch_size:
+            with db.cursor(dict_cursor=False) as cur:
+                execute_values(cur, update_sql, batch, page_size=batch_size)
+            batch = []
+            print(f"   ✓ {derived:,} satır güncellendi")
+
+    if batch:
+        with db.cursor(dict_cursor=False) as cur:
+            execute_values(cur, update_sql, batch, page_size=batch_size)
+
+    verb = "güncellenecek" if dry_run else "güncellendi"
+    print(f"🔧 Konumdan türetilip {verb}: {derived:,}")
+    return copied + derived
+
+
+def main():
+    parser = argparse.ArgumentParser(description="ilce / semt / mahalle backfill")
+    parser.add_argument(
+        "--table", choices=sorted(TABLES), help="Sadece bu tablo (default: hepsi)"
+    )
+    parser.add_argument("--batch-size", type=int, default=1000, help="Batch boyutu")
+    parser.add_argument("--dry-run", action="store_true", help="Simülasyon modu (yazma yapmaz)")
+
+    args = parser.parse_args()
+
+    # sahibinden_liste önce: diğer tablolar oradan kopyalanır
+    tables = [args.table] if args.table else list(TABLES)
+    total = 0
+    try:
+        for table_name in tables:
+            total += backfill_table(table_name, args.batch_size, args.dry_run)
+    except Exception as e:
+        print(f"\n❌ Hata: {e}\n")
+        sys.exit(1)
+
+    if not args.dry_run and total:
+        # Harita özetleri ilçe anahtarlı; admin panel cache'i de temizlensin
+        rebuild_neighborhood_stats()
+        db.execute_query("SELECT pg_notify('crawler_data_changed', 'backfill')", fetch=False)
+
+    print(f"\n✅ Toplam: {total:,} satır\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1078 @@
+"""
+Crawler Performans Ölçümleri
+============================
+Crawler'ın sıcak yollarını (parse, DB yazma vb.) ölçen yardımcı script.
+
+Kullanım:
+    python benchmarks.py parser pages/*.html                 # rows/sec + eşdeğerlik kontrolü
+    python benchmarks.py parser pages/*.html --write-golden  # bs4 çıktısını .golden.json olarak kaydet
+    python benchmarks.py parser pages/*.html --repeat 50
+    python benchmarks.py upsert --rows 20000                  # VALUES vs COPY upsert (DATABASE_URL)
+    python benchmarks.py pagination --rows 200000 --page 500  # OFFSET vs cursor sayfa gecikmesi
+    python benchmarks.py location --rows 100000               # İlçe filtresi planları (index kullanılıyor mu?)
+    python benchmarks.py search --rows 200000                 # Başlık araması: ILIKE vs tsvector
+    python benchmarks.py comparables --rows 500000            # Emsal sorgusu: eski iki sorgu vs band index'i
+    python benchmarks.py scheduler --workers 1 2 3 4          # Sabit kategori dağılımı vs sayfa kuyruğu (simülasyon)
+    python benchmarks.py ratelimit --processes 4              # Token bucket: O(1) hesap + süreçler arası ortak bütçe
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+
+def _load_pages(paths: List[str]) -> List[tuple]:
+    pages = []
+    for path in paths:
+        p = Path(path)
+        pages.append((p, p.read_text(encoding="utf-8")))
+    return pages
+
+
+def _golden_path(page_path: Path) -> Path:
+    return page_path.with_suffix(".golden.json")
+
+
+def bench_parser(args) -> int:
+    """Liste parser backend'lerini karşılaştır"""
+    from listing_parser import PARSER_BACKENDS, ListingParser, available_backends
+
+    pages = _load_pages(args.pages)
+    if not pages:
+        print("❌ HTML dosyası verilmedi")
+        return 1
+
+    reference = ListingParser()
+
+    # 1. Golden dosyaları yaz (saf Python backend referans alınır)
+    if args.write_golden:
+        for path, html in pages:
+            golden = _golden_path(path)
+            golden.write_text(
+                json.dumps(reference.parse(html), ensure_ascii=False, indent=2),
+                encoding="utf-8",
+            )
+            print(f"💾 Golden kaydedildi: {golden}")
+
+    backends = args.backends or available_backends()
+
+    # 2. Eşdeğerlik kontrolü
+    print(f"\n{'=' * 60}")
+    print("🔍 EŞDEĞERLİK KONTROLÜ")
+    print(f"{'=' * 60}")
+
+    mismatches = 0
+    for path, html in pages:
+        golden = _golden_path(path)
+        if golden.exists():
+            expected = json.loads(golden.read_text(encoding="utf-8"))
+        else:
+            expected = reference.parse(html)
+
+        for name in backends:
+            parser_cls, available = PARSER_BACKENDS[name]
+            if not available:
+                continue
+            result = parser_cls().parse(html)
+            if result != expected:
+                mismatches += 1
+                print(f"   ❌ {path.name} [{name}]: {len(result)} / {len(expected)} satır")
+                for got, want in zip(result, expected):
+                    if got != want:
+                        print(f"      beklenen: {want}")
+                        print(f"      bulunan : {got}")
+                        break
+            else:
+                print(f"   ✅ {path.name} [{name}]: {len(result)} satır")
+
+    # 3. Hız ölçümü
+    print(f"\n{'=' * 60}")
+    print(f"⏱️  HIZ ({args.repeat} tekrar, {len(pages)} sayfa)")
+    print(f"{'=' * 60}")
+
+    for name in backends:
+        parser_cls, available = PARSER_BACKENDS[name]
+        if not available:
+            print(f"   ⏭️  {name}: kurulu değil")
+            continue
+
+        parser = parser_cls()
+        rows = 0
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            for _, html in pages:
+                # Satır çıkarma + fiyat/tarih parse (crawler'ın sıcak yolu)
+                for row in parser.parse_rows(html, "konut", "satilik"):
+                    row.price_value
+                    row.listing_date
+                    rows += 1
+        elapsed = time.perf_counter() - start
+
+        print(
+            f"   {name:<11} {rows / elapsed:>10,.0f} rows/sec "
+            f"({elapsed / (args.repeat * len(pages)) * 1000:.2f} ms/sayfa)"
+        )
+
+    return 1 if mismatches else 0
+
+
+def _synthetic_listing_rows(count: int, offset: int = 0) -> List[tuple]:
+    """LISTING_COLUMNS sırasında sahte ilan satırları"""
+    rows = []
+    for i in range(count):
+        listing_id = 1_000_000_000 + offset + i
+        rows.append(
+            (
+                listing_id,
+                f"Satılık 3+1 daire \t no {listing_id}",
+                f"https://www.sahibinden.com/ilan/{listing_id}",
+                1_500_000 + (i % 500) * 1000,
+                "Merkez, Yeni Mah.",
+                "Bugün 14:30" if i % 3 else "15 Ocak",
+                f"https://i0.shbdn.com/photos/{listing_id}.jpg",
+                "konut",
+                "satilik",
+                "Hendek",
+                "Merkez",
+                "Yeni Mah.",
+            )
+        )
+    return rows
+
+
+def bench_upsert(args) -> int:
+    """sahibinden_liste upsert: sayfa başına VALUES vs COPY tamponu"""
+    from db_manager import db
+    from listing_writer import LISTING_TABLE, ListingBulkWriter, upsert_listings_values
+
+    table = "bench_sahibinden_liste"
+    db.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+    if (
+        db.execute_query(
+            f"CREATE TABLE {table} (LIKE {LISTING_TABLE} INCLUDING ALL)", fetch=False
+        )
+        is None
+    ):
+        print(f"❌ {table} oluşturulamadı")
+        return 1
+
+    page_size = 50
+    insert_rows = _synthetic_listing_rows(args.rows)
+    # İkinci tur: yarısı güncelleme, yarısı yeni ilan (tipik sync taraması)
+    mixed_rows = _synthetic_listing_rows(args.rows, offset=args.rows // 2)
+
+    print(f"\n{'=' * 60}")
+    print(f"⏱️  UPSERT ({args.rows:,} satır, sayfa={page_size}, flush={args.flush_size})")
+    print(f"{'=' * 60}")
+
+    failed = False
+    try:
+        for label, rows in (("insert", insert_rows), ("mixed", mixed_rows)):
+            # 1. Eski yöntem: her sayfa ayrı VALUES upsert
+            db.execute_query(f"TRUNCATE {table}", fetch=False)
+            if label == "mixed":
+                upsert_listings_values(insert_rows[: args.rows // 2], table)
+            start = time.perf_counter()
+            for i in range(0, len(rows), page_size):
+                upsert_listings_values(rows[i : i + page_size], table)
+            values_elapsed = time.perf_counter() - start
+            values_count = db.execute_one(f"SELECT COUNT(*) AS c FROM {table}")["c"]
+
+            # 2. COPY tamponu
+            db.execute_query(f"TRUNCATE {table}", fetch=False)
+            if label == "mixed":
+                upsert_listings_values(insert_rows[: args.rows // 2], table)
+            writer = ListingBulkWriter(flush_size=args.flush_size, table=table)
+            start = time.perf_counter()
+            for i in range(0, len(rows), page_size):
+                writer.add(rows[i : i + page_size])
+            writer.flush()
+            copy_elapsed = time.perf_counter() - start
+            copy_count = db.execute_one(f"SELECT COUNT(*) AS c FROM {table}")["c"]
+
+            if values_count != copy_count or writer.failed_rows:
+                failed = True
+                print(f"   ❌ {label}: satır sayısı farklı ({values_count} / {copy_count})")
+
+            print(
+                f"   {label:<7} VALUES {len(rows) / values_elapsed:>10,.0f} rows/sec | "
+                f"COPY {len(rows) / copy_elapsed:>10,.0f} rows/sec "
+                f"({values_elapsed / copy_elapsed:.1f}x, {writer.flushes} flush)"
+            )
+    finally:
+        db.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+
+    return 1 if failed else 0
+
+
+def bench_pagination(args) -> int:
+    """/api/listings sorgusu: derin sayfada OFFSET + COUNT(*) OVER() vs keyset cursor"""
+    from db_manager import db
+    from listing_writer import LISTING_TABLE
+    from pagination import LISTING_SORTS, keyset_page, order_by
+
+    table = "bench_sahibinden_liste"
+    db.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+    # INCLUDING ALL: drizzle/0008 index'leri ana tabloda varsa kopyalanır
+    created = db.execute_query(
+        f"CREATE TABLE {table} (LIKE {LISTING_TABLE} INCLUDING ALL)", fetch=False
+    )
+    if created is None:
+        print(f"❌ {table} oluşturulamadı")
+        return 1
+
+    per_page = args.per_page
+    offset = (args.page - 1) * per_page
+
+    print(f"\n{'=' * 60}")
+    print(
+        f"⏱️  PAGINATION ({args.rows:,} satır, sayfa {args.page}, "
+        f"per_page={per_page}, {args.repeat} tekrar)"
+    )
+    print(f"{'=' * 60}")
+
+    failed = False
+    try:
+        # Aynı crawled_at'e sahip gruplar + NULL fiyatlar: tie-break de ölçülsün
+        db.execute_query(
+            f"""
+            INSERT INTO {table} (id, baslik, link, fiyat, konum, category, transaction, crawled_at)
+            SELECT 1000000000 + g, 'İlan ' || g, 'https://www.sahibinden.com/ilan/' || g,
+                   CASE WHEN g %% 50 = 0 THEN NULL ELSE 1000000 + (g * 7919) %% 500000 END,
+                   'Merkez, Yeni Mah.', 'konut', 'satilik',
+                   TIMESTAMP '2025-01-01' + (g / 10) * INTERVAL '1 minute'
+            FROM generate_series(1, %s) g
+            """,
+            (args.rows,),
+            fetch=False,
+        )
+        db.execute_query(f"ANALYZE {table}", fetch=False)
+
+        for sort_by in ("date_desc", "price_asc"):
+            spec = LISTING_SORTS[sort_by]
+
+            # 1. Eski yöntem
+            old_order = " ORDER BY crawled_at DESC" if sort_by == "date_desc" else " ORDER BY fiyat ASC"
+            old_sql = (
+                f"SELECT *, COUNT(*) OVER() AS full_count FROM {table} WHERE 1=1"
+                f"{old_order} LIMIT %s OFFSET %s"
+            )
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                db.execute_query(old_sql, (per_page, offset))
+            offset_ms = (time.perf_counter() - start) / args.repeat * 1000
+
+            # 2. Cursor: sayfa N'in cursor'una kadar yürü, sonra sayfa N'i ölç
+            cursor = ""
+            for _ in range(args.page - 1):
+                _, cursor = keyset_page(table, "1=1", [], spec, per_page, cursor)
+            start = time.perf_counter()
+            for _ in range(args.repeat):
+                rows, _ = keyset_page(table, "1=1", [], spec, per_page, cursor)
+            cursor_ms = (time.perf_counter() - start) / args.repeat * 1000
+
+            # Eşdeğerlik: yeni sayfa modu (aynı ORDER BY) ile aynı satırlar
+            expected = db.execute_query(
+                f"SELECT id FROM {table} WHERE 1=1{order_by(spec)} LIMIT %s OFFSET %s",
+                (per_page, offset),
+            )
+            if [r["id"] for r in rows] != [r["id"] for r in expected]:
+                failed = True
+                print(f"   ❌ {sort_by}: cursor sayfası OFFSET sayfasından farklı")
+
+            print(
+                f"   {sort_by:<10} OFFSET {offset_ms:>8.2f} ms | "
+                f"cursor {cursor_ms:>8.2f} ms ({offset_ms / cursor_ms:.1f}x)"
+            )
+    finally:
+        db.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+
+    return 1 if failed else 0
+
+
+def _plan_nodes(plan: dict):
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from _plan_nodes(child)
+
+
+def bench_location(args) -> int:
+    """
+    İlçe / mahalle filtreleri: LOWER(konum) LIKE vs normalize kolon.
+    Regresyon kontrolü: her filtre sorgusu drizzle/0011 fonksiyonel index'lerini
+    kullanmalı (Seq Scan varsa çıkış kodu 1).
+    """
+    from db_manager import db
+    from location_utils import DISTRICT_MAP, district_condition, mahalle_condition
+
+    tables = {
+        "sahibinden_liste": "bench_loc_liste",
+        "new_listings": "bench_loc_new",
+        "removed_listings": "bench_loc_removed",
+    }
+    liste, new, removed = tables.values()
+
+    # Gerçek ilçeler + seçicilik için sentetik ilçeler
+    districts = sorted(set(DISTRICT_MAP.values()))
+    districts += [f"İlçe {i}" for i in range(args.districts - len(districts))]
+
+    for source, table in tables.items():
+        db.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+        # INCLUDING ALL: drizzle/0011 index'leri ana tablodan kopyalanır
+        created = db.execute_query(
+            f"CREATE TABLE {table} (LIKE {source} INCLUDING ALL)", fetch=False
+        )
+        if created is None:
+            print(f"❌ {table} oluşturulamadı (migration uygulandı mı?)")
+            return 1
+
+    print(f"\n{'=' * 60}")
+    print(
+        f"🧭 KONUM FİLTRELERİ ({args.rows:,} ilan, {len(districts)} ilçe, "
+        f"{args.repeat} tekrar)"
+    )
+    print(f"{'=' * 60}")
+
+    failed = False
+    try:
+        seed = """
+            WITH g AS (
+                SELECT g,
+                       (%(districts)s::text[])[1 + g %% %(n)s] AS ilce,
+                       'Mahalle ' || (g / %(n)s) %% 50 AS mahalle
+                FROM generate_series(1, %(rows)s) g
+            )
+        """
+        seed_params = {"districts": districts, "n": len(districts), "rows": args.rows}
+        db.execute_query(
+            seed
+            + f"""
+            INSERT INTO {liste} (id, baslik, link, fiyat, konum, category, transaction,
+                                 crawled_at, ilce, semt, mahalle)
+            SELECT 1000000000 + g, 'İlan ' || g, 'https://www.sahibinden.com/ilan/' || g,
+                   1000000 + (g * 7919) %% 500000,
+                   ilce || ', Merkez' || mahalle || ' Mah.',
+                   'konut', CASE WHEN g %% 3 = 0 THEN 'kiralik' ELSE 'satilik' END,
+                   NOW() - (g %% 90) * INTERVAL '1 day', ilce, 'Merkez', mahalle || ' Mah.'
+            FROM g
+            """,
+            seed_params,
+            fetch=False,
+        )
+        for table, date_column in ((new, "created_at"), (removed, "removed_at")):
+            db.execute_query(
+                seed
+                + f"""
+                INSERT INTO {table} (listing_id, baslik, konum, category, transaction,
+                                     {date_column}, ilce, semt, mahalle)
+                SELECT 1000000000 + g, 'İlan ' || g, ilce || ', Merkez' || mahalle || ' Mah.',
+                       'konut', 'satilik', NOW() - (g %% 180) * INTERVAL '1 day',
+                       ilce, 'Merkez', mahalle || ' Mah.'
+                FROM g
+                """,
+                {**seed_params, "rows": args.rows // 4},
+                fetch=False,
+            )
+        for table in tables.values():
+            db.execute_query(f"ANALYZE {table}", fetch=False)
+
+        district = "hendek"
+        df, dp = district_condition(district)
+        mf, mp = mahalle_condition("mahalle 7")
+        like = " AND LOWER(konum) LIKE %s"
+        like_p = [f"%{district}%"]
+
+        # (ad, tablo, yeni sorgu, parametreler, eski sorgu, eski parametreler)
+        cases = [
+            ("dashboard total", liste,
+             f"SELECT COUNT(*) FROM {liste} WHERE 1=1{df}", dp,
+             f"SELECT COUNT(*) FROM {liste} WHERE 1=1{like}", like_p),
+            ("price trends", liste,
+             f"SELECT DATE(crawled_at), ROUND(AVG(fiyat)) FROM {liste} "
+             f"WHERE crawled_at >= NOW() - (INTERVAL '1 day' * 30) AND fiyat > 0{df} "
+             f"GROUP BY 1", dp,
+             f"SELECT DATE(crawled_at), ROUND(AVG(fiyat)) FROM {liste} "
+             f"WHERE crawled_at >= NOW() - (INTERVAL '1 day' * 30) AND fiyat > 0{like} "
+             f"GROUP BY 1", like_p),
+            ("comparables", liste,
+             f"SELECT id, fiyat FROM {liste} WHERE category = %s AND transaction = %s{df}{mf}",
+             ["konut", "satilik"] + dp + mp,
+             f"SELECT id, fiyat FROM {liste} WHERE category = %s AND transaction = %s{like}"
+             f" AND LOWER(konum) LIKE %s",
+             ["konut", "satilik"] + like_p + ["%mahalle 7%"]),
+            ("new count", new,
+             f"SELECT COUNT(*) FROM {new} WHERE created_at >= NOW() - INTERVAL '7 days'{df}", dp,
+             f"SELECT COUNT(*) FROM {new} WHERE created_at >= NOW() - INTERVAL '7 days'{like}",
+             like_p),
+            ("removed comparables", removed,
+             f"SELECT listing_id FROM {removed} WHERE category = %s AND transaction = %s{df}{mf}"
+             f" AND removed_at >= NOW() - INTERVAL '180 days' ORDER BY removed_at DESC LIMIT 10",
+             ["konut", "satilik"] + dp + mp,
+             f"SELECT listing_id FROM {removed} WHERE category = %s AND transaction = %s{like}"
+             f" AND LOWER(konum) LIKE %s AND removed_at >= NOW() - INTERVAL '180 days'"
+             f" ORDER BY removed_at DESC LIMIT 10",
+             ["konut", "satilik"] + like_p + ["%mahalle 7%"]),
+        ]
+
+        for name, table, sql, params, old_sql, old_params in cases:
+            # 1. Plan: bu tabloda Seq Scan yok, lower(...) index koşulu var
+            plan = db.execute_one(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            nodes = list(_plan_nodes(plan["QUERY PLAN"][0]["Plan"]))
+            seq_scan = any(
+                n["Node Type"] == "Seq Scan" and n.get("Relation Name") == table
+                for n in nodes
+            )
+            index_names = [
+                n["Index Name"]
+                for n in nodes
+                if n.get("Index Name", "").startswith(table)
+                and "lower(" in n.get("Index Cond", "")
+            ]
+            plan_ok = index_names and not seq_scan
+            failed = failed or not plan_ok
+
+            # 2. Eşdeğerlik + süre
+            timings = []
+            results = []
+            for query, query_params in ((old_sql, old_params), (sql, params)):
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    rows = db.execute_query(query, query_params)
+                timings.append((time.perf_counter() - start) / args.repeat * 1000)
+                results.append(sorted(tuple(r.values()) for r in rows or []))
+            if results[0] != results[1]:
+                failed = True
+                print(f"   ❌ {name}: LIKE ve kolon filtresi farklı sonuç verdi")
+
+            old_ms, new_ms = timings
+            status = f"✓ {index_names[0]}" if plan_ok else "❌ index kullanılmıyor"
+            print(
+                f"   {name:<20} LIKE {old_ms:>8.2f} ms | kolon {new_ms:>8.2f} ms "
+                f"({old_ms / new_ms:.1f}x) {status}"
+            )
+    finally:
+        for table in tables.values():
+            db.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+
+    return 1 if failed else 0
+
+
+# Sentetik başlık kelimeleri (Türkçe karakterli / karaktersiz karışık)
+_TITLE_WORDS = [
+    "Satılık", "Kiralık", "Daire", "Müstakil", "Ev", "Villa", "Arsa", "Tarla",
+    "KÖŞE", "Başı", "Sahibinden", "ACİL", "Eşyalı", "Bahçeli", "Havuzlu", "Deniz",
+    "Manzaralı", "Şehir", "Merkezinde", "Yeni", "Lüks", "Çiftlik", "Dükkan",
+    "İşyeri", "Ofis", "Öğrenciye", "Uygun", "Geniş", "Ferah", "Asansörlü",
+    "Otoparklı", "Doğalgazlı", "3+1", "2+1", "4+1", "1+1", "satilik", "kose",
+]
+
+
+def bench_search(args) -> int:
+    """/api/listings?search=: baslik ILIKE '%x%' vs baslik_tsv (GIN, ts_rank)"""
+    from db_manager import db
+    from listing_search import relevance_sort, search_condition
+    from listing_writer import LISTING_TABLE
+    from pagination import LISTING_SORTS, order_by
+
+    table = "bench_search_liste"
+    db.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+    # INCLUDING ALL: drizzle/0012 generated kolon + GIN index kopyalanır
+    created = db.execute_query(
+        f"CREATE TABLE {table} (LIKE {LISTING_TABLE} INCLUDING ALL)", fetch=False
+    )
+    if created is None:
+        print(f"❌ {table} oluşturulamadı")
+        return 1
+
+    print(f"\n{'=' * 60}")
+    print(f"🔎 BAŞLIK ARAMASI ({args.rows:,} satır, {args.repeat} tekrar)")
+    print(f"{'=' * 60}")
+
+    failed = False
+    try:
+        db.execute_query(
+            f"""
+            INSERT INTO {table} (id, baslik, link, fiyat, konum, category, transaction, crawled_at)
+            SELECT 1000000000 + g,
+                   (SELECT string_agg(w[1 + (hashint4(g * 8 + k) & 2147483647) %% n], ' ')
+                    FROM generate_series(1, 5) k),
+                   'https://www.sahibinden.com/ilan/' || g,
+                   1000000 + (g * 7919) %% 500000, 'MerkezYeni Mah.', 'konut', 'satilik',
+                   TIMESTAMP '2025-01-01' + g * INTERVAL '1 minute'
+            FROM generate_series(1, %s) g,
+                 LATERAL (SELECT %s::text[] AS w, %s AS n) words
+            """,
+            (args.rows, _TITLE_WORDS, len(_TITLE_WORDS)),
+            fetch=False,
+        )
+        db.execute_query(f"ANALYZE {table}", fetch=False)
+
+        date_sort = order_by(LISTING_SORTS["date_desc"])
+        per_page = 20
+
+        for term in args.terms:
+            # 1. Eski yöntem: sayfa + toplam (her tuşta yeni terim -> count cache'lenmez)
+            old_where, old_params = "baslik ILIKE %s", [f"%{term}%"]
+            # 2. Yeni: tsvector önek araması, ts_rank sıralı
+            new_filter, new_params = search_condition(term)
+            new_where = "1=1" + new_filter
+            spec = relevance_sort(term)
+
+            timings, counts = [], []
+            for where, params, sort in (
+                (old_where, old_params, date_sort),
+                (new_where, new_params, order_by(spec)),
+            ):
+                page_sql = f"SELECT id FROM {table} WHERE {where}{sort} LIMIT %s"
+                count_sql = f"SELECT COUNT(*) AS count FROM {table} WHERE {where}"
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    db.execute_query(page_sql, params + [per_page])
+                    count = db.execute_one(count_sql, params)["count"]
+                timings.append((time.perf_counter() - start) / args.repeat * 1000)
+                counts.append(count)
+
+            # Plan: GIN index kullanılmalı
+            plan = db.execute_one(
+                f"EXPLAIN (FORMAT JSON) SELECT COUNT(*) FROM {table} WHERE {new_where}",
+                new_params,
+            )
+            nodes = list(_plan_nodes(plan["QUERY PLAN"][0]["Plan"]))
+            uses_index = any(
+                n["Node Type"] == "Bitmap Index Scan" and "baslik_tsv" in n["Index Name"]
+                for n in nodes
+            )
+            failed = failed or not uses_index
+
+            old_ms, new_ms = timings
+            print(
+                f"   {term!r:<20} ILIKE {old_ms:>8.2f} ms ({counts[0]:>7,} sonuç) | "
+                f"tsvector {new_ms:>8.2f} ms ({counts[1]:>7,} sonuç) "
+                f"({old_ms / new_ms:.1f}x) {'✓ GIN' if uses_index else '❌ index yok'}"
+            )
+    finally:
+        db.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+
+    return 1 if failed else 0
+
+
+def bench_comparables(args) -> int:
+    """
+    Değerleme emsalleri: eski iki sorgu (aktif + gerekirse arşiv, sırasız) vs
+    tek sıralı sorgu (comparables.py). Regresyon kontrolü: iki tablo da
+    drizzle/0015 *_comparables index'inden okunmalı (Seq Scan varsa çıkış kodu 1).
+    """
+    from comparables import comparables_query
+    from db_manager import db
+    from location_utils import DISTRICT_MAP, district_condition, mahalle_condition
+
+    tables = {
+        "sahibinden_liste": "bench_cmp_liste",
+        "removed_listings": "bench_cmp_removed",
+    }
+    liste, removed = tables.values()
+
+    districts = sorted(set(DISTRICT_MAP.values()))
+    districts += [f"İlçe {i}" for i in range(args.districts - len(districts))]
+
+    for source, table in tables.items():
+        db.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+        # INCLUDING ALL: price_band / area_m2 generated kolonları ve index'ler kopyalanır
+        created = db.execute_query(
+            f"CREATE TABLE {table} (LIKE {source} INCLUDING ALL)", fetch=False
+        )
+        if created is None:
+            print(f"❌ {table} oluşturulamadı (migration uygulandı mı?)")
+            return 1
+
+    print(f"\n{'=' * 60}")
+    print(
+        f"🏘️  EMSAL İLANLAR ({args.rows:,} aktif + {args.rows // 4:,} arşiv, "
+        f"{len(districts)} ilçe, {args.repeat} tekrar)"
+    )
+    print(f"{'=' * 60}")
+
+    failed = False
+    try:
+        # Fiyat ilçe / mahalleye göre log-normal benzeri dağılır; ilanların yarısında m²
+        seed = """
+            WITH g AS (
+                SELECT g,
+                       (%(districts)s::text[])[1 + g %% %(n)s] AS ilce,
+                       'Mahalle ' || (g / %(n)s) %% 50 AS mahalle,
+                       (ARRAY['konut', 'arsa', 'isyeri'])[1 + (g / 7) %% 3] AS category,
+                       CASE WHEN g %% 3 = 0 THEN 'kiralik' ELSE 'satilik' END AS transaction,
+                       (exp(14 + ((hashint4(g) & 65535) / 65535.0) * 2.5))::bigint AS fiyat
+                FROM generate_series(1, %(rows)s) g
+            )
+        """
+        seed_params = {"districts": districts, "n": len(districts), "rows": args.rows}
+        db.execute_query(
+            seed
+            + f"""
+            INSERT INTO {liste} (id, baslik, link, fiyat, konum, category, transaction,
+                                 crawled_at, ilce, semt, mahalle, m2)
+            SELECT 1000000000 + g, 'İlan ' || g, 'https://www.sahibinden.com/ilan/' || g,
+                   fiyat, ilce || ', Merkez' || mahalle || ' Mah.', category, transaction,
+                   NOW() - (g %% 90) * INTERVAL '1 day', ilce, 'Merkez', mahalle || ' Mah.',
+                   CASE WHEN g %% 2 = 0 THEN (60 + (hashint4(g + 1) & 255)) || ' m²' END
+            FROM g
+            """,
+            seed_params,
+            fetch=False,
+        )
+        db.execute_query(
+            seed
+            + f"""
+            INSERT INTO {removed} (listing_id, baslik, link, fiyat, last_price, konum,
+                                   category, transaction, removed_at, ilce, semt, mahalle)
+            SELECT 2000000000 + g, 'İlan ' || g, 'https://www.sahibinden.com/ilan/' || g,
+                   fiyat, fiyat, ilce || ', Merkez' || mahalle || ' Mah.', category,
+                   transaction, NOW() - (g %% 365) * INTERVAL '1 day',
+                   ilce, 'Merkez', mahalle || ' Mah.'
+            FROM g
+            """,
+            {**seed_params, "rows": args.rows // 4},
+            fetch=False,
+        )
+        for table in tables.values():
+            db.execute_query(f"ANALYZE {table}", fetch=False)
+
+        def old_comparables(category, transaction, ilce, mahalle):
+            """get_valuation_comparables'ın önceki hali (kopya tablolarda)"""
+            df, dp = district_condition(ilce)
+            mf, mp = mahalle_condition(mahalle)
+            params = [category, transaction] + dp + mp
+            rows = db.execute_query(
+                f"SELECT id, fiyat, baslik, link, mahalle, crawled_at, 'active' as status "
+                f"FROM {liste} WHERE category = %s AND transaction = %s{df}{mf}",
+                params,
+            ) or []
+            if len(rows) < 5:
+                rows.extend(
+                    db.execute_query(
+                        f"SELECT listing_id as id, last_price as fiyat, baslik, link, mahalle, "
+                        f"removed_at as crawled_at, 'archived' as status FROM {removed} "
+                        f"WHERE category = %s AND transaction = %s{df}{mf} "
+                        f"AND removed_at >= NOW() - INTERVAL '180 days' "
+                        f"ORDER BY removed_at DESC LIMIT 10",
+                        params,
+                    ) or []
+                )
+            return rows
+
+        # (ad, ilçe, mahalle, fiyat aralığı, m²)
+        cases = [
+            ("mahalle + fiyat", "hendek", "mahalle 7", (2_000_000, 3_000_000), None),
+            ("mahalle + fiyat + m²", "hendek", "mahalle 7", (2_000_000, 3_000_000), 120),
+            ("ilçe + fiyat", "hendek", None, (2_000_000, 3_000_000), None),
+            ("mahalle, fiyatsız", "hendek", "mahalle 7", (None, None), None),
+        ]
+        for name, ilce, mahalle, (min_price, max_price), area in cases:
+            sql, params = comparables_query(
+                "konut", "satilik", ilce, mahalle,
+                min_price=min_price, max_price=max_price, area_m2=area,
+                active_table=liste, archived_table=removed,
+            )
+
+            # 1. Plan: iki tabloda da Seq Scan yok, *_comparables index'i var
+            plan = db.execute_one(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            nodes = list(_plan_nodes(plan["QUERY PLAN"][0]["Plan"]))
+            seq_scan = any(
+                n["Node Type"] == "Seq Scan" and n.get("Relation Name") in tables.values()
+                for n in nodes
+            )
+            # LIKE ... INCLUDING ALL index adı: <tablo>_category_transaction_lower_price_band_...
+            indexed = {
+                table
+                for table in tables.values()
+                for n in nodes
+                if n.get("Index Name", "").startswith(table)
+                and "price_band" in n.get("Index Name", "")
+            }
+            plan_ok = len(indexed) == len(tables) and not seq_scan
+            failed = failed or not plan_ok
+
+            # 2. Süre: eski yöntem tüm eşleşmeleri döndürür, yeni ilk N sıralı emsali
+            timings, counts = [], []
+            for fetch in (
+                lambda: old_comparables("konut", "satilik", ilce, mahalle),
+                lambda: db.execute_query(sql, params) or [],
+            ):
+                start = time.perf_counter()
+                for _ in range(args.repeat):
+                    rows = fetch()
+                timings.append((time.perf_counter() - start) / args.repeat * 1000)
+                counts.append(len(rows))
+
+            # 3. Sıralama: benzerlik azalan, fiyat aralığı dışında sonuç yok
+            similarities = [row["similarity"] for row in rows]
+            in_range = all(
+                (min_price is None or row["fiyat"] >= min_price)
+                and (max_price is None or row["fiyat"] <= max_price)
+                for row in rows
+            )
+            if similarities != sorted(similarities, reverse=True) or not in_range:
+                failed = True
+                print(f"   ❌ {name}: sıralama / fiyat aralığı hatalı")
+
+            old_ms, new_ms = timings
+            print(
+                f"   {name:<22} eski {old_ms:>8.2f} ms ({counts[0]:>6,} satır) | "
+                f"yeni {new_ms:>7.2f} ms ({counts[1]:>3} sıralı) "
+                f"({old_ms / new_ms:.1f}x) {'✓ index' if plan_ok else '❌ index kullanılmıyor'}"
+            )
+    finally:
+        for table in tables.values():
+            db.execute_query(f"DROP TABLE IF EXISTS {table}", fetch=False)
+
+    return 1 if failed else 0
+
+
+# Hendek kategori büyüklükleri (ilan sayısı, 50 ilan/sayfa) - simülasyon için
+_CATEGORY_SIZES = {
+    "konut_satilik": 2100,
+    "konut_kiralik": 380,
+    "arsa_satilik": 1290,
+    "isyeri_satilik": 160,
+    "isyeri_kiralik": 95,
+    "bina_satilik": 30,
+    "bina_kiralik": 8,
+}
+
+# parallel_crawler'ın eski sabit dağılımı (2 worker)
+_STATIC_DISTRIBUTION = {
+    0: ["konut_satilik", "arsa_satilik", "bina_satilik", "bina_kiralik"],
+    1: ["konut_kiralik", "isyeri_satilik", "isyeri_kiralik"],
+}
+
+
+def bench_scheduler(args) -> int:
+    """
+    Paralel crawler sayfa dağıtımı: eski sabit kategori dağılımı (2 worker,
+    kategori sırayla) vs PageScheduler (N worker, tek sayfa kuyruğu).
+    Tarayıcı yerine sayfa başına sabit gecikme uyutulur. Regresyon kontrolü:
+    her sayfa tam bir kez işlenmeli ve max_pages ile kesilen kategori sync'e
+    açılmamalı.
+    """
+    import threading
+
+    from page_scheduler import PAGE_SIZE, PageScheduler
+
+    latency = args.page_ms / 1000
+    expected = {
+        (key, page)
+        for key, total in _CATEGORY_SIZES.items()
+        for page in range(-(-total // PAGE_SIZE))
+    }
+
+    def page_ids(key, page):
+        total = _CATEGORY_SIZES[key]
+        count = max(0, min(PAGE_SIZE, total - page * PAGE_SIZE))
+        return [f"{key}:{page}:{i}" for i in range(count)]
+
+    print(f"\n{'=' * 60}")
+    print(
+        f"🧵 SAYFA ZAMANLAYICI ({len(expected)} sayfa, {len(_CATEGORY_SIZES)} kategori, "
+        f"{args.page_ms:.0f} ms/sayfa)"
+    )
+    print(f"{'=' * 60}")
+
+    # 1. Eski yöntem: her worker kendi kategorilerini sırayla tarar
+    busy = {}
+
+    def static_worker(worker_id, categories):
+        start = time.perf_counter()
+        for key in categories:
+            for page in range(-(-_CATEGORY_SIZES[key] // PAGE_SIZE)):
+                time.sleep(latency)
+        busy[worker_id] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    threads = [
+        threading.Thread(target=static_worker, args=item)
+        for item in _STATIC_DISTRIBUTION.items()
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    static_wall = time.perf_counter() - start
+    utilization = " ".join(f"%{b / static_wall * 100:.0f}" for b in busy.values())
+    print(f"   {'sabit dağılım (2)':<20} {static_wall:>7.2f} s  doluluk: {utilization}")
+
+    # 2. Sayfa kuyruğu
+    failed = False
+    for workers in args.workers:
+        scheduler = PageScheduler(list(_CATEGORY_SIZES), max_pages=999, smart_stop=False)
+        processed = []
+        lock = threading.Lock()
+        busy = {}
+
+        def queue_worker(worker_id):
+            busy[worker_id] = 0.0
+            while (task := scheduler.next_task()) is not None:
+                page_start = time.perf_counter()
+                time.sleep(latency)
+                if task.page == 0:
+                    scheduler.plan(task.key, _CATEGORY_SIZES[task.key])
+                ids = page_ids(task.key, task.page)
+                scheduler.complete(task, ids, True)
+                busy[worker_id] += time.perf_counter() - page_start
+                with lock:
+                    processed.append((task.key, task.page))
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=queue_worker, args=(i,)) for i in range(workers)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        wall = time.perf_counter() - start
+
+        exact_once = len(processed) == len(expected) and set(processed) == expected
+        failed = failed or not exact_once
+        utilization = " ".join(f"%{b / wall * 100:.0f}" for b in busy.values())
+        print(
+            f"   {f'sayfa kuyruğu ({workers})':<20} {wall:>7.2f} s  "
+            f"({static_wall / wall:.1f}x sabit) doluluk: {utilization} "
+            f"{'✓' if exact_once else '❌ eksik / tekrar sayfa'}"
+        )
+
+    # 3. Sync güvenliği: max_pages toplamı kapsamıyorsa veya toplam
+    # okunamadıysa kategori kesik sayılmalı (aksi halde sync canlı ilan siler)
+    cases = [
+        ("max_pages sınırı", 100, 12000, True),
+        ("tüm sayfalar", 100, 4000, False),
+        ("ALL_PAGES", 999, 12000, False),
+        ("toplam okunamadı", 999, None, True),
+    ]
+    print()
+    for label, max_pages, total, expected_truncated in cases:
+        scheduler = PageScheduler(["a"], max_pages=max_pages, smart_stop=False)
+        finished = None
+        while (task := scheduler.next_task()) is not None:
+            if task.page == 0:
+                scheduler.plan(task.key, total)
+            ids = [f"a:{task.page}:{i}" for i in range(PAGE_SIZE)]
+            if total is None and task.page == 2:
+                ids = ids[:5]  # keşif modunda kısa sayfa taramayı bitirir
+            finished = scheduler.complete(task, ids, True) or finished
+        ok = finished is not None and finished.truncated == expected_truncated
+        failed = failed or not ok
+        print(
+            f"   {label:<20} {len(finished.listing_ids) if finished else 0:>6} / "
+            f"{total if total is not None else '?'} ilan  "
+            f"{'✓' if ok else '❌'} sync {'atlanır' if expected_truncated else 'çalışır'}"
+        )
+
+    return 1 if failed else 0
+
+
+def _ratelimit_worker(backend, path, rate, capacity, requests, queue):
+    """Ayrı süreç: bucket'tan `requests` token al, alış zamanlarını döndür"""
+    from rate_limiter import FileTokenBucket, LocalTokenBucket, PostgresTokenBucket
+
+    if backend == "file":
+        bucket = FileTokenBucket(path, rate=rate, capacity=capacity)
+    elif backend == "postgres":
+        bucket = PostgresTokenBucket(path, rate=rate, capacity=capacity)
+    else:
+        bucket = LocalTokenBucket(rate=rate, capacity=capacity)
+    stamps = []
+    for _ in range(requests):
+        bucket.acquire()
+        stamps.append(time.time())
+    queue.put(stamps)
+
+
+def bench_ratelimit(args) -> int:
+    """
+    Dakikalık limit: eski deque taraması vs token bucket hesabı, ve N süreç
+    aynı bucket'ı paylaşınca toplam hızın tek bütçede kalıp kalmadığı.
+    Ortak backend'lerde (file / postgres) beklenen süre
+    (toplam istek - kapasite) / hız; local'de her süreç kendi bütçesini harcar.
+    """
+    import multiprocessing
+    import os
+    import tempfile
+    import uuid
+    from collections import deque
+
+    from rate_limiter import take_token
+
+    print(f"\n{'=' * 60}")
+    print("🪣 TOKEN BUCKET RATE LIMITER")
+    print(f"{'=' * 60}")
+
+    # 1. İstek başına hesap maliyeti
+    calls = 100_000
+    request_times = deque((time.time() - i * 0.5 for i in range(100)), maxlen=100)
+    start = time.perf_counter()
+    for _ in range(calls):
+        minute_ago = time.time() - 60
+        sum(1 for t in request_times if t > minute_ago)
+    scan_us = (time.perf_counter() - start) / calls * 1e6
+
+    tokens, updated_at = 10.0, time.monotonic()
+    start = time.perf_counter()
+    for _ in range(calls):
+        now = time.monotonic()
+        tokens, _wait = take_token(tokens, updated_at, now, 1e9, 10.0)
+        updated_at = now
+    bucket_us = (time.perf_counter() - start) / calls * 1e6
+    print(f"   {'deque taraması':<22} {scan_us:>8.2f} µs/istek")
+    print(f"   {'token bucket':<22} {bucket_us:>8.2f} µs/istek ({scan_us / bucket_us:.0f}x)")
+
+    # 2. Süreçler arası bütçe
+    total = args.processes * args.requests
+    shared_expected = max(0.0, (total - args.capacity) / args.rate)
+    print(
+        f"\n   {args.processes} süreç x {args.requests} istek, "
+        f"{args.rate:g} istek/sn, kapasite {args.capacity}"
+    )
+    failed = False
+    for backend in args.backends:
+        if backend == "postgres":
+            if not os.getenv("DATABASE_URL"):
+                print(f"   {backend:<10} atlandı (DATABASE_URL yok)")
+                continue
+            from db_manager import db
+
+            applied = db.execute_query(
+                "SELECT 1 FROM information_schema.columns"
+                " WHERE table_name = 'rate_limit_buckets' AND column_name = 'rate'"
+            )
+            if not applied:
+                print(f"   {backend:<10} atlandı (drizzle/0016-0017 uygulanmamış)")
+                continue
+            target = f"bench_{uuid.uuid4().hex[:8]}"
+        else:
+            target = str(Path(tempfile.gettempdir()) / f"bench_{uuid.uuid4().hex[:8]}.bucket")
+
+        # spawn: fork edilen süreçler ebeveynin DB bağlantılarını paylaşırdı
+        ctx = multiprocessing.get_context("spawn")
+        queue = ctx.Queue()
+        procs = [
+            ctx.Process(
+                target=_ratelimit_worker,
+                args=(backend, target, args.rate, args.capacity, args.requests, queue),
+            )
+            for _ in range(args.processes)
+        ]
+        start = time.time()
+        for p in procs:
+            p.start()
+        stamps = sorted(t for _ in procs for t in queue.get())
+        for p in procs:
+            p.join()
+        wall = stamps[-1] - start
+
+        if backend == "postgres":
+            db.execute_query(
+                "DELETE FROM rate_limit_buckets WHERE name = %s", (target,), fetch=False
+            )
+        else:
+            Path(target).unlink(missing_ok=True)
+
+        # Kapasite sonrası istekler hıza uymalı (süreç başlatma gecikmesine pay)
+        paced = stamps[args.capacity:]
+        rate = (len(paced) - 1) / (paced[-1] - paced[0]) if len(paced) > 1 else 0.0
+        if backend == "local":
+            verdict = "süreç başına ayrı bütçe"
+        else:
+            ok = rate <= args.rate * 1.1 and wall >= shared_expected * 0.9
+            failed = failed or not ok
+            verdict = "✓ tek bütçe" if ok else "❌ bütçe aşıldı"
+        print(
+            f"   {backend:<10} {wall:>6.2f} s (beklenen {shared_expected:.2f} s)  "
+            f"gerçek hız {rate:>6.1f}/sn  {verdict}"
+        )
+
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawler performans ölçümleri")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p_parser = sub.add_parser("parser", help="Liste parser backend karşılaştırması")
+    p_parser.add_argument("pages", nargs="+", help="Kaydedilmiş sonuç sayfaları (.html)")
+    p_parser.add_argument("--repeat", type=int, default=20, help="Tekrar sayısı")
+    p_parser.add_argument(
+        "--backends", nargs="+", default=None, help="Sadece bu backend'ler"
+    )
+    p_parser.add_argument(
+        "--write-golden",
+        action="store_true",
+        help="bs4 çıktısını <sayfa>.golden.json olarak kaydet",
+    )
+    p_parser.set_defaults(func=bench_parser)
+
+    p_upsert = sub.add_parser("upsert", help="VALUES vs COPY upsert karşılaştırması")
+    p_upsert.add_argument("--rows", type=int, default=20000, help="Satır sayısı")
+    p_upsert.add_argument(
+        "--flush-size", type=int, default=1000, help="COPY tampon eşiği"
+    )
+    p_upsert.set_defaults(func=bench_upsert)
+
+    p_page = sub.add_parser("pagination", help="OFFSET vs cursor sayfa gecikmesi")
+    p_page.add_argument("--rows", type=int, default=200000, help="Satır sayısı")
+    p_page.add_argument("--page", type=int, default=500, help="Ölçülecek sayfa")
+    p_page.add_argument("--per-page", type=int, default=20, help="Sayfa boyutu")
+    p_page.add_argument("--repeat", type=int, default=20, help="Tekrar sayısı")
+    p_page.set_defaults(func=bench_pagination)
+
+    p_loc = sub.add_parser("location", help="İlçe filtresi planları ve gecikmesi")
+    p_loc.add_argument("--rows", type=int, default=100000, help="İlan sayısı")
+    p_loc.add_argument("--districts", type=int, default=40, help="İlçe sayısı")
+    p_loc.add_argument("--repeat", type=int, default=10, help="Tekrar sayısı")
+    p_loc.set_defaults(func=bench_location)
+
+    p_search = sub.add_parser("search", help="Başlık araması: ILIKE vs tsvector")
+    p_search.add_argument("--rows", type=int, default=200000, help="Satır sayısı")
+    p_search.add_argument("--repeat", type=int, default=10, help="Tekrar sayısı")
+    p_search.add_argument(
+        "--terms",
+        nargs="+",
+        default=["köşe", "satilik daire", "3+1 bahçeli", "isyeri", "lüks villa havuz"],
+        help="Aranacak terimler",
+    )
+    p_search.set_defaults(func=bench_search)
+
+    p_cmp = sub.add_parser("comparables", help="Emsal sorgusu: eski iki sorgu vs band index'i")
+    p_cmp.add_argument("--rows", type=int, default=500000, help="Aktif ilan sayısı")
+    p_cmp.add_argument("--districts", type=int, default=40, help="İlçe sayısı")
+    p_cmp.add_argument("--repeat", type=int, default=10, help="Tekrar sayısı")
+    p_cmp.set_defaults(func=bench_comparables)
+
+    p_sched = sub.add_parser("scheduler", help="Sabit kategori dağılımı vs sayfa kuyruğu")
+    p_sched.add_argument(
+        "--workers", type=int, nargs="+", default=[1, 2, 3, 4], help="Worker sayıları"
+    )
+    p_sched.add_argument("--page-ms", type=float, default=20, help="Sayfa başına gecikme (ms)")
+    p_sched.set_defaults(func=bench_scheduler)
+
+    p_rate = sub.add_parser("ratelimit", help="Token bucket: hesap maliyeti ve ortak bütçe")
+    p_rate.add_argument("--processes", type=int, default=4, help="Süreç sayısı")
+    p_rate.add_argument("--requests", type=int, default=25, help="Süreç başına istek")
+    p_rate.add_argument("--rate", type=float, default=20, help="Token/sn")
+    p_rate.add_argument("--capacity", type=int, default=5, help="Bucket kapasitesi")
+    p_rate.add_argument(
+        "--backends",
+        nargs="+",
+        default=["local", "file", "postgres"],
+        choices=["local", "file", "postgres"],
+        help="Denenecek backend'ler",
+    )
+    p_rate.set_defaults(func=bench_ratelimit)
+
+    args = parser.parse_args()
+    sys.exit(args.func(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,398 @@
+"""
+Tarayıcı Havuzu - Uzun Ömürlü, Sağlık Kontrollü Chrome Oturumları
+=================================================================
+Her crawl job'u eskiden yeni bir Chrome açıyordu: profil temizliği,
+Chrome başlatma ve Cloudflare ısınması her job'da tekrar ödeniyordu. Havuz
+N oturumu admin panel süreci boyunca canlı tutar, job'lar oturum kiralar:
+
+- Oturumlar ihtiyaç oldukça açılır (en fazla N); profil temizliği ve
+  ısınma (warm-up) sadece oturum açılırken yapılır
+- Kiralama LIFO: en son bırakılan (en sıcak) oturum önce verilir
+- Bırakılan oturum K sayfadan sonra, Chrome bellek artışı eşiği aşınca
+  (psutil varsa) veya sağlık kontrolü başarısızsa kapatılıp yenisi açılır
+- Arka plan thread'i boştaki oturumları düzenli olarak yoklar
+
+Ayarlar (env): BROWSER_POOL_SIZE (0 = havuz kapalı, job başına yeni Chrome),
+BROWSER_POOL_MAX_PAGES, BROWSER_POOL_MAX_MEMORY_GROWTH_MB,
+BROWSER_POOL_HEALTH_INTERVAL
+
+Kullanım:
+    from browser_pool import get_browser_pool
+
+    pool = get_browser_pool()          # BROWSER_POOL_SIZE=0 ise None
+    session = pool.acquire(timeout=120)
+    try:
+        session.driver.get(url)
+        session.pages += 1
+    finally:
+        pool.release(session)
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+try:
+    import psutil
+
+    HAS_PSUTIL = True
+except ImportError:
+    HAS_PSUTIL = False
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_PAGES = 500
+DEFAULT_MAX_MEMORY_GROWTH_MB = 1024
+DEFAULT_HEALTH_INTERVAL = 60.0
+
+
+class BrowserSession:
+    """Havuzdaki tek Chrome oturumu"""
+
+    def __init__(self, slot: int, driver, profile_dir: Path, startup_seconds: float):
+        self.slot = slot
+        self.driver = driver
+        self.profile_dir = profile_dir
+        self.startup_seconds = startup_seconds
+        self.created_at = time.time()
+        self.pages = 0  # bu oturumla yapılan navigasyon sayısı
+        self.leases = 0
+        self.baseline_memory_mb = self.memory_mb()
+
+    def is_healthy(self) -> bool:
+        """WebDriver yanıt veriyor mu (tek hafif script çağrısı)"""
+        try:
+            return self.driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _browser_pid(self) -> Optional[int]:
+        pid = getattr(self.driver, "browser_pid", None)
+        if pid:
+            return pid
+        service = getattr(self.driver, "service", None)
+        process = getattr(service, "process", None)
+        return getattr(process, "pid", None)
+
+    def memory_mb(self) -> Optional[float]:
+        """Chrome süreç ağacının toplam RSS'i (psutil yoksa None)"""
+        if not HAS_PSUTIL:
+            return None
+        pid = self._browser_pid()
+        if not pid:
+            return None
+        try:
+            root = psutil.Process(pid)
+            processes = [root] + root.children(recursive=True)
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return total / (1024 * 1024)
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            return None
+
+    def memory_growth_mb(self) -> Optional[float]:
+        current = self.memory_mb()
+        if current is None or self.baseline_memory_mb is None:
+            return None
+        return current - self.baseline_memory_mb
+
+    def quit(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"⚠️ Havuz oturumu {self.slot} kapatma hatası: {e}")
+
+
+class BrowserPool:
+    """
+    Thread-safe Chrome oturum havuzu.
+
+    Args:
+        size: En fazla açık oturum (N)
+        launcher: profile_dir -> driver (Chrome başlatma + profil temizliği)
+        warm_up: driver -> None (Cloudflare ısınması, oturum başına bir kez)
+        profile_root: Oturum profilleri <profile_root>_pool<slot> altında
+        max_pages: Bu kadar sayfadan sonra oturum yenilenir (K)
+        max_memory_growth_mb: Açılıştan bu yana bellek artışı eşiği
+        health_interval: Boştaki oturumların yoklanma aralığı (0 = kapalı)
+    """
+
+    def __init__(
+        self,
+        size: int,
+        launcher: Callable,
+        warm_up: Optional[Callable] = None,
+        profile_root: Optional[Path] = None,
+        max_pages: int = DEFAULT_MAX_PAGES,
+        max_memory_growth_mb: float = DEFAULT_MAX_MEMORY_GROWTH_MB,
+        health_interval: float = DEFAULT_HEALTH_INTERVAL,
+    ):
+        self.size = max(1, size)
+        self.launcher = launcher
+        self.warm_up = warm_up
+        self.profile_root = Path(profile_root) if profile_root else Path("browser_pool")
+        self.max_pages = max_pages
+        self.max_memory_growth_mb = max_memory_growth_mb
+
+        self._cond = threading.Condition()
+        self._idle: List[BrowserSession] = []
+        self._leased: Dict[int, BrowserSession] = {}
+        self._free_slots = list(range(self.size - 1, -1, -1))
+        self._closed = False
+
+        self._stats = {
+            "launched": 0,
+            "launch_failures": 0,
+            "leases": 0,
+            "warm_leases": 0,
+            "startup_seconds": 0.0,
+            "recycled": {"pages": 0, "memory": 0, "unhealthy": 0, "broken": 0},
+        }
+
+        self._stop = threading.Event()
+        self._health_thread = None
+        if health_interval > 0:
+            self._health_thread = threading.Thread(
+                target=self._health_loop,
+                args=(health_interval,),
+                daemon=True,
+                name="browser-pool-health",
+            )
+            self._health_thread.start()
+
+    # ------------------------------------------------------------------
+    # Oturum yaşam döngüsü
+    # ------------------------------------------------------------------
+
+    def _launch(self, slot: int) -> BrowserSession:
+        profile_dir = self.profile_root.with_name(f"{self.profile_root.name}_pool{slot}")
+        start = time.time()
+        driver = self.launcher(profile_dir)
+        try:
+            if self.warm_up:
+                self.warm_up(driver)
+        except Exception as e:
+            logger.warning(f"⚠️ Havuz oturumu {slot} ısınma hatası (devam): {e}")
+        session = BrowserSession(slot, driver, profile_dir, time.time() - start)
+        logger.info(
+            f"🧊 Havuz oturumu {slot} hazır ({session.startup_seconds:.1f}s)"
+        )
+        return session
+
+    def _retire(self, session: BrowserSession, reason: str):
+        """Oturumu kapat, slotu boşalt (yenisi sıradaki kiralamada açılır)"""
+        session.quit()
+        with self._cond:
+            self._stats["recycled"][reason] += 1
+            self._free_slots.append(session.slot)
+            self._cond.notify()
+        logger.info(
+            f"♻️ Havuz oturumu {session.slot} yenilenecek ({reason}, {session.pages} sayfa)"
+        )
+
+    def _recycle_reason(self, session: BrowserSession) -> Optional[str]:
+        if self.max_pages and session.pages >= self.max_pages:
+            return "pages"
+        growth = session.memory_growth_mb()
+        if growth is not None and growth > self.max_memory_growth_mb:
+            return "memory"
+        if not session.is_healthy():
+            return "unhealthy"
+        return None
+
+    def acquire(self, timeout: Optional[float] = None) -> BrowserSession:
+        """
+        Oturum kirala. Boşta oturum yoksa ve havuz doluysa bırakılmasını bekler.
+
+        Raises:
+            TimeoutError: timeout içinde oturum alınamadı
+            RuntimeError: havuz kapatıldı
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            slot = None
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Tarayıcı havuzu kapatıldı")
+                    if self._idle:
+                        session = self._idle.pop()
+                        break
+                    if self._free_slots:
+                        slot = self._free_slots.pop()
+                        session = None
+                        break
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError("Tarayıcı havuzunda boş oturum yok")
+                    self._cond.wait(remaining)
+
+            if session is None:
+                # Chrome başlatma kilit dışında (diğer kiralamaları bekletmesin)
+                try:
+                    session = self._launch(slot)
+                except Exception:
+                    with self._cond:
+                        self._stats["launch_failures"] += 1
+                        self._free_slots.append(slot)
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._stats["launched"] += 1
+                    self._stats["startup_seconds"] += session.startup_seconds
+                warm = False
+            elif not session.is_healthy():
+                self._retire(session, "unhealthy")
+                continue
+            else:
+                warm = True
+
+            with self._cond:
+                session.leases += 1
+                self._leased[session.slot] = session
+                self._stats["leases"] += 1
+                self._stats["warm_leases"] += int(warm)
+            return session
+
+    def release(self, session: BrowserSession, broken: bool = False):
+        """Oturumu havuza geri ver (gerekirse yenilenir)"""
+        with self._cond:
+            self._leased.pop(session.slot, None)
+
+        if self._closed:
+            session.quit()
+            return
+
+        reason = "broken" if broken else self._recycle_reason(session)
+        if reason:
+            self._retire(session, reason)
+            return
+
+        with self._cond:
+            self._idle.append(session)
+            self._cond.notify()
+
+    def _health_loop(self, interval: float):
+        while not self._stop.wait(interval):
+            with self._cond:
+                idle = list(self._idle)
+            for session in idle:
+                # Yoklama süresince oturum boşta listesinden çıkar: acquire()
+                # aynı WebDriver'ı başka bir thread'e kiralamasın
+                with self._cond:
+                    if self._closed or session not in self._idle:
+                        continue  # bu arada kiralandı / havuz kapandı
+                    self._idle.remove(session)
+                if not session.is_healthy():
+                    self._retire(session, "unhealthy")
+                    continue
+                with self._cond:
+                    closed = self._closed
+                    if not closed:
+                        self._idle.append(session)
+                        self._cond.notify()
+                if closed:
+                    session.quit()
+
+    def prewarm(self, count: Optional[int] = None):
+        """count (default: size) oturumu önceden aç (arka planda çağrılabilir)"""
+        sessions = []
+        for _ in range(min(count or self.size, self.size)):
+            try:
+                sessions.append(self.acquire(timeout=0))
+            except Exception as e:
+                logger.warning(f"⚠️ Havuz ön ısıtma durdu: {e}")
+                break
+        for session in sessions:
+            self.release(session)
+
+    def close(self):
+        """Tüm oturumları kapat"""
+        self._stop.set()
+        with self._cond:
+            self._closed = True
+            sessions = self._idle + list(self._leased.values())
+            self._idle = []
+            self._cond.notify_all()
+        for session in sessions:
+            session.quit()
+
+    # ------------------------------------------------------------------
+    # Metrikler
+    # ------------------------------------------------------------------
+
+    def stats(self) -> dict:
+        with self._cond:
+            sessions = self._idle + list(self._leased.values())
+            stats = {
+                "size": self.size,
+                "alive": len(sessions),
+                "idle": len(self._idle),
+                "leased": len(self._leased),
+                "max_pages": self.max_pages,
+                "max_memory_growth_mb": self.max_memory_growth_mb,
+                "memory_tracking": HAS_PSUTIL,
+                **self._stats,
+                "recycled": dict(self._stats["recycled"]),
+            }
+        stats["startup_seconds"] = round(stats["startup_seconds"], 1)
+        stats["sessions"] = []
+        for session in sorted(sessions, key=lambda s: s.slot):
+            memory = session.memory_mb()
+            stats["sessions"].append(
+                {
+                    "slot": session.slot,
+                    "pages": session.pages,
+                    "leases": session.leases,
+                    "age_seconds": round(time.time() - session.created_at),
+                    "memory_mb": round(memory, 1) if memory is not None else None,
+                }
+            )
+        return stats
+
+
+_pool: Optional[BrowserPool] = None
+_pool_lock = threading.Lock()
+
+
+def pool_size_from_env() -> int:
+    return int(os.getenv("BROWSER_POOL_SIZE", "0") or 0)
+
+
+def get_browser_pool() -> Optional[BrowserPool]:
+    """
+    Süreç geneli havuz (BROWSER_POOL_SIZE > 0 ise). Chrome başlatıcı ve
+    ısınma sahibinden_crawler'dan alınır; import ilk kullanımda yapılır.
+    """
+    global _pool
+    size = pool_size_from_env()
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            from sahibinden_crawler import CHROME_PROFILE, launch_chrome, warm_up_session
+
+            _pool = BrowserPool(
+                size,
+                launcher=launch_chrome,
+                warm_up=warm_up_session,
+                profile_root=CHROME_PROFILE,
+                max_pages=int(os.getenv("BROWSER_POOL_MAX_PAGES", DEFAULT_MAX_PAGES)),
+                max_memory_growth_mb=float(
+                    os.getenv(
+                        "BROWSER_POOL_MAX_MEMORY_GROWTH_MB", DEFAULT_MAX_MEMORY_GROWTH_MB
+                    )
+                ),
+                health_interval=float(
+                    os.getenv("BROWSER_POOL_HEALTH_INTERVAL", DEFAULT_HEALTH_INTERVAL)
+                ),
+            )
+            logger.info(f"🧊 Tarayıcı havuzu: {size} oturum")
+        return _pool
@@ -31,8 +31,9 @@ def check_duplicates(table_name: str = "sahibinden_liste") -> dict:
             "total_records": 1000,
             "unique_links": 950,
             "duplicate_count": 50,
-            "duplicates": [
-                {"link": "https://...", "count": 3, "oldest": "2024-01-01", "newest": "2024-01-15"},
+            "duplicate_links": 20,
+            "duplicates": [  # Sadece ilk 20 link (örnek)
+                {"link": "https://...", "count": 3, "oldest_crawl": ..., "newest_crawl": ...},
                 ...
             ]
         }
@@ -63,46 +64,54 @@ def check_duplicates(table_name: str = "sahibinden_liste") -> dict:
                 "total_records": total_records,
                 "unique_links": unique_links,
                 "duplicate_count": 0,
+                "duplicate_links": 0,
                 "duplicates": []
             }
         
         print(f"⚠️  Duplicate kayıt: {duplicate_count:,}\n")
         
-        # Duplicate link'leri ve detaylarını bul
+        # Duplicate link'leri sunucu tarafı cursor ile akıt; sadece ilk 20
+        # tanesi bellekte tutulur, geri kalanı sayılır
         query = f"""
             SELECT 
                 link,
                 COUNT(*) as count,
                 MIN(crawled_at) as oldest_crawl,
                 MAX(crawled_at) as newest_crawl,
-                ARRAY_AGG(id) as listing_ids,
-                ARRAY_AGG(ctid) as row_ids
+                (ARRAY_AGG(id))[1:4] as listing_ids
             FROM {table_name}
             GROUP BY link
             HAVING COUNT(*) > 1
             ORDER BY count DESC, link
         """
         
-        duplicates = db.execute_query(query)
+        duplicates = []
+        duplicate_links = 0
+        ids_header = "ID'ler"
         
         print(f"📋 Duplicate Link'ler:\n")
-        print(f"{'Link':<50} {'Adet':<8} {'ID\'ler':<30} {'İlk Tarih':<20}")
+        print(f"{'Link':<50} {'Adet':<8} {ids_header:<30} {'İlk Tarih':<20}")
         print(f"{'-'*120}")
         
-        for dup in duplicates[:20]:  # İlk 20'yi göster
-            link_short = dup['link'][:47] + "..." if len(dup['link']) > 50 else dup['link']
-            ids_str = str(dup['listing_ids'][:3])[1:-1]  # İlk 3 ID'yi göster
-            if len(dup['listing_ids']) > 3:
+        for dup in db.stream_query(query, named=True):
+            duplicate_links += 1
+            if duplicate_links > 20:  # İlk 20'yi göster
+                continue
+            duplicates.append(dup._asdict())
+            link_short = dup.link[:47] + "..." if len(dup.link) > 50 else dup.link
+            ids_str = str(dup.listing_ids[:3])[1:-1]  # İlk 3 ID'yi göster
+            if len(dup.listing_ids) > 3:
                 ids_str += "..."
-            print(f"{link_short:<50} {dup['count']:<8} {ids_str:<30} {str(dup['oldest_crawl']):<20}")
+            print(f"{link_short:<50} {dup.count:<8} {ids_str:<30} {str(dup.oldest_crawl):<20}")
         
-        if len(duplicates) > 20:
-            print(f"\n... ve {len(duplicates) - 20} tane daha\n")
+        if duplicate_links > 20:
+            print(f"\n... ve {duplicate_links - 20} tane daha\n")
         
         return {
             "total_records": total_records,
             "unique_links": unique_links,
             "duplicate_count": duplicate_count,
+            "duplicate_links": duplicate_links,
             "duplicates": duplicates
         }
         
@@ -137,7 +146,16 @@ def remove_duplicates(table_name: str = "sahibinden_liste", dry_run: bool = Fals
             print("✅ Temizlenecek duplicate yok.\n")
             return 0
         
-        duplicates = check_result["duplicates"]
+        # Tüm duplicate link'ler sunucu tarafı cursor ile akıtılır
+        duplicates = db.stream_query(
+            f"""
+                SELECT link, COUNT(*) as count
+                FROM {table_name}
+                GROUP BY link
+                HAVING COUNT(*) > 1
+                ORDER BY count DESC, link
+            """
+        )
         
         print(f"\n🎯 Strateji: Her link için EN YENİ kaydı tut, eskilerini sil\n")
         
@@ -150,9 +168,7 @@ def remove_duplicates(table_name: str = "sahibinden_liste", dry_run: bool = Fals
         
         deleted_count = 0
         
-        for dup in duplicates:
-            link = dup["link"]
-            count = dup["count"]
+        for link, count in duplicates:
             
             # Her link için en yeni kaydı tut, eskilerini sil
             delete_query = f"""
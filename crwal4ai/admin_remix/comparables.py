@@ -0,0 +1,172 @@
+"""
+Emsal İlan Motoru - Fiyat Bandı Index'li Benzerlik Sıralaması
+=============================================================
+Değerleme emsalleri eskiden iki sorguyla (aktif, az sonuç varsa arşiv)
+filtresiz ve sırasız çekiliyordu. Artık tek sorgu:
+
+- Aktif (sahibinden_liste) ve arşiv (removed_listings, son 180 gün) ilanlar
+  (category, transaction, lower(ilce), price_band, mahalle) index'inden
+  okunur (drizzle/0015). price_band = floor(ln(fiyat) / ln(1.25)); her band
+  %25 genişliğindedir, hedef fiyatın bandları `price_band = ANY(...)` ile
+  doğrudan aranır (mahalle verilmese de index aralığı dar kalır)
+- Adaylar uzaklığa göre sıralanır (düşük = daha benzer):
+    fiyat farkı (band cinsinden, |ln(fiyat / hedef)| / ln(1.25))
+    + yaş / RECENCY_DAYS (aktifte crawled_at, arşivde removed_at)
+    + m² farkı (detay verisi varsa, aynı ölçek) veya m² bilinmiyorsa
+      BAND_SPAN + 1 ceza (±BAND_SPAN içindeki bilinen m²'den hep uzak)
+    + arşiv cezası
+- similarity = 1 / (1 + uzaklık), 0-1 arası
+
+Kullanım:
+    from comparables import comparables_query
+
+    sql, params = comparables_query("konut", "satilik", "Hendek", "Yeni Mah.",
+                                    min_price=2_000_000, max_price=3_000_000,
+                                    area_m2=120)
+    rows = db.execute_query(sql, params)   # similarity'ye göre sıralı
+"""
+
+import math
+
+from location_utils import district_condition, mahalle_condition
+
+# drizzle/0015 price_band kolonu ile aynı: floor(ln(fiyat) / ln(1.25))
+PRICE_BAND_RATIO = 1.25
+LN_PRICE_BAND = math.log(PRICE_BAND_RATIO)
+
+# Sadece hedef fiyat verilirse ±2 band (~0.64x - 1.56x) taranır
+BAND_SPAN = 2
+
+# Uzaklık ağırlıkları (1.0 = bir fiyat bandı farkı)
+RECENCY_DAYS = 30  # 30 günlük ilan bir band uzakta sayılır
+# m² bilinmeyen aday, fiyat bandı dışındaki bilinmeyen fiyat gibi taranan
+# aralığın hemen dışında sayılır: eksik veri bilinen yakın m²'den öne geçmez
+# (arşiv satırlarının m²'si hep NULL)
+UNKNOWN_AREA_PENALTY = BAND_SPAN + 1
+ARCHIVED_PENALTY = 0.5
+
+ARCHIVE_DAYS = 180
+COMPARABLE_LIMIT = 20
+
+
+def price_band(price) -> int:
+    """Pozitif fiyatın bandı (drizzle/0015 price_band ile aynı sonuç)"""
+    return math.floor(math.log(price) / LN_PRICE_BAND)
+
+
+def price_band_sql(column: str = "fiyat") -> str:
+    """price_band'in SQL karşılığı (generated kolon ifadesi)"""
+    return f"floor(ln({column}::float8) / {LN_PRICE_BAND!r})::smallint"
+
+
+def target_price_range(min_price=None, max_price=None, target_price=None):
+    """
+    Hedef fiyat ve taranacak aralık.
+
+    Returns:
+        (hedef, alt sınır, üst sınır) veya fiyat bilgisi yoksa (None, None, None)
+    """
+    min_price = min_price if min_price and min_price > 0 else None
+    max_price = max_price if max_price and max_price > 0 else None
+    if not target_price or target_price <= 0:
+        if min_price and max_price:
+            target_price = math.sqrt(min_price * max_price)
+        else:
+            target_price = min_price or max_price
+    if not target_price:
+        return None, None, None
+
+    spread = PRICE_BAND_RATIO**BAND_SPAN
+    low = min_price or target_price / spread
+    high = max_price or target_price * spread
+    if low > high:
+        low, high = high, low
+    return target_price, low, high
+
+
+def _distance_sql(target_price=None, area_m2=None) -> str:
+    """Uzaklık ifadesi; hedefler Python'da hesaplanmış float literal olarak gömülür"""
+    terms = [
+        f"EXTRACT(EPOCH FROM NOW() - COALESCE(seen_at, NOW())) / 86400.0 / {RECENCY_DAYS}",
+        f"CASE WHEN status = 'archived' THEN {ARCHIVED_PENALTY} ELSE 0 END",
+    ]
+    if target_price:
+        terms.append(
+            f"COALESCE(abs(ln(GREATEST(fiyat, 1)::float8) - {math.log(target_price)!r})"
+            f" / {LN_PRICE_BAND!r}, {BAND_SPAN + 1})"
+        )
+    if area_m2 and area_m2 > 0:
+        terms.append(
+            f"COALESCE(abs(ln(area_m2::float8) - {math.log(area_m2)!r})"
+            f" / {LN_PRICE_BAND!r}, {UNKNOWN_AREA_PENALTY})"
+        )
+    return "\n                + ".join(terms)
+
+
+def comparables_query(
+    category,
+    transaction,
+    ilce,
+    mahalle=None,
+    min_price=None,
+    max_price=None,
+    target_price=None,
+    area_m2=None,
+    limit: int = COMPARABLE_LIMIT,
+    active_table: str = "sahibinden_liste",
+    archived_table: str = "removed_listings",
+):
+    """
+    Aktif + arşiv emsalleri tek sorguda, benzerliğe göre sıralı.
+
+    Returns:
+        (sql, params) - satırlar: id, fiyat, baslik, link, mahalle, crawled_at,
+        status ('active' / 'archived'), m2, similarity
+
+    active_table / archived_table sadece benchmark'ın kopya tabloları içindir.
+    """
+    district_filter, district_params = district_condition(ilce)
+    mahalle_filter, mahalle_params = mahalle_condition(mahalle)
+    location_filter = district_filter + mahalle_filter
+    location_params = district_params + mahalle_params
+
+    target, low, high = target_price_range(min_price, max_price, target_price)
+    band_filter, band_params = "", []
+    if target:
+        bands = list(range(price_band(low), price_band(high) + 1))
+        band_filter = " AND price_band = ANY(%s::smallint[]) AND {price} BETWEEN %s AND %s"
+        band_params = [bands, low, high]
+
+    params = []
+    for _ in range(2):
+        params += [category, transaction] + location_params + band_params
+    params.append(limit)
+
+    active_band = band_filter.format(price="fiyat")
+    archived_band = band_filter.format(price="last_price")
+    distance = _distance_sql(target, area_m2)
+
+    sql = f"""
+        WITH candidates AS (
+            SELECT id, fiyat, baslik, link, mahalle, crawled_at AS seen_at,
+                   area_m2, 'active' AS status
+            FROM {active_table}
+            WHERE category = %s AND transaction = %s{location_filter}{active_band}
+            UNION ALL
+            SELECT listing_id, last_price, baslik, link, mahalle, removed_at,
+                   NULL::integer, 'archived'
+            FROM {archived_table}
+            WHERE category = %s AND transaction = %s{location_filter}{archived_band}
+              AND removed_at >= NOW() - INTERVAL '{ARCHIVE_DAYS} days'
+        ),
+        ranked AS (
+            SELECT *, {distance} AS distance
+            FROM candidates
+        )
+        SELECT id, fiyat, baslik, link, mahalle, seen_at AS crawled_at, status,
+               area_m2 AS m2, round((1 / (1 + distance))::numeric, 3) AS similarity
+        FROM ranked
+        ORDER BY distance, id
+        LIMIT %s
+    """
+    return sql, params
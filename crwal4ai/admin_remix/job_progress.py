@@ -0,0 +1,157 @@
+"""
+Job Progress Reporter - mining_jobs Güncellemelerini Birleştirme
+================================================================
+Crawler her sayfada progress/stats günceller; her çağrıda tüm stats'ı
+(büyüyen errors listesi dahil) yazmak yerine:
+
+- Debounce: son yazımdan MIN_INTERVAL saniye geçmediyse ve yüzde en az
+  MIN_DELTA_PCT değişmediyse yazma atlanır (bekleyen olarak işaretlenir)
+- Sadece değişen stats alanları `stats || %s::jsonb` ile birleştirilir
+- errors listesi son MAX_ERRORS kayda kırpılır (errors_total toplamı tutar)
+- Atlanan yazımlar `suppressed` sayacında tutulur
+
+Kullanım:
+    reporter = JobProgressReporter(job_id)
+    reporter.update(progress={"current": 3, "total": 10, "percentage": 30}, stats=stats)
+    reporter.update(stats=stats)              # sadece stats
+    reporter.update(stats=stats, force=True)  # debounce'u atla
+    reporter.flush()                          # bekleyen son durumu yaz
+
+Ortam değişkenleri:
+    JOB_PROGRESS_MIN_INTERVAL  İki yazım arası minimum süre, saniye (default: 2)
+    JOB_PROGRESS_MIN_DELTA     Beklemeden yazdıran yüzde değişimi (default: 5)
+    JOB_PROGRESS_MAX_ERRORS    stats.errors içinde tutulacak kayıt (default: 20)
+"""
+
+import json
+import logging
+import os
+import time
+
+from db_manager import db
+
+logger = logging.getLogger(__name__)
+
+MIN_INTERVAL = float(os.getenv("JOB_PROGRESS_MIN_INTERVAL", "2"))
+MIN_DELTA_PCT = int(os.getenv("JOB_PROGRESS_MIN_DELTA", "5"))
+MAX_ERRORS = int(os.getenv("JOB_PROGRESS_MAX_ERRORS", "20"))
+
+# Hazırlanmış sorgu ($1: progress, $2: stats yaması, $3: job id)
+UPDATE_SQL = """
+    UPDATE mining_jobs
+    SET progress = COALESCE($1::jsonb, progress),
+        stats = COALESCE(stats, '{}'::jsonb) || $2::jsonb,
+        updated_at = NOW()
+    WHERE id = $3::uuid
+"""
+
+
+class JobProgressReporter:
+    """mining_jobs.progress / stats için debounce + diff yazıcı"""
+
+    def __init__(
+        self,
+        job_id: str,
+        min_interval: float = MIN_INTERVAL,
+        min_delta_pct: int = MIN_DELTA_PCT,
+        max_errors: int = MAX_ERRORS,
+    ):
+        self.job_id = job_id
+        self.min_interval = min_interval
+        self.min_delta_pct = min_delta_pct
+        self.max_errors = max_errors
+
+        # Son yazılan durum (JSON metni olarak karşılaştırılır)
+        self._sent_progress = None
+        self._sent_stats = {}
+        self._last_write = 0.0
+
+        # Henüz yazılmamış son durum
+        self._pending_progress = None
+        self._pending_stats = None
+
+        # İstatistikler
+        self.writes = 0
+        self.suppressed = 0
+
+    def _cap_errors(self, stats: dict) -> dict:
+        errors = stats.get("errors")
+        if not isinstance(errors, list) or len(errors) <= self.max_errors:
+            return stats
+        capped = dict(stats)
+        capped["errors"] = errors[-self.max_errors :]
+        capped["errors_total"] = len(errors)
+        return capped
+
+    def _changed_stats(self, stats: dict) -> dict:
+        """Son yazımdan beri değişen üst seviye alanlar (JSON metni olarak)"""
+        changed = {}
+        for key, value in self._cap_errors(stats).items():
+            encoded = json.dumps(value, sort_keys=True, default=str)
+            if self._sent_stats.get(key) != encoded:
+                changed[key] = encoded
+        return changed
+
+    def update(self, progress: dict = None, stats: dict = None, force: bool = False):
+        """Yeni durumu bildir; gerekirse yaz, değilse bekleyen olarak sakla"""
+        if progress is not None:
+            self._pending_progress = progress
+        if stats is not None:
+            self._pending_stats = stats
+
+        if force or self._is_due(progress):
+            self.flush()
+        else:
+            self.suppressed += 1
+
+    def _is_due(self, progress: dict = None) -> bool:
+        if time.monotonic() - self._last_write >= self.min_interval:
+            return True
+        if progress and self._sent_progress:
+            sent = json.loads(self._sent_progress).get("percentage", 0)
+            if abs(progress.get("percentage", 0) - sent) >= self.min_delta_pct:
+                return True
+        return False
+
+    def flush(self) -> bool:
+        """Bekleyen progress ve değişen stats alanlarını tek UPDATE ile yaz"""
+        progress_json = None
+        if self._pending_progress is not None:
+            progress_json = json.dumps(self._pending_progress, default=str)
+            if progress_json == self._sent_progress:
+                progress_json = None
+
+        changed = (
+            self._changed_stats(self._pending_stats)
+            if self._pending_stats is not None
+            else {}
+        )
+
+        self._pending_progress = None
+        self._pending_stats = None
+
+        if progress_json is None and not changed:
+            return True
+
+        stats_patch = "{" + ", ".join(
+            f"{json.dumps(key)}: {value}" for key, value in changed.items()
+        ) + "}"
+
+        try:
+            with db.cursor(dict_cursor=False) as cur:
+                db.execute_prepared(
+                    cur,
+                    "job_progress_update",
+                    UPDATE_SQL,
+                    (progress_json, stats_patch, self.job_id),
+                )
+        except Exception as e:
+            logger.warning(f"Progress güncellenemedi: {e}")
+            return False
+
+        if progress_json is not None:
+            self._sent_progress = progress_json
+        self._sent_stats.update(changed)
+        self._last_write = time.monotonic()
+        self.writes += 1
+        return True
@@ -0,0 +1,283 @@
+"""
+İlan ID İndeksi - Kompakt Üyelik Kontrolü
+==========================================
+sahibinden_liste id'lerini her başlangıçta Python set'ine (string) yüklemek
+yerine sıralı int64 dizisi olarak yerel cache dosyasında tutar.
+
+- Cache dosyası mmap ile salt-okunur açılır; paralel worker'lar aynı sayfaları
+  paylaşır (id başına 8 byte, kopya yok)
+- Başlangıçta sadece `crawled_at > last_sync` olan id'ler çekilir ve
+  dosyaya birleştirilir (tam yükleme sadece cache yoksa / çok eskiyse)
+- `removed_at > last_sync` olan kaldırılmış ilanlar cache'ten çıkarılır;
+  tekrar yayınlanan ilan "yeni" sayılır
+- Çalışma sırasında eklenen id'ler küçük bir set'te tutulur
+
+Kullanım:
+    from listing_id_index import ListingIdIndex
+
+    ids = ListingIdIndex.load()       # cache + artımlı refresh
+    "12345" in ids                    # str veya int kabul eder
+    ids.add("12345")
+    len(ids)
+
+Ortam değişkenleri:
+    LISTING_ID_CACHE          Cache dosyası (default: admin_remix/cache/listing_ids.bin)
+    LISTING_ID_CACHE_MAX_AGE  Bu kadar saatten eski cache tamamen yeniden kurulur (default: 168)
+"""
+
+import heapq
+import logging
+import mmap
+import os
+import struct
+import tempfile
+import time
+from array import array
+from bisect import bisect_left
+from pathlib import Path
+from typing import Callable, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SCRIPT_DIR = Path(__file__).parent
+DEFAULT_CACHE_PATH = Path(
+    os.getenv("LISTING_ID_CACHE", SCRIPT_DIR / "cache" / "listing_ids.bin")
+)
+CACHE_MAX_AGE_HOURS = float(os.getenv("LISTING_ID_CACHE_MAX_AGE", "168"))
+
+# Refresh sorgusu NOW() ile commit arasında yazılan satırları kaçırmasın diye
+SYNC_SAFETY_MARGIN = 300  # saniye
+
+# Dosya formatı: magic(4) + versiyon(4) + last_sync epoch(8, double) + int64 id'ler
+_MAGIC = b"SLID"
+_VERSION = 1
+_HEADER = struct.Struct("<4sId")
+
+# (since_epoch | None) -> (id iterable, sync_epoch)
+IdFetcher = Callable[[Optional[float]], Tuple[Iterable[int], float]]
+# since_epoch -> o andan sonra kaldırılan id'ler
+RemovedFetcher = Callable[[float], Iterable[int]]
+
+
+def fetch_ids_from_postgres(since: Optional[float]) -> Tuple[Iterable[int], float]:
+    """db_manager ile id'leri çek. since=None ise tüm tablo."""
+    from db_manager import db
+
+    now_row = db.execute_one("SELECT EXTRACT(EPOCH FROM NOW())::float8 AS now")
+    if now_row is None:
+        raise RuntimeError("Veritabanı saati okunamadı")
+
+    # Tam yükleme sunucu tarafı cursor ile akıtılır (dict listesi oluşmaz)
+    if since is None:
+        rows = db.stream_query("SELECT id FROM sahibinden_liste", itersize=20000)
+    else:
+        rows = db.stream_query(
+            "SELECT id FROM sahibinden_liste WHERE crawled_at > to_timestamp(%s)",
+            (since - SYNC_SAFETY_MARGIN,),
+            itersize=20000,
+        )
+
+    return (r[0] for r in rows), now_row["now"]
+
+
+def fetch_removed_ids_from_postgres(since: float) -> Iterable[int]:
+    """Son senkrondan sonra removed_listings'e taşınan id'ler"""
+    from db_manager import db
+
+    rows = db.stream_query(
+        "SELECT listing_id FROM removed_listings WHERE removed_at > to_timestamp(%s)",
+        (since - SYNC_SAFETY_MARGIN,),
+        itersize=20000,
+    )
+    return (r[0] for r in rows)
+
+
+class ListingIdIndex:
+    """Sıralı int64 taban dizi (mmap) + çalışma sırasında eklenenler (set)"""
+
+    def __init__(self, base=None, last_sync: Optional[float] = None):
+        self._base = base if base is not None else array("q")
+        self._added = set()
+        self._removed = set()  # tabanda olup çıkarılanlar
+        self.last_sync = last_sync
+        self._mmap = None
+
+    # ------------------------------------------------------------------
+    # Üyelik
+    # ------------------------------------------------------------------
+
+    def _in_base(self, listing_id: int) -> bool:
+        base = self._base
+        i = bisect_left(base, listing_id)
+        return i < len(base) and base[i] == listing_id
+
+    def __contains__(self, listing_id) -> bool:
+        try:
+            listing_id = int(listing_id)
+        except (TypeError, ValueError):
+            return False
+        if listing_id in self._added:
+            return True
+        return listing_id not in self._removed and self._in_base(listing_id)
+
+    def add(self, listing_id):
+        listing_id = int(listing_id)
+        if self._in_base(listing_id):
+            self._removed.discard(listing_id)
+        else:
+            self._added.add(listing_id)
+
+    def discard(self, listing_id):
+        listing_id = int(listing_id)
+        if self._in_base(listing_id):
+            self._removed.add(listing_id)
+        else:
+            self._added.discard(listing_id)
+
+    def __len__(self) -> int:
+        return len(self._base) + len(self._added) - len(self._removed)
+
+    # ------------------------------------------------------------------
+    # Cache dosyası
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_file(cls, path: Path) -> Optional["ListingIdIndex"]:
+        """Cache dosyasını mmap ile aç. Geçersizse None."""
+        try:
+            with open(path, "rb") as f:
+                header = f.read(_HEADER.size)
+                if len(header) < _HEADER.size:
+                    return None
+                magic, version, last_sync = _HEADER.unpack(header)
+                if magic != _MAGIC or version != _VERSION:
+                    return None
+
+                size = os.fstat(f.fileno()).st_size
+                if (size - _HEADER.size) % 8:
+                    return None
+                if size == _HEADER.size:
+                    return cls(array("q"), last_sync)
+
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except OSError:
+            return None
+
+        index = cls(memoryview(mm)[_HEADER.size :].cast("q"), last_sync)
+        index._mmap = mm
+        return index
+
+    def save(self, path: Path):
+        """
+        Taban + eklenenleri sıralı olarak atomik yaz (tmp + rename). Her
+        yazıcı kendi tmp dosyasını kullanır: aynı süreçteki worker thread'leri
+        birbirinin yarım dosyasını taşımaz.
+        """
+        path.parent.mkdir(parents=True, exist_ok=True)
+        merged = self._merged()
+        fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, _VERSION, self.last_sync or 0.0))
+                merged.tofile(f)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def write_header(self, path: Path):
+        """Dizi değişmediyse dosyayı yeniden yazmadan last_sync'i güncelle"""
+        with open(path, "r+b") as f:
+            f.write(_HEADER.pack(_MAGIC, _VERSION, self.last_sync or 0.0))
+
+    def _merged(self) -> array:
+        base = self._base
+        if self._removed:
+            removed = self._removed
+            base = (i for i in base if i not in removed)
+        if not self._added:
+            return array("q", base)
+        return array("q", heapq.merge(base, sorted(self._added)))
+
+    def close(self):
+        if self._mmap is not None:
+            self._base.release()
+            self._base = array("q")
+            self._mmap.close()
+            self._mmap = None
+
+    # ------------------------------------------------------------------
+    # Yükleme / artımlı refresh
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def load(
+        cls,
+        path: Path = DEFAULT_CACHE_PATH,
+        fetch_ids: IdFetcher = fetch_ids_from_postgres,
+        max_age_hours: float = CACHE_MAX_AGE_HOURS,
+        fetch_removed: Optional[RemovedFetcher] = fetch_removed_ids_from_postgres,
+    ) -> "ListingIdIndex":
+        """
+        Cache'i aç, sadece son senkrondan sonra yazılan id'leri çekip birleştir
+        ve o süre içinde kaldırılan id'leri çıkar (fetch_removed).
+
+        Cache yoksa, bozuksa veya max_age_hours'tan eskiyse tam yükleme yapılır.
+        Veritabanına ulaşılamazsa eldeki cache (veya boş indeks) döner.
+        """
+        path = Path(path)
+        index = cls.from_file(path)
+        if index is not None and (
+            not index.last_sync
+            or time.time() - index.last_sync > max_age_hours * 3600
+        ):
+            logger.info("♻️ ID cache çok eski, tamamen yeniden kuruluyor")
+            index.close()
+            index = None
+
+        since = index.last_sync if index is not None else None
+        start = time.perf_counter()
+        try:
+            removed = (
+                set(fetch_removed(since))
+                if since is not None and fetch_removed is not None
+                else set()
+            )
+            ids, sync_epoch = fetch_ids(since)
+            fresh = array("q", sorted(set(ids)))
+        except Exception as e:
+            logger.warning(f"⚠️ ID refresh başarısız, cache kullanılıyor: {e}")
+            return index if index is not None else cls()
+
+        if index is None:
+            index = cls(fresh, sync_epoch)
+            mode = "tam yükleme"
+        else:
+            # Önce çıkar: kaldırılıp tekrar taranan ilan yeniden eklenir
+            for listing_id in removed:
+                index.discard(listing_id)
+            for listing_id in fresh:
+                index.add(listing_id)
+            index.last_sync = sync_epoch
+            mode = f"artımlı, {len(fresh)} güncel, {len(removed)} kaldırılan id"
+
+        try:
+            if index._added or index._removed or index._mmap is None:
+                merged = index._merged()
+                index.close()
+                index = cls(merged, sync_epoch)
+                index.save(path)
+                reopened = cls.from_file(path)
+                if reopened is not None:
+                    index = reopened
+            else:
+                # Yeni id yok: sadece başlıktaki last_sync güncellenir
+                index.write_header(path)
+        except OSError as e:
+            logger.warning(f"⚠️ ID cache yazılamadı ({path}): {e}")
+
+        logger.info(
+            f"📥 {len(index)} mevcut ID ({mode}, "
+            f"{(time.perf_counter() - start) * 1000:.0f} ms)"
+        )
+        return index
@@ -0,0 +1,548 @@
+"""
+Sahibinden Liste Sayfası Parser
+===============================
+Arama sonuç sayfasından (searchResultsTable) ilan satırlarını çıkarır.
+
+Backend'ler:
+    - lxml       : libxml2 tabanlı, önceden derlenmiş XPath sorguları (varsayılan)
+    - selectolax : Lexbor tabanlı hızlı HTML parser
+    - bs4        : BeautifulSoup + html.parser (saf Python, her zaman mevcut)
+
+Tüm crawler'lar (sahibinden_crawler, sahibinden_uc_batch, sahibinden_smart_crawler,
+batch_crawler) bu modülü kullanır; fiyat/tarih parse ve satır çıkarma tek yerdedir.
+
+Tüm backend'ler aynı ListingRow kayıtlarını üretir. parse() bunları
+crawler'ların kullandığı dict yapısına çevirir:
+    {"id", "baslik", "link", "fiyat", "konum", "tarih", "resim"}
+
+Backend seçimi:
+    parser = get_listing_parser()            # LISTING_PARSER env veya "auto"
+    parser = get_listing_parser("bs4")       # Zorla saf Python
+    listings = parser.parse(html)            # List[Dict]
+    rows = parser.parse_rows(html, "konut", "satilik")  # List[ListingRow]
+"""
+
+import os
+import re
+import sys
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bs4 import BeautifulSoup
+
+# lxml (opsiyonel - derlenmiş XPath fast-path)
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# selectolax (opsiyonel - Lexbor fast-path)
+try:
+    from selectolax.lexbor import LexborHTMLParser
+
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+logger = logging.getLogger(__name__)
+
+BASE_URL = "https://www.sahibinden.com"
+
+# CSS seçiciler (bs4 / selectolax)
+ROW_SELECTOR = "#searchResultsTable tbody tr.searchResultsItem"
+TITLE_SELECTOR = "a.classifiedTitle"
+PRICE_SELECTOR = "td.searchResultsPriceValue span"
+LOCATION_SELECTOR = "td.searchResultsLocationValue"
+DATE_SELECTOR = "td.searchResultsDateValue span"
+IMAGE_SELECTOR = "td.searchResultsLargeThumbnail img"
+
+
+# Fiyat / tarih için önceden derlenmiş regex'ler
+_NON_DIGIT_RE = re.compile(r"\D+")
+_RELATIVE_DATE_RE = re.compile(r"^(Bugün|Dün)(?:\s+(\d{1,2}):(\d{2}))?")
+_ABSOLUTE_DATE_RE = re.compile(r"^(\d{1,2})\s+(\w+)(?:\s+(\d{4}))?")
+
+TURKISH_MONTHS = {
+    "Ocak": 1,
+    "Şubat": 2,
+    "Mart": 3,
+    "Nisan": 4,
+    "Mayıs": 5,
+    "Haziran": 6,
+    "Temmuz": 7,
+    "Ağustos": 8,
+    "Eylül": 9,
+    "Ekim": 10,
+    "Kasım": 11,
+    "Aralık": 12,
+}
+
+
+def parse_price(price_str) -> int:
+    """
+    Fiyat string'ini integer'a çevirir.
+    Örnek: "9.300.000 TL" -> 9300000
+    """
+    if not price_str:
+        return 0
+    if isinstance(price_str, int):
+        return price_str
+    cleaned = _NON_DIGIT_RE.sub("", str(price_str))
+    return int(cleaned) if cleaned else 0
+
+
+def parse_listing_date(date_str: str) -> Optional[datetime]:
+    """
+    İlan tarihini parse et
+
+    Formatlar:
+    - "Bugün 14:30" -> bugün saat 14:30
+    - "Dün 09:15" -> dün saat 09:15
+    - "15 Ocak" -> 15 Ocak (gelecekte kalıyorsa geçen yıl)
+    - "20 Aralık 2024" -> 20 Aralık 2024
+
+    Returns:
+        datetime object veya None
+    """
+    if not date_str:
+        return None
+
+    try:
+        date_str = date_str.strip()
+        now = datetime.now()
+
+        match = _RELATIVE_DATE_RE.match(date_str)
+        if match:
+            day = now if match.group(1) == "Bugün" else now - timedelta(days=1)
+            if match.group(2):
+                return day.replace(
+                    hour=int(match.group(2)),
+                    minute=int(match.group(3)),
+                    second=0,
+                    microsecond=0,
+                )
+            return day
+
+        match = _ABSOLUTE_DATE_RE.match(date_str)
+        if match:
+            month = TURKISH_MONTHS.get(match.group(2))
+            if not month:
+                return None
+
+            day = int(match.group(1))
+            if match.group(3):
+                return datetime(int(match.group(3)), month, day)
+
+            # Yıl yoksa: bu yıl, tarih gelecekte kalıyorsa geçen yıl
+            parsed = datetime(now.year, month, day)
+            if parsed > now:
+                parsed = parsed.replace(year=now.year - 1)
+            return parsed
+
+        return None
+
+    except ValueError as e:
+        logger.debug(f"Tarih parse hatası: {date_str} -> {e}")
+        return None
+
+
+def listing_date_sql(column: str) -> str:
+    """
+    parse_listing_date'in PostgreSQL karşılığı (sunucu tarafı toplu işlemler için).
+    Aynı formatları tanır; tanınmayan değerde NULL döner.
+
+    Örnek:
+        f"COALESCE({listing_date_sql('s.tarih')}, NOW())"
+    """
+    c = f"btrim({column})"
+    months = "ARRAY[" + ", ".join(f"'{m}'" for m in TURKISH_MONTHS) + "]"
+    return f"""(CASE
+        WHEN {c} ~ '^(Bugün|Dün)' THEN
+            date_trunc('day', LOCALTIMESTAMP)
+            - CASE WHEN {c} ~ '^Dün' THEN interval '1 day' ELSE interval '0' END
+            + COALESCE(
+                substring({c} from '^\\S+\\s+(\\d{{1,2}}:\\d{{2}})')::interval,
+                LOCALTIMESTAMP - date_trunc('day', LOCALTIMESTAMP)
+            )
+        WHEN array_position({months}, substring({c} from '^\\d{{1,2}}\\s+([^\\s\\d]+)')) IS NOT NULL THEN (
+            SELECT CASE
+                WHEN p.dd < 1 OR extract(month FROM p.d) <> p.m THEN NULL
+                WHEN p.y IS NULL AND p.d > LOCALTIMESTAMP THEN p.d - interval '1 year'
+                ELSE p.d
+            END
+            FROM (
+                SELECT make_date(COALESCE(v.y, extract(year FROM LOCALTIMESTAMP)::int), v.m, 1)::timestamp
+                       + (v.dd - 1) * interval '1 day' AS d,
+                       v.dd, v.m, v.y
+                FROM (
+                    SELECT substring({c} from '^(\\d{{1,2}})')::int AS dd,
+                           array_position({months}, substring({c} from '^\\d{{1,2}}\\s+([^\\s\\d]+)')) AS m,
+                           substring({c} from '^\\d{{1,2}}\\s+[^\\s\\d]+\\s+(\\d{{4}})')::int AS y
+                ) v
+            ) p
+        )
+    END)"""
+
+
+def is_new_listing(listing_date: Optional[datetime]) -> bool:
+    """
+    İlan yeni mi kontrol et (bugün veya dün yayınlanmış mı)
+
+    Args:
+        listing_date: İlan tarihi
+
+    Returns:
+        True ise yeni ilan (bugün veya dün), False ise eski
+    """
+    if not listing_date:
+        return False
+
+    age = datetime.now().date() - listing_date.date()
+    return timedelta(0) <= age <= timedelta(days=1)
+
+
+# Backend'lerin ürettiği ham satır:
+# (id, baslik, href, fiyat, konum, tarih, resim src, resim data-src)
+RawRow = Tuple[
+    str,
+    Optional[str],
+    Optional[str],
+    Optional[str],
+    Optional[str],
+    Optional[str],
+    Optional[str],
+    Optional[str],
+]
+
+
+class ListingRow:
+    """
+    Tek bir ilan satırı.
+
+    __slots__ ile satır başına dict yükü olmadan tutulur. None olan alanlar
+    (sayfada element bulunamadı) to_dict() çıktısına eklenmez; böylece çıktı
+    orijinal BeautifulSoup implementasyonu ile birebir aynıdır.
+    """
+
+    __slots__ = (
+        "id",
+        "baslik",
+        "link",
+        "fiyat",
+        "konum",
+        "tarih",
+        "resim",
+        "resim_lazy",
+        "category",
+        "transaction",
+    )
+
+    FIELDS = ("id", "baslik", "link", "fiyat", "konum", "tarih", "resim")
+
+    def __init__(
+        self,
+        id: str,
+        baslik: Optional[str] = None,
+        link: Optional[str] = None,
+        fiyat: Optional[str] = None,
+        konum: Optional[str] = None,
+        tarih: Optional[str] = None,
+        resim: Optional[str] = None,
+        resim_lazy: Optional[str] = None,
+        category: Optional[str] = None,
+        transaction: Optional[str] = None,
+    ):
+        self.id = id
+        self.baslik = baslik
+        self.link = link
+        self.fiyat = fiyat
+        self.konum = konum
+        self.tarih = tarih
+        self.resim = resim
+        self.resim_lazy = resim_lazy
+        self.category = category
+        self.transaction = transaction
+
+    @classmethod
+    def from_raw(
+        cls,
+        raw: RawRow,
+        category: Optional[str] = None,
+        transaction: Optional[str] = None,
+    ) -> Optional["ListingRow"]:
+        """Backend ham satırından kayıt oluştur; id/link yoksa None"""
+        listing_id, title, href, price, location, date, image, image_lazy = raw
+
+        link = None
+        if title is not None:
+            if href and href != "#":
+                link = f"{BASE_URL}{href}" if href.startswith("/") else href
+            elif listing_id:
+                link = f"{BASE_URL}/ilan/{listing_id}"
+
+        if not listing_id or not link:
+            return None
+
+        return cls(
+            listing_id,
+            title,
+            link,
+            price,
+            " ".join(location.split()) if location is not None else None,
+            date,
+            image,
+            image_lazy,
+            category,
+            transaction,
+        )
+
+    @property
+    def price_value(self) -> int:
+        return parse_price(self.fiyat)
+
+    @property
+    def listing_date(self) -> Optional[datetime]:
+        return parse_listing_date(self.tarih)
+
+    def to_dict(self) -> Dict:
+        data = {}
+        for name in self.FIELDS:
+            value = getattr(self, name)
+            if value is not None:
+                data[name] = value
+        if self.category is not None:
+            data["category"] = self.category
+        if self.transaction is not None:
+            data["transaction"] = self.transaction
+        return data
+
+    def __repr__(self) -> str:
+        return f"ListingRow(id={self.id!r}, baslik={self.baslik!r})"
+
+
+def _join_stripped(strings) -> str:
+    """BeautifulSoup get_text(strip=True) eşdeğeri"""
+    return "".join(s for s in (t.strip() for t in strings) if s)
+
+
+class ListingParser:
+    """
+    Saf Python backend (BeautifulSoup + html.parser).
+
+    Diğer backend'ler bu sınıfı genişletir ve sadece _iter_raw() metodunu
+    değiştirir; satır kaydı oluşturma (ListingRow.from_raw) ortaktır.
+    """
+
+    name = "bs4"
+
+    def _iter_raw(self, html: str) -> Iterator[RawRow]:
+        soup = BeautifulSoup(html, "html.parser")
+
+        for row in soup.select(ROW_SELECTOR):
+            try:
+                title_el = row.select_one(TITLE_SELECTOR)
+                price_el = row.select_one(PRICE_SELECTOR)
+                loc_el = row.select_one(LOCATION_SELECTOR)
+                date_el = row.select_one(DATE_SELECTOR)
+                img_el = row.select_one(IMAGE_SELECTOR)
+
+                yield (
+                    row.get("data-id", ""),
+                    title_el.get("title", "").strip() if title_el else None,
+                    title_el.get("href", "") if title_el else None,
+                    price_el.get_text(strip=True) if price_el else None,
+                    loc_el.get_text(strip=True) if loc_el else None,
+                    date_el.get_text(strip=True) if date_el else None,
+                    img_el.get("src", "") if img_el else None,
+                    img_el.get("data-src") if img_el else None,
+                )
+            except Exception:
+                continue
+
+    def parse_rows(
+        self,
+        html: str,
+        category: Optional[str] = None,
+        transaction: Optional[str] = None,
+    ) -> List[ListingRow]:
+        """
+        HTML'den ilan kayıtlarını çıkar.
+
+        Args:
+            html: Arama sonuç sayfası
+            category: Kayıtlara yazılacak kategori (örn: "konut")
+            transaction: Kayıtlara yazılacak işlem tipi (örn: "satilik")
+        """
+        if not html:
+            return []
+
+        # Aynı sayfadaki 50 satır aynı string nesnesini paylaşır
+        if category is not None:
+            category = sys.intern(category)
+        if transaction is not None:
+            transaction = sys.intern(transaction)
+
+        rows = []
+        from_raw = ListingRow.from_raw
+        for raw in self._iter_raw(html):
+            row = from_raw(raw, category, transaction)
+            if row is not None:
+                rows.append(row)
+        return rows
+
+    def parse(self, html: str) -> List[Dict]:
+        """HTML'den ilan listesini çıkar (dict formatında)"""
+        return [row.to_dict() for row in self.parse_rows(html)]
+
+
+if HAS_LXML:
+
+    def _has_class(name: str) -> str:
+        return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+    # Modül yüklenirken bir kez derlenir, her sayfada tekrar kullanılır
+    _XP_ROWS = etree.XPath(
+        "//*[@id='searchResultsTable']//tbody//tr[" + _has_class("searchResultsItem") + "]"
+    )
+    _XP_TITLE = etree.XPath(".//a[" + _has_class("classifiedTitle") + "]")
+    _XP_PRICE = etree.XPath(".//td[" + _has_class("searchResultsPriceValue") + "]//span")
+    _XP_LOCATION = etree.XPath(".//td[" + _has_class("searchResultsLocationValue") + "]")
+    _XP_DATE = etree.XPath(".//td[" + _has_class("searchResultsDateValue") + "]//span")
+    _XP_IMAGE = etree.XPath(".//td[" + _has_class("searchResultsLargeThumbnail") + "]//img")
+    _XP_TEXT = etree.XPath(".//text()")
+
+
+class LxmlListingParser(ListingParser):
+    """lxml backend - önceden derlenmiş XPath sorguları ile"""
+
+    name = "lxml"
+
+    @staticmethod
+    def _first(xpath, row):
+        found = xpath(row)
+        return found[0] if found else None
+
+    @staticmethod
+    def _text(el) -> Optional[str]:
+        if el is None:
+            return None
+        # .//text() yorumları (comment) dışarıda bırakır, bs4 ile aynı davranış
+        return _join_stripped(_XP_TEXT(el))
+
+    def _iter_raw(self, html: str) -> Iterator[RawRow]:
+        try:
+            tree = lxml_html.fromstring(html)
+        except (etree.ParserError, ValueError) as e:
+            logger.debug(f"lxml parse hatası: {e}")
+            return
+
+        first = self._first
+        text = self._text
+
+        for row in _XP_ROWS(tree):
+            try:
+                title_el = first(_XP_TITLE, row)
+                img_el = first(_XP_IMAGE, row)
+
+                yield (
+                    row.get("data-id", ""),
+                    title_el.get("title", "").strip() if title_el is not None else None,
+                    title_el.get("href", "") if title_el is not None else None,
+                    text(first(_XP_PRICE, row)),
+                    text(first(_XP_LOCATION, row)),
+                    text(first(_XP_DATE, row)),
+                    img_el.get("src", "") if img_el is not None else None,
+                    img_el.get("data-src") if img_el is not None else None,
+                )
+            except Exception:
+                continue
+
+
+class SelectolaxListingParser(ListingParser):
+    """selectolax (Lexbor) backend"""
+
+    name = "selectolax"
+
+    @staticmethod
+    def _attr(el, name: str) -> str:
+        value = el.attributes.get(name)
+        return value if value is not None else ""
+
+    @staticmethod
+    def _text(el) -> Optional[str]:
+        if el is None:
+            return None
+        return _join_stripped(
+            node.text_content or ""
+            for node in el.traverse(include_text=True)
+            if node.tag == "-text"
+        )
+
+    def _iter_raw(self, html: str) -> Iterator[RawRow]:
+        tree = LexborHTMLParser(html)
+        attr = self._attr
+        text = self._text
+
+        for row in tree.css(ROW_SELECTOR):
+            try:
+                title_el = row.css_first(TITLE_SELECTOR)
+                img_el = row.css_first(IMAGE_SELECTOR)
+
+                yield (
+                    attr(row, "data-id"),
+                    attr(title_el, "title").strip() if title_el is not None else None,
+                    attr(title_el, "href") if title_el is not None else None,
+                    text(row.css_first(PRICE_SELECTOR)),
+                    text(row.css_first(LOCATION_SELECTOR)),
+                    text(row.css_first(DATE_SELECTOR)),
+                    attr(img_el, "src") if img_el is not None else None,
+                    img_el.attributes.get("data-src") if img_el is not None else None,
+                )
+            except Exception:
+                continue
+
+
+PARSER_BACKENDS = {
+    "lxml": (LxmlListingParser, HAS_LXML),
+    "selectolax": (SelectolaxListingParser, HAS_SELECTOLAX),
+    "bs4": (ListingParser, True),
+}
+
+# "auto" modunda denenecek sıra
+AUTO_BACKEND_ORDER = ["lxml", "selectolax", "bs4"]
+
+
+def available_backends() -> List[str]:
+    """Kurulu olan backend isimlerini döndür"""
+    return [name for name in AUTO_BACKEND_ORDER if PARSER_BACKENDS[name][1]]
+
+
+def get_listing_parser(backend: Optional[str] = None) -> ListingParser:
+    """
+    Parser backend'i seç.
+
+    Args:
+        backend: "lxml", "selectolax", "bs4" veya "auto".
+                 None ise LISTING_PARSER env değişkeni kullanılır (default: auto).
+
+    Returns:
+        ListingParser instance. İstenen backend kurulu değilse bs4'e düşer.
+    """
+    backend = (backend or os.getenv("LISTING_PARSER", "auto")).lower()
+
+    if backend != "auto":
+        parser_cls, available = PARSER_BACKENDS.get(backend, (None, False))
+        if parser_cls and available:
+            return parser_cls()
+        logger.warning(f"⚠️ Parser backend kullanılamıyor: {backend}, otomatik seçiliyor")
+
+    for name in AUTO_BACKEND_ORDER:
+        parser_cls, available = PARSER_BACKENDS[name]
+        if available:
+            return parser_cls()
+
+    return ListingParser()
@@ -0,0 +1,98 @@
+"""
+İlan Başlığı Arama - Türkçe Katlamalı tsvector
+==============================================
+/api/listings?search= eskiden `baslik ILIKE '%terim%'` ile her tuşta tüm
+tabloyu tarıyordu. Arama artık sahibinden_liste.baslik_tsv (drizzle/0012)
+üzerinden GIN index ile yapılır:
+
+- Başlık ve arama terimi aynı kurallarla katlanır: İ/I/ı -> i, ş -> s,
+  ğ -> g, ü -> u, ö -> o, ç -> c ("KÖŞE" == "köse" == "kose")
+- Her kelime önek olarak aranır ("sat dai" -> sat:* & dai:*); yazarken
+  arama için uygundur. Noktalamayla bitişik parçalar ifade olarak aranır
+  ("3+1" -> 3:* <-> 1:*)
+- Sonuçlar ts_rank ile sıralanır (sort_by=relevance, arama varken varsayılan)
+
+search_fold() SQL fonksiyonu (drizzle/0012) ile fold_turkish() birebir
+aynı eşlemeyi kullanır.
+
+Kullanım:
+    from listing_search import search_condition, relevance_sort
+
+    where_sql, params = search_condition("3+1 Köşe")   # " AND baslik_tsv @@ ...", ["(3:* <-> 1:*) & kose:*"]
+    spec = relevance_sort("3+1 Köşe")                   # pagination.SortSpec
+"""
+
+import re
+
+from pagination import SortSpec
+
+# drizzle/0012 search_fold(): translate(..., FOLD_FROM, FOLD_TO) sonra lower()
+# Noktalama boşluğa çevrilir: "3+1" -> "3 1" (simple parser "+1" üretmesin)
+FOLD_FROM = "İIıŞşĞğÜüÖöÇçÂâÎîÛû+/.,-"
+FOLD_TO = "iiissgguuooccaaiiuu     "
+
+_FOLD_TABLE = str.maketrans(FOLD_FROM, FOLD_TO)
+_WORD_PATTERN = re.compile(r"[^\W_]+")
+
+# Çok uzun aramalar sorguyu şişirmesin
+MAX_TERMS = 8
+
+SEARCH_COLUMN = "baslik_tsv"
+
+
+def fold_turkish(text: str) -> str:
+    """Türkçe karakterleri katla ve küçült: "Satılık KÖŞE" -> "satilik kose" """
+    return (text or "").translate(_FOLD_TABLE).lower()
+
+
+def search_terms(text: str) -> list:
+    """Arama metnindeki kelimeler (katlanmış, sadece harf / rakam)"""
+    return _WORD_PATTERN.findall(fold_turkish(text))[:MAX_TERMS]
+
+
+def to_tsquery_text(text: str):
+    """
+    Önek tsquery metni (kelime yoksa None):
+        "Köşe daire" -> "kose:* & daire:*"
+        "3+1 bahçeli" -> "(3:* <-> 1:*) & bahceli:*"   (noktalamayla bitişik = ifade)
+    """
+    parts = []
+    remaining = MAX_TERMS
+    for chunk in (text or "").split():
+        terms = search_terms(chunk)[:remaining]
+        if not terms:
+            continue
+        remaining -= len(terms)
+        phrase = " <-> ".join(f"{term}:*" for term in terms)
+        parts.append(f"({phrase})" if len(terms) > 1 else phrase)
+        if remaining <= 0:
+            break
+    return " & ".join(parts) or None
+
+
+def search_condition(text: str):
+    """
+    Başlık arama filtresi.
+
+    Returns:
+        (" AND baslik_tsv @@ to_tsquery('simple', %s)", [tsquery]) veya ("", [])
+    """
+    query = to_tsquery_text(text)
+    if query is None:
+        return "", []
+    return f" AND {SEARCH_COLUMN} @@ to_tsquery('simple', %s)", [query]
+
+
+def relevance_sort(text: str) -> SortSpec:
+    """
+    ts_rank sıralaması (yüksekten düşüğe, eşitlikte id). Cursor modunda da
+    çalışsın diye tsquery ifadeye gömülür; terimler sadece harf / rakam
+    içerdiğinden literal güvenlidir.
+    """
+    query = to_tsquery_text(text) or ""
+    return SortSpec(
+        "relevance",
+        f"ts_rank({SEARCH_COLUMN}, to_tsquery('simple', '{query}'))",
+        "id",
+        True,
+    )
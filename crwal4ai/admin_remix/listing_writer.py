@@ -0,0 +1,155 @@
+"""
+Liste İlanı Yazıcı - sahibinden_liste Upsert
+=============================================
+Crawler'ın sahibinden_liste tablosuna yazma yolu.
+
+İki yöntem:
+  - upsert_listings_values: Sayfa başına tek INSERT ... VALUES ... ON CONFLICT
+    (eski yöntem, küçük batch'ler için)
+  - ListingBulkWriter: Satırları sayfalar arası biriktirir, flush_size'a
+    ulaşınca COPY FROM STDIN + tek INSERT ... SELECT ... ON CONFLICT ile yazar
+    (full-sync taramalarında çok daha hızlı)
+
+Kullanım:
+    writer = ListingBulkWriter(flush_size=1000)
+    writer.add(rows)      # rows: LISTING_COLUMNS sırasında tuple listesi
+    writer.flush()        # Kategori sonunda / kapanışta mutlaka çağır
+
+    LISTING_FLUSH_SIZE=1000 python sahibinden_crawler.py --sync   # env ile aç
+"""
+
+import logging
+import os
+
+from db_manager import db
+
+logger = logging.getLogger(__name__)
+
+LISTING_TABLE = "sahibinden_liste"
+
+# Tuple sırası - crawled_at her zaman NOW() ile yazılır
+LISTING_COLUMNS = (
+    "id",
+    "baslik",
+    "link",
+    "fiyat",
+    "konum",
+    "tarih",
+    "resim",
+    "category",
+    "transaction",
+    "ilce",
+    "semt",
+    "mahalle",
+)
+
+# 0 = toplu yazma kapalı, her sayfa anında VALUES upsert ile yazılır
+DEFAULT_FLUSH_SIZE = int(os.getenv("LISTING_FLUSH_SIZE", "0"))
+
+
+def upsert_listings_values(rows, table: str = LISTING_TABLE) -> bool:
+    """
+    Tek INSERT ... VALUES (...), (...) ... ON CONFLICT (id) DO UPDATE.
+    Satır sayısına göre sunucu tarafı hazırlanmış sorgu kullanılır
+    (sayfa başı 50 ilan -> aynı plan her sayfada tekrar kullanılır).
+    """
+    if not rows:
+        return True
+
+    width = len(LISTING_COLUMNS)
+    values_str = ", ".join(
+        "(" + ", ".join(f"${i * width + j + 1}" for j in range(width)) + ", NOW())"
+        for i in range(len(rows))
+    )
+    params = tuple(value for row in rows for value in row)
+    update_set = ", ".join(f"{c} = EXCLUDED.{c}" for c in LISTING_COLUMNS[1:])
+
+    query = f"""
+        INSERT INTO {table} ({", ".join(LISTING_COLUMNS)}, crawled_at)
+        VALUES {values_str}
+        ON CONFLICT (id)
+        DO UPDATE SET {update_set}, crawled_at = NOW()
+    """
+    try:
+        with db.cursor(dict_cursor=False) as cur:
+            db.execute_prepared(cur, f"upsert_{table}_{len(rows)}", query, params)
+        return True
+    except Exception as e:
+        print(f"❌ Listing upsert error ({table}): {e}")
+        return False
+
+
+class ListingBulkWriter:
+    """
+    Sayfalar arası satır tamponu + COPY tabanlı upsert.
+
+    Aynı ilan birden fazla sayfada görünebilir (tarama sırasında sıralama
+    kayar). ON CONFLICT aynı satırı tek komutta iki kez güncelleyemediği için
+    tampon id'ye göre tutulur, son görülen değer kazanır.
+    """
+
+    def __init__(
+        self, flush_size: int = 1000, table: str = LISTING_TABLE, on_flush=None
+    ):
+        self.flush_size = flush_size
+        self.table = table
+        # Başarılı her flush sonrası yazılan satırlarla çağrılır
+        self.on_flush = on_flush
+        self._buffer = {}
+
+        # İstatistikler
+        self.flushes = 0
+        self.rows_written = 0
+        self.failed_rows = 0
+
+    def __len__(self):
+        return len(self._buffer)
+
+    def add(self, rows) -> bool:
+        """Satırları tampona ekle, eşik aşılırsa flush et (False: flush başarısız)"""
+        for row in rows:
+            self._buffer[row[0]] = row
+
+        if len(self._buffer) >= self.flush_size:
+            return self.flush()
+        return True
+
+    def flush(self) -> bool:
+        """
+        Tamponu veritabanına yaz. Hata olursa satırlar VALUES yoluyla tekrar
+        denenir; o da başarısızsa satırlar tampona geri konur ve False döner.
+        """
+        if not self._buffer:
+            return True
+
+        rows = list(self._buffer.values())
+        self._buffer.clear()
+
+        affected = db.copy_upsert(
+            self.table,
+            LISTING_COLUMNS,
+            rows,
+            key="id",
+            extra_values={"crawled_at": "NOW()"},
+        )
+
+        if affected is None:
+            logger.warning(
+                f"⚠️ COPY upsert başarısız, {len(rows)} satır VALUES ile yazılıyor"
+            )
+            if not upsert_listings_values(rows, self.table):
+                self.failed_rows += len(rows)
+                # Satırlar kaybolmasın: sonraki flush'ta tekrar denenir
+                # (bu arada eklenen daha yeni değerler korunur)
+                for row in rows:
+                    self._buffer.setdefault(row[0], row)
+                logger.error(f"❌ {len(rows)} satır yazılamadı, tamponda tutuluyor")
+                return False
+            affected = len(rows)
+
+        self.flushes += 1
+        self.rows_written += affected
+        logger.info(f"   💾 Toplu yazma: {affected} satır ({self.table})")
+        if self.on_flush:
+            self.on_flush(rows)
+        return True
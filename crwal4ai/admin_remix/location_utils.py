@@ -0,0 +1,175 @@
+"""
+Konum Yardımcıları - İlçe / Semt / Mahalle
+==========================================
+Crawler, admin API ve bakım script'lerinin ortak kullandığı konum ayrıştırma
+ve filtreleme fonksiyonları.
+
+İlçe / mahalle filtreleri `LOWER(konum) LIKE '%x%'` yerine normalize edilmiş
+ilce / mahalle kolonları üzerinden yapılır; SQL ifadeleri drizzle/0011'deki
+fonksiyonel index'lerle birebir aynıdır:
+
+    lower(ilce)                                   -> district_condition()
+    lower(regexp_replace(mahalle, ' (Mah.|...)$')) -> mahalle_condition()
+
+Kullanım:
+    from location_utils import normalize_district, district_condition
+
+    sql, params = district_condition("hendek")   # " AND lower(ilce) = lower(%s)", ["Hendek"]
+    derive_location("Sakarya, Hendek, MerkezYeni Mah.")
+    # -> ("Hendek", "Merkez", "Yeni Mah.")
+"""
+
+import re
+
+# İlçe mapping (slug / küçük harf -> veritabanındaki yazım)
+DISTRICT_MAP = {
+    "adapazari": "Adapazarı",
+    "adapazarı": "Adapazarı",
+    "akyazi": "Akyazı",
+    "akyazı": "Akyazı",
+    "hendek": "Hendek",
+}
+
+# Mahalle karşılaştırmasında yok sayılan ekler ("Yeni Mah." == "Yeni")
+MAHALLE_SUFFIX_PATTERN = r"\s+(mahallesi|mah\.?|mh\.?)$"
+
+_CAMEL_PATTERN = re.compile(r"[A-ZÇĞİÖŞÜ][a-zçğıöşü]*")
+_COMMON_SEMTS = ["Merkez", "Köyler", "İstiklal", "Tepekum", "Semerciler"]
+
+
+def normalize_district(district_str):
+    """
+    İlçe ismini normalize et - case sensitivity düzelt
+    Örnek: "adapazari" -> "Adapazarı", "hendek" -> "Hendek"
+    """
+    if not district_str:
+        return None
+
+    district_lower = district_str.lower().strip()
+    return DISTRICT_MAP.get(district_lower, district_str.title())
+
+
+def parse_konum_to_semt_mahalle(konum_text):
+    """
+    Konum metnini semt ve mahalle olarak ayır - CamelCase pattern
+
+    Strateji:
+    1. CamelCase pattern kullan: İlk büyük harf grubu = semt, ikinci büyük harf grubu = mahalle
+    2. Örnek: "TığcılarYahyalar Mah." -> "Tığcılar" + "Yahyalar Mah."
+    3. Örnek: "MerkezYeni Mah." -> "Merkez" + "Yeni Mah."
+    4. Örnek: "KöylerDağdibi Mh." -> "Köyler" + "Dağdibi Mh."
+
+    Returns:
+        tuple: (semt, mahalle) veya (None, mahalle) veya (semt, None)
+    """
+    if not konum_text:
+        return None, None
+
+    # Boşluk varsa zaten ayrılmış demektir
+    if " " in konum_text and not konum_text[0].isupper():
+        return None, konum_text
+
+    # CamelCase pattern'i bul: Büyük harfle başlayan kelime grupları
+    matches = _CAMEL_PATTERN.findall(konum_text)
+
+    if len(matches) == 0:
+        # Hiç büyük harf yok, tüm metin mahalle
+        return None, konum_text
+
+    elif len(matches) == 1:
+        # Tek kelime var
+        # Eğer yaygın semt isimlerinden biriyse semt, değilse mahalle
+        if matches[0] in _COMMON_SEMTS:
+            # Kalan kısmı al
+            remaining = konum_text[len(matches[0]) :].strip()
+            if remaining:
+                return matches[0], remaining
+            else:
+                return matches[0], None
+        else:
+            return None, konum_text
+
+    else:
+        # İki veya daha fazla kelime var
+        # İlk kelime = semt, geri kalanı = mahalle
+        semt = matches[0]
+
+        # Semt'ten sonraki kısmı al
+        semt_end_index = konum_text.find(semt) + len(semt)
+        mahalle = konum_text[semt_end_index:].strip()
+
+        if not mahalle:
+            # Sadece semt var
+            return semt, None
+
+        return semt, mahalle
+
+
+def derive_location(konum: str, district: str = None):
+    """
+    Konum metninden (ilce, semt, mahalle) türet - crawler'ın yazdığı biçimle aynı.
+
+    Desteklenen biçimler:
+        "MerkezYeni Mah."                    (yeni kayıtlar, ilçe ayrı verilir)
+        "Hendek, MerkezYeni Mah."            (ilk virgülden önce ilçe)
+        "Sakarya, Hendek, MerkezYeni Mah."   (eski kayıtlar: il, ilçe, mahalle)
+    """
+    rest = (konum or "").strip()
+    parts = [p.strip() for p in rest.split(",")]
+    if len(parts) >= 3:
+        district = district or parts[1]
+        rest = ", ".join(parts[2:])
+    elif len(parts) == 2:
+        if not district or parts[0].lower() == district.lower():
+            district = district or parts[0]
+            rest = parts[1]
+
+    ilce = normalize_district(district)
+    semt, mahalle = parse_konum_to_semt_mahalle(rest)
+
+    # FALLBACK: Semt boşsa ilçe, mahalle boşsa semt
+    semt = semt or ilce
+    mahalle = mahalle or semt
+    return ilce, semt, mahalle
+
+
+# ----------------------------------------------------------------------
+# SQL filtreleri (drizzle/0011 fonksiyonel index ifadeleri)
+# ----------------------------------------------------------------------
+
+
+def ilce_key_sql(column: str = "ilce") -> str:
+    return f"lower({column})"
+
+
+def mahalle_column_key_sql(column: str = "mahalle") -> str:
+    """
+    Normalize mahalle kolonunun anahtarı (sonek atılmış, küçük harf).
+    neighborhood_stats.mahalle_key_sql konum'dan türetir; ikisi farklı index'lerdir.
+    """
+    return f"lower(regexp_replace({column}, '{MAHALLE_SUFFIX_PATTERN}', '', 'i'))"
+
+
+def district_condition(district, column: str = "ilce"):
+    """
+    İlçe filtresi. district boş veya 'all' ise filtre yok.
+
+    Returns:
+        (" AND lower(ilce) = lower(%s)", [normalize edilmiş ilçe]) veya ("", [])
+    """
+    if not district or district == "all":
+        return "", []
+    return (
+        f" AND {ilce_key_sql(column)} = lower(%s)",
+        [normalize_district(district)],
+    )
+
+
+def mahalle_condition(mahalle, column: str = "mahalle"):
+    """Mahalle filtresi ("Yeni", "Yeni Mah." ve "yeni mahallesi" eşleşir)"""
+    if not mahalle:
+        return "", []
+    return (
+        f" AND {mahalle_column_key_sql(column)} = {mahalle_column_key_sql('%s')}",
+        [mahalle.strip()],
+    )
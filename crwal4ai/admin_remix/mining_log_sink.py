@@ -0,0 +1,213 @@
+"""
+Mining Log Sink - Arka Planda Toplu mining_logs Yazıcı
+======================================================
+Crawler'ın _add_log çağrıları artık veritabanını beklemez: satırlar sınırlı
+bir kuyruğa atılır, ayrı bir thread her FLUSH_INTERVAL ms'de veya
+FLUSH_ROWS satırda bir, hazırlanmış INSERT'i tek round-trip'te toplu çalıştırır.
+
+Kuyruk dolarsa (DB yavaş / erişilemez):
+  - debug/info satırları atılır, sayılır; yer açılınca tek bir
+    "N log satırı atlandı" özet satırı yazılır
+  - warning/error/success satırları kısa süre bekler, yine dolu ise atılır
+
+Kullanım:
+    sink = MiningLogSink(job_id)
+    sink.log("info", "Sayfa 1 tarandı", {"page": 1})
+    sink.close()   # Kalanları yaz, thread'i durdur (atexit ile de çağrılır)
+
+Ortam değişkenleri:
+    MINING_LOG_FLUSH_MS    Flush aralığı (default: 500)
+    MINING_LOG_FLUSH_ROWS  Bu kadar satır birikince hemen flush (default: 50)
+    MINING_LOG_QUEUE_SIZE  Kuyruk kapasitesi (default: 2000)
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+
+from psycopg2.extras import execute_batch
+
+from db_manager import db
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = int(os.getenv("MINING_LOG_FLUSH_MS", "500")) / 1000
+FLUSH_ROWS = int(os.getenv("MINING_LOG_FLUSH_ROWS", "50"))
+QUEUE_SIZE = int(os.getenv("MINING_LOG_QUEUE_SIZE", "2000"))
+
+# Kuyruk doluyken atılabilecek seviyeler
+DROPPABLE_LEVELS = {"debug", "info"}
+# Önemli satırların kuyrukta yer beklediği süre (saniye)
+PUT_TIMEOUT = 0.2
+
+# Hazırlanmış tek satırlık insert; batch EXECUTE'lar tek round-trip'te gider
+INSERT_SQL = (
+    "INSERT INTO mining_logs (job_id, level, message, data, created_at) "
+    "VALUES ($1::uuid, $2, $3, $4::jsonb, $5)"
+)
+EXECUTE_SQL = "EXECUTE mining_log_insert (%s, %s, %s, %s, %s)"
+
+_STOP = object()
+
+
+class MiningLogSink:
+    """Sınırlı kuyruk + flusher thread ile mining_logs yazıcı"""
+
+    def __init__(
+        self,
+        job_id: str,
+        flush_interval: float = FLUSH_INTERVAL,
+        flush_rows: int = FLUSH_ROWS,
+        queue_size: int = QUEUE_SIZE,
+    ):
+        self.job_id = job_id
+        self.flush_interval = flush_interval
+        self.flush_rows = flush_rows
+
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._dropped = Counter()
+        self._dropped_lock = threading.Lock()
+        self._closed = False
+
+        # İstatistikler
+        self.written = 0
+        self.flushes = 0
+        self.failed = 0
+
+        self._thread = threading.Thread(
+            target=self._run, name=f"mining-log-sink-{job_id}", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ------------------------------------------------------------------
+    # Üretici tarafı (crawler thread'i)
+    # ------------------------------------------------------------------
+
+    def log(self, level: str, message: str, data: dict = None):
+        """Log satırını kuyruğa at, asla DB'yi beklemez"""
+        if self._closed:
+            return
+
+        row = (
+            self.job_id,
+            level,
+            message,
+            json.dumps(data) if data else None,
+            # Sıra için istemci saati; aware değer oturum TimeZone'undan bağımsız
+            datetime.now(timezone.utc),
+        )
+        try:
+            if level in DROPPABLE_LEVELS:
+                self._queue.put_nowait(row)
+            else:
+                self._queue.put(row, timeout=PUT_TIMEOUT)
+        except queue.Full:
+            with self._dropped_lock:
+                self._dropped[level] += 1
+
+    @property
+    def dropped(self) -> int:
+        with self._dropped_lock:
+            return sum(self._dropped.values())
+
+    # ------------------------------------------------------------------
+    # Flusher thread
+    # ------------------------------------------------------------------
+
+    def _run(self):
+        batch = []
+        deadline = None  # İlk satırdan flush_interval sonra yaz
+        stop = False
+
+        while not stop:
+            timeout = (
+                self.flush_interval
+                if deadline is None
+                else max(0.0, deadline - time.monotonic())
+            )
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP:
+                stop = True
+            elif item is not None:
+                batch.append(item)
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+
+            due = deadline is not None and time.monotonic() >= deadline
+            # Boşta (kuyruk boş, tampon boş): sadece atlanan satır özeti yazılabilir
+            idle = item is None and not batch
+            if not (stop or due or idle or len(batch) >= self.flush_rows):
+                continue
+
+            if stop:
+                # Kapanış: kuyrukta kalan her şeyi al
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is not _STOP:
+                        batch.append(item)
+
+            summary = self._take_drop_summary()
+            if summary:
+                batch.append(summary)
+
+            if batch:
+                self._write(batch)
+                batch = []
+                deadline = None
+
+    def _take_drop_summary(self):
+        with self._dropped_lock:
+            if not self._dropped:
+                return None
+            counts = dict(self._dropped)
+            self._dropped.clear()
+
+        total = sum(counts.values())
+        return (
+            self.job_id,
+            "warning",
+            f"{total} log satırı atlandı (kuyruk dolu)",
+            json.dumps({"dropped": counts}),
+            datetime.now(timezone.utc),
+        )
+
+    def _write(self, batch):
+        for attempt in range(2):
+            try:
+                with db.cursor(dict_cursor=False) as cur:
+                    db.prepare(cur, "mining_log_insert", INSERT_SQL)
+                    execute_batch(cur, EXECUTE_SQL, batch, page_size=len(batch))
+                self.written += len(batch)
+                self.flushes += 1
+                return
+            except Exception as e:
+                logger.debug(f"Log yazılamadı (deneme {attempt + 1}): {e}")
+
+        self.failed += len(batch)
+
+    # ------------------------------------------------------------------
+    # Kapanış
+    # ------------------------------------------------------------------
+
+    def close(self, timeout: float = 10.0):
+        """Kuyruktakileri yaz ve thread'i durdur"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        atexit.unregister(self.close)
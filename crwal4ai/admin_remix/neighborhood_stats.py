@@ -0,0 +1,207 @@
+"""
+Mahalle Özetleri - neighborhood_stats Bakımı
+============================================
+/api/map/neighborhoods her istekte tüm sahibinden_liste'yi okuyup Python'da
+gruplamak yerine (ilce, mahalle, category, transaction) bazında tutulan
+özet tablodan okur.
+
+- Crawler bir batch yazdığında / ilan kaldırdığında sadece etkilenen
+  anahtarlar sahibinden_liste'den yeniden hesaplanır (expression index ile);
+  yazmadan önce satırların eski anahtarları da alınır (konum değişebilir)
+- Boşalan anahtarlar silinir; min/max silmelerde de doğru kalır
+- Her anahtar için fiyat sketch'i (price_sketch.py) de yeniden hesaplanır;
+  p25 / medyan / p75 ham fiyatlar sıralanmadan sketch'lerden okunur
+- Bakım (/api/maintenance/run) tabloyu tamamen yeniden kurar
+
+Mahalle anahtarı konum'dan türetilir ("MerkezYeni Mah." -> "Yeni");
+SQL ifadesi ile Python fonksiyonu birebir aynıdır ve drizzle/0009 index'i
+bu ifade üzerindedir.
+
+Kullanım:
+    from neighborhood_stats import current_keys, keys_from_rows, refresh_neighborhood_stats
+    keys = current_keys(ids)                           # yazmadan önce
+    ...                                                # upsert
+    refresh_neighborhood_stats(keys | keys_from_rows(rows))
+    rebuild_neighborhood_stats()                       # tam yeniden kurulum
+"""
+
+import logging
+
+from db_manager import db
+from listing_writer import LISTING_COLUMNS
+from price_sketch import sketch_aggregate_sql
+
+logger = logging.getLogger(__name__)
+
+STATS_TABLE = "neighborhood_stats"
+
+# Python str.strip() yerine sabit karakter kümesi: SQL btrim ile aynı sonuç
+_STRIP_CHARS = " \t\r\n"
+
+_KONUM = LISTING_COLUMNS.index("konum")
+_CATEGORY = LISTING_COLUMNS.index("category")
+_TRANSACTION = LISTING_COLUMNS.index("transaction")
+_ILCE = LISTING_COLUMNS.index("ilce")
+
+
+def mahalle_key(konum: str) -> str:
+    """Konum'dan harita mahalle adı: "MerkezYeni Mah." -> "Yeni" """
+    if not konum:
+        return ""
+    return (
+        konum.replace("Merkez", "")
+        .replace("Köyler", "")
+        .replace(" Mah.", "")
+        .replace(" Mh.", "")
+        .strip(_STRIP_CHARS)
+    )
+
+
+def mahalle_key_sql(column: str = "konum") -> str:
+    """mahalle_key'in SQL karşılığı (index ifadesi ile aynı metin olmalı)"""
+    return (
+        f"btrim(replace(replace(replace(replace({column}, 'Merkez', ''), "
+        f"'Köyler', ''), ' Mah.', ''), ' Mh.', ''), E' \\t\\r\\n')"
+    )
+
+
+def keys_from_rows(rows) -> set:
+    """LISTING_COLUMNS sırasındaki satırlardan etkilenen özet anahtarları"""
+    keys = set()
+    for row in rows:
+        mahalle = mahalle_key(row[_KONUM])
+        if mahalle:
+            keys.add(
+                (
+                    row[_ILCE] or "",
+                    mahalle,
+                    row[_CATEGORY] or "",
+                    row[_TRANSACTION] or "",
+                )
+            )
+    return keys
+
+
+def current_keys(listing_ids) -> set:
+    """
+    İlanların veritabanındaki mevcut anahtarları. Upsert konum/ilçe
+    değiştirirse eski anahtar da yenilenmeli; yazmadan önce okunur.
+    """
+    if not listing_ids:
+        return set()
+    rows = db.execute_query(
+        f"""
+        SELECT DISTINCT COALESCE(ilce, '') AS ilce, {mahalle_key_sql()} AS mahalle,
+               COALESCE(category, '') AS category, COALESCE(transaction, '') AS transaction
+        FROM sahibinden_liste
+        WHERE id = ANY(%s::bigint[])
+        """,
+        ([int(i) for i in listing_ids],),
+    )
+    return {
+        (r["ilce"], r["mahalle"], r["category"], r["transaction"])
+        for r in rows or []
+        if r["mahalle"]
+    }
+
+
+def _aggregate_sql(source_sql: str, alias: str = "s") -> str:
+    """Anahtar bazında sayılar, fiyat toplamları ve fiyat sketch'i"""
+    return sketch_aggregate_sql(
+        [
+            (f"COALESCE({alias}.ilce, '')", "ilce"),
+            (mahalle_key_sql(f"{alias}.konum"), "mahalle"),
+            (f"COALESCE({alias}.category, '')", "category"),
+            (f"COALESCE({alias}.transaction, '')", "transaction"),
+        ],
+        source_sql,
+        price=f"{alias}.fiyat",
+    )
+
+
+_COLUMNS = (
+    "ilce, mahalle, category, transaction, listing_count, priced_count, "
+    "price_sum, min_price, max_price, price_sketch"
+)
+
+_UPSERT = f"""
+    INSERT INTO {STATS_TABLE} ({_COLUMNS}, updated_at)
+    SELECT {_COLUMNS}, NOW() FROM fresh
+    ON CONFLICT (ilce, mahalle, category, transaction) DO UPDATE SET
+        listing_count = EXCLUDED.listing_count,
+        priced_count = EXCLUDED.priced_count,
+        price_sum = EXCLUDED.price_sum,
+        min_price = EXCLUDED.min_price,
+        max_price = EXCLUDED.max_price,
+        price_sketch = EXCLUDED.price_sketch,
+        updated_at = NOW()
+"""
+
+
+def refresh_neighborhood_stats(keys) -> bool:
+    """
+    Verilen (ilce, mahalle, category, transaction) anahtarlarını yeniden hesapla.
+    Tek ifade: etkilenen gruplar upsert edilir, boşalanlar silinir.
+    """
+    keys = [tuple(k) for k in keys if k and k[1]]
+    if not keys:
+        return True
+
+    ilceler, mahalleler, categories, transactions = (list(col) for col in zip(*keys))
+    mahalle_expr = mahalle_key_sql("s.konum")
+    source = f"""
+        FROM sahibinden_liste s
+        JOIN keys k
+          ON {mahalle_expr} = k.mahalle
+         AND COALESCE(s.category, '') = k.category
+         AND COALESCE(s.transaction, '') = k.transaction
+         AND COALESCE(s.ilce, '') = k.ilce
+    """
+
+    query = f"""
+        WITH keys AS (
+            SELECT DISTINCT *
+            FROM unnest(%s::text[], %s::text[], %s::text[], %s::text[])
+                 AS k(ilce, mahalle, category, transaction)
+        ),
+        fresh AS (
+            {_aggregate_sql(source)}
+        ),
+        emptied AS (
+            DELETE FROM {STATS_TABLE} n
+            USING keys k
+            WHERE (n.ilce, n.mahalle, n.category, n.transaction)
+                = (k.ilce, k.mahalle, k.category, k.transaction)
+              AND NOT EXISTS (
+                  SELECT 1 FROM fresh f
+                  WHERE (f.ilce, f.mahalle, f.category, f.transaction)
+                      = (n.ilce, n.mahalle, n.category, n.transaction)
+              )
+        )
+        {_UPSERT}
+    """
+    result = db.execute_query(
+        query, (ilceler, mahalleler, categories, transactions), fetch=False
+    )
+    if result is None:
+        logger.warning(f"⚠️ Mahalle özetleri güncellenemedi ({len(keys)} anahtar)")
+        return False
+    return True
+
+
+def rebuild_neighborhood_stats() -> bool:
+    """Özet tabloyu sahibinden_liste'den tamamen yeniden kur (tek transaction)"""
+    source = f"FROM sahibinden_liste s WHERE {mahalle_key_sql('s.konum')} <> ''"
+    query = f"""
+        DELETE FROM {STATS_TABLE};
+        WITH fresh AS (
+            {_aggregate_sql(source)}
+        )
+        {_UPSERT};
+    """
+    result = db.execute_query(query, fetch=False)
+    if result is None:
+        logger.error("❌ Mahalle özetleri yeniden kurulamadı")
+        return False
+    logger.info("🗺️ Mahalle özetleri yeniden kuruldu")
+    return True
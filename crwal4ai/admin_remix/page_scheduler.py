@@ -0,0 +1,261 @@
+"""
+Sayfa Zamanlayıcı - Paylaşılan Kuyruk ile Paralel Sayfa Dağıtımı
+================================================================
+Paralel crawler eskiden kategorileri iki worker'a sabit dağıtıyordu; bir
+worker konut_satilik ile uğraşırken diğeri boşta kalıyordu. İş artık
+(kategori, pagingOffset) sayfaları halinde tek kuyruktan dağıtılır:
+
+- Kuyruk her kategorinin ilk sayfasıyla başlar; ilk sayfa işlenince
+  extract_total_count ile sayfa sayısı belirlenir (plan) ve kalan sayfalar
+  kuyruğa eklenir. Sayı okunamazsa dolu her sayfa bir sonrakini ekler
+- Boşa çıkan worker kuyruktaki sıradaki sayfayı alır (N worker, tek kuyruk)
+- Smart stop sırasız tamamlanan sayfalarda da çalışır: SMART_STOP_THRESHOLD
+  ardışık eski sayfa görülünce kategorinin sonraki sayfaları kuyruktan düşer
+- Boş / az ilanlı sayfa kategorinin sonu sayılır
+- Hatalı sayfa bir kez (başka bir worker'da) tekrar denenir, yine hata
+  verirse kategori başarısız işaretlenir (sync atlanır)
+- max_pages sınırı toplamın tamamını kapsamıyorsa veya toplam okunamadıysa
+  kategori kesik (truncated) işaretlenir; eksik id listesiyle sync yapılmaz
+- Kategorinin bekleyen sayfası kalmayınca complete() kategoriyi döndürür;
+  sync (kaldırılan ilan tespiti) tüm id'ler toplanmış olarak o anda çalışır
+
+Kullanım:
+    from page_scheduler import PageScheduler
+
+    scheduler = PageScheduler(["konut_satilik", "arsa_satilik"], max_pages=100)
+    while (task := scheduler.next_task()) is not None:
+        ...                                  # sayfayı çek ve kaydet
+        if task.page == 0:
+            scheduler.plan(task.key, total_count)
+        finished = scheduler.complete(task, listing_ids, has_new_listings)
+"""
+
+import math
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+PAGE_SIZE = 50
+# max_pages >= ALL_PAGES: "tüm sayfaları tara" (crawl_category ile aynı kural)
+ALL_PAGES = 900
+# Boş olmayan ama bundan az ilanlı sayfa son sayfadır
+LAST_PAGE_THRESHOLD = 10
+SMART_STOP_THRESHOLD = 10
+MAX_PAGE_RETRIES = 1
+
+
+def planned_page_count(total_count: int, max_pages: int, per_page: int = PAGE_SIZE) -> int:
+    """Toplam ilan sayısından taranacak sayfa sayısı (max_pages sınırıyla)"""
+    pages = math.ceil(total_count / per_page)
+    return pages if max_pages >= ALL_PAGES else min(pages, max_pages)
+
+
+@dataclass(frozen=True)
+class PageTask:
+    key: str
+    page: int
+    attempt: int = 0
+
+    @property
+    def offset(self) -> int:
+        return self.page * PAGE_SIZE
+
+
+@dataclass
+class CategoryState:
+    planned: bool = False  # ilk sayfa işlendi mi
+    planned_pages: Optional[int] = None  # None: toplam okunamadı, sayfalar keşfedilir
+    total_count: Optional[int] = None
+    pending: int = 0  # kuyrukta + işlemde
+    stop_after: Optional[int] = None  # bu sayfadan sonrası taranmaz
+    pages_done: int = 0
+    pages_saved: int = 0
+    old_pages: set = field(default_factory=set)
+    listing_ids: set = field(default_factory=set)
+    smart_stopped: bool = False
+    failed: bool = False
+    truncated: bool = False  # tüm ilanlar taranmayacak: sync güvenli değil
+    finished: bool = False
+
+
+class PageScheduler:
+    """Thread-safe sayfa kuyruğu (tüm worker'lar aynı örneği paylaşır)"""
+
+    def __init__(
+        self,
+        categories: List[str],
+        max_pages: int,
+        smart_stop: bool = True,
+        smart_stop_threshold: int = SMART_STOP_THRESHOLD,
+    ):
+        self.max_pages = max_pages
+        self.smart_stop = smart_stop
+        self.smart_stop_threshold = smart_stop_threshold
+
+        self._cond = threading.Condition()
+        self._queue = deque()
+        self._in_flight = 0
+        self.categories: Dict[str, CategoryState] = {}
+        with self._cond:
+            for key in categories:
+                self.categories[key] = CategoryState()
+                self._push(PageTask(key, 0))
+
+    # ------------------------------------------------------------------
+    # Kuyruk
+    # ------------------------------------------------------------------
+
+    def _push(self, task: PageTask):
+        self.categories[task.key].pending += 1
+        self._queue.append(task)
+        self._cond.notify()
+
+    def next_task(self, timeout: Optional[float] = None) -> Optional[PageTask]:
+        """
+        Sıradaki sayfa. Kuyruk boş ama işlemde sayfa varsa (yeni sayfalar
+        eklenebilir) bekler; iş tamamen bittiyse None döner.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while not self._queue:
+                if self._in_flight == 0:
+                    return None
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+            task = self._queue.popleft()
+            self._in_flight += 1
+            return task
+
+    def _drop_after(self, key: str, page: int) -> int:
+        """Kategorinin `page`'den sonraki kuyruktaki sayfalarını düşür"""
+        state = self.categories[key]
+        if state.stop_after is None or page < state.stop_after:
+            state.stop_after = page
+        kept = deque(t for t in self._queue if t.key != key or t.page <= page)
+        dropped = len(self._queue) - len(kept)
+        self._queue = kept
+        state.pending -= dropped
+        return dropped
+
+    # ------------------------------------------------------------------
+    # Sonuçlar
+    # ------------------------------------------------------------------
+
+    def plan(self, key: str, total_count: Optional[int]) -> Optional[int]:
+        """
+        İlk sayfadaki toplam ilan sayısına göre kalan sayfaları kuyruğa ekle.
+        Sayı okunamazsa sayfalar tek tek keşfedilir (bkz. complete).
+        """
+        with self._cond:
+            state = self.categories[key]
+            if state.planned:
+                return state.planned_pages
+            state.planned = True
+            state.total_count = total_count
+            if total_count is None:
+                # Sayfalar keşfedilir; kısa sayfa taramayı erken bitirebilir
+                state.truncated = True
+                return None
+            state.planned_pages = max(1, planned_page_count(total_count, self.max_pages))
+            state.truncated = state.planned_pages * PAGE_SIZE < total_count
+            for page in range(1, state.planned_pages):
+                self._push(PageTask(key, page))
+            return state.planned_pages
+
+    def complete(
+        self, task: PageTask, listing_ids: List, has_new_listings: bool
+    ) -> Optional[CategoryState]:
+        """
+        Sayfa sonucu. Kategorinin son bekleyen sayfasıysa kategori durumunu
+        döndürür (sync bu noktada çalıştırılır), değilse None.
+        """
+        with self._cond:
+            self._in_flight -= 1
+            state = self.categories[task.key]
+            state.pending -= 1
+            state.pages_done += 1
+            state.listing_ids.update(listing_ids)
+
+            count = len(listing_ids)
+            if count == 0:
+                # Boş sayfa: kategori bitti
+                state.pages_saved += self._drop_after(task.key, task.page)
+            elif count < LAST_PAGE_THRESHOLD and task.page > 0:
+                state.pages_saved += self._drop_after(task.key, task.page)
+            elif (
+                state.planned
+                and state.planned_pages is None
+                and count >= PAGE_SIZE
+                and task.page + 1 < self.max_pages
+                and (state.stop_after is None or task.page < state.stop_after)
+            ):
+                # Toplam bilinmiyor: dolu sayfa bir sonrakini getirir
+                self._push(PageTask(task.key, task.page + 1))
+
+            if not has_new_listings and count:
+                state.old_pages.add(task.page)
+                stop = self._smart_stop_page(state, task.page)
+                if stop is not None:
+                    state.smart_stopped = True
+                    state.pages_saved += self._drop_after(task.key, stop)
+
+            return self._finish_if_done(state)
+
+    def fail(self, task: PageTask) -> Optional[CategoryState]:
+        """Sayfa hatası: bir kez tekrar kuyruğa alınır, sonra kategori başarısız"""
+        with self._cond:
+            self._in_flight -= 1
+            state = self.categories[task.key]
+            state.pending -= 1
+            if task.attempt < MAX_PAGE_RETRIES:
+                self._push(PageTask(task.key, task.page, task.attempt + 1))
+                return None
+
+            state.failed = True
+            state.planned = True
+            self._drop_after(task.key, task.page)
+            return self._finish_if_done(state)
+
+    def _smart_stop_page(self, state: CategoryState, page: int) -> Optional[int]:
+        """`page` dahil threshold uzunluğunda ardışık eski sayfa penceresinin sonu"""
+        if not self.smart_stop:
+            return None
+        threshold = self.smart_stop_threshold
+        for end in range(page, page + threshold):
+            start = end - threshold + 1
+            if start >= 0 and all(p in state.old_pages for p in range(start, end + 1)):
+                return end
+        return None
+
+    def _finish_if_done(self, state: CategoryState) -> Optional[CategoryState]:
+        if self._in_flight == 0 and not self._queue:
+            # Bekleyen worker'lar uyansın: iş bitti
+            self._cond.notify_all()
+        if state.pending == 0 and not state.finished:
+            state.finished = True
+            return state
+        return None
+
+    # ------------------------------------------------------------------
+    # Özet
+    # ------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, dict]:
+        with self._cond:
+            return {
+                key: {
+                    "total_count": s.total_count,
+                    "planned_pages": s.planned_pages,
+                    "pages_done": s.pages_done,
+                    "pages_saved": s.pages_saved,
+                    "listings": len(s.listing_ids),
+                    "smart_stopped": s.smart_stopped,
+                    "failed": s.failed,
+                    "truncated": s.truncated,
+                }
+                for key, s in self.categories.items()
+            }
@@ -0,0 +1,187 @@
+"""
+Keyset (Cursor) Pagination - Admin API Listeleri
+================================================
+LIMIT/OFFSET + COUNT(*) OVER() her derin sayfada tüm filtreli kümeyi tarar
+ve sayar. Cursor modunda sorgu son görülen (sıralama değeri, id) çiftinden
+itibaren index üzerinde "seek" eder; sayfa 500 ile sayfa 1 aynı maliyettedir.
+
+- Cursor opak bir base64url metnidir (sıralama adı + son satırın anahtarı)
+- Sıralama ifadeleri NULL'ları PostgreSQL'in varsayılan sırasıyla aynı yere
+  koyan sentinel'lerle COALESCE edilir; sayfa modu ile aynı sırayı verir ve
+  (ifade, id) expression index'leri ile çalışır (drizzle/0008)
+- Toplam sayı TTL cache'ten gelir; filtresiz sorgularda pg_class.reltuples
+  tahmini kullanılır (total_approximate=True)
+
+Kullanım:
+    spec = LISTING_SORTS[sort_by]
+    rows, next_cursor = keyset_page("sahibinden_liste", where, params, spec,
+                                    per_page, request.args.get("cursor"))
+    total, approximate = cached_count("sahibinden_liste", where, params)
+
+Ortam değişkenleri:
+    PAGINATION_COUNT_TTL  Toplam sayı cache süresi, saniye (default: 60)
+"""
+
+import base64
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+
+from db_manager import db
+
+COUNT_TTL = float(os.getenv("PAGINATION_COUNT_TTL", "60"))
+COUNT_CACHE_SIZE = 256
+
+# expr: ORDER BY ifadesi, tie: eşitlik bozan benzersiz kolon
+SortSpec = namedtuple("SortSpec", ["name", "expr", "tie", "descending"])
+
+# NULL sıralamada en büyük kabul edilir; sentinel'ler aynı sırayı korur
+_MAX_BIGINT = "9223372036854775807"
+# Kolonlar timestamptz: sentinel de timestamptz olmalı (timestamp -> timestamptz
+# dönüşümü STABLE, index ifadesinde kullanılamaz)
+_CRAWLED_AT = "COALESCE(crawled_at, 'infinity'::timestamptz)"
+_FIRST_SEEN_AT = "COALESCE(first_seen_at, 'infinity'::timestamptz)"
+_REMOVED_AT = "COALESCE(removed_at, 'infinity'::timestamptz)"
+_FIYAT = f"COALESCE(fiyat, {_MAX_BIGINT})"
+
+LISTING_SORTS = {
+    "date_desc": SortSpec("date_desc", _CRAWLED_AT, "id", True),
+    "price_asc": SortSpec("price_asc", _FIYAT, "id", False),
+    "price_desc": SortSpec("price_desc", _FIYAT, "id", True),
+}
+NEW_LISTING_SORT = SortSpec("first_seen_desc", _FIRST_SEEN_AT, "listing_id", True)
+REMOVED_LISTING_SORT = SortSpec("removed_desc", _REMOVED_AT, "listing_id", True)
+
+
+class InvalidCursor(ValueError):
+    """Çözülemeyen veya başka sıralamaya ait cursor"""
+
+
+def encode_cursor(spec: SortSpec, key: str, tie) -> str:
+    payload = json.dumps([spec.name, key, tie], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(spec: SortSpec, cursor: str) -> tuple:
+    """Cursor -> (sıralama anahtarı metni, tie değeri)"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        name, key, tie = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor(f"Geçersiz cursor: {e}") from None
+    if name != spec.name:
+        raise InvalidCursor(f"Cursor '{name}' sıralamasına ait, istenen: '{spec.name}'")
+    return key, tie
+
+
+def order_by(spec: SortSpec) -> str:
+    direction = "DESC" if spec.descending else "ASC"
+    return f" ORDER BY {spec.expr} {direction}, {spec.tie} {direction}"
+
+
+def keyset_page(
+    table: str,
+    where: str,
+    params: list,
+    spec: SortSpec,
+    per_page: int,
+    cursor: str = None,
+):
+    """
+    Cursor'dan sonraki per_page satırı getir.
+
+    Args:
+        where: "1=1 AND ..." biçiminde filtre (parametreler params'ta)
+        cursor: Önceki yanıttaki next_cursor (None/"" = ilk sayfa)
+
+    Returns:
+        (satırlar, next_cursor) - son sayfada next_cursor None
+
+    Raises:
+        InvalidCursor, sorgu hatasında RuntimeError
+    """
+    sql = f"SELECT *, ({spec.expr})::text AS _cursor_key FROM {table} WHERE {where}"
+    params = list(params)
+
+    if cursor:
+        key, tie = decode_cursor(spec, cursor)
+        op = "<" if spec.descending else ">"
+        sql += f" AND ({spec.expr}, {spec.tie}) {op} (%s, %s)"
+        params.extend([key, tie])
+
+    # Bir fazla satır: sonraki sayfa var mı?
+    sql += order_by(spec) + " LIMIT %s"
+    params.append(per_page + 1)
+
+    rows = db.execute_query(sql, params)
+    if rows is None:
+        raise RuntimeError(f"{table} sayfası okunamadı")
+
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(spec, last["_cursor_key"], last[spec.tie])
+
+    for row in rows:
+        del row["_cursor_key"]
+    return rows, next_cursor
+
+
+# ----------------------------------------------------------------------
+# Toplam sayı cache'i
+# ----------------------------------------------------------------------
+
+_count_cache = OrderedDict()
+_count_lock = threading.Lock()
+
+
+def _estimated_rows(table: str):
+    row = db.execute_one(
+        "SELECT reltuples::bigint AS estimate FROM pg_class WHERE oid = to_regclass(%s)",
+        (table,),
+    )
+    # reltuples hiç ANALYZE edilmemiş tabloda -1 (PG14+) veya 0
+    if row and row["estimate"] and row["estimate"] > 0:
+        return row["estimate"]
+    return None
+
+
+def cached_count(table: str, where: str = "1=1", params=(), ttl: float = None):
+    """
+    Filtreli toplam satır sayısı, TTL süresince cache'ten.
+
+    Returns:
+        (total, approximate) - approximate=True ise planner tahmini
+    """
+    ttl = COUNT_TTL if ttl is None else ttl
+    key = (table, where, tuple(params))
+    now = time.monotonic()
+
+    with _count_lock:
+        hit = _count_cache.get(key)
+        if hit and now - hit[0] < ttl:
+            _count_cache.move_to_end(key)
+            return hit[1], hit[2]
+
+    approximate = False
+    total = _estimated_rows(table) if where == "1=1" else None
+    if total is not None:
+        approximate = True
+    else:
+        row = db.execute_one(
+            f"SELECT COUNT(*) AS count FROM {table} WHERE {where}", list(params)
+        )
+        if row is None:
+            raise RuntimeError(f"{table} sayılamadı")
+        total = row["count"]
+
+    with _count_lock:
+        _count_cache[key] = (now, total, approximate)
+        _count_cache.move_to_end(key)
+        while len(_count_cache) > COUNT_CACHE_SIZE:
+            _count_cache.popitem(last=False)
+
+    return total, approximate
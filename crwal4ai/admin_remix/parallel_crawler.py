@@ -1,11 +1,14 @@
 """
 Parallel Sahibinden Crawler
 ===========================
-2 Chrome worker ile 7 kategoriyi paralel crawl eder.
-Hedef: 7 dakikadan 3.5 dakikaya düşürmek (2x hızlanma)
+N Chrome worker ile kategorileri sayfa sayfa paralel crawl eder.
+Sayfalar (kategori, pagingOffset) olarak tek kuyruktan dagitilir
+(page_scheduler); bos kalan worker siradaki sayfayi alir, boylece sure en
+buyuk kategoriye degil worker sayisina gore olceklenir.
 
 Kullanim:
     python parallel_crawler.py
+    python parallel_crawler.py --workers 3
     python parallel_crawler.py --categories konut_satilik arsa_satilik
     python parallel_crawler.py --max-pages 50 --turbo
 """
@@ -19,22 +22,28 @@ import argparse
 import uuid
 from datetime import datetime
 import time
+import random
 import sys
 import json
-import os
-from pathlib import Path
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
 from db_manager import db
-import json
 
-from sahibinden_uc_batch_supabase import (
-    SahibindenSupabaseCrawler,
-    HENDEK_CATEGORIES,
+from sahibinden_crawler import (
+    CATEGORY_TEMPLATES,
+    CHROME_PROFILE,
+    CrawlStopped,
+    MIN_PAGE_INTERVAL,
+    MIN_PAGE_INTERVAL_JITTER,
+    READY_MODE,
+    SahibindenCrawler,
+    get_category_url,
 )
+from listing_parser import is_new_listing, parse_listing_date
+from page_scheduler import PageScheduler, PageTask
 from rate_limiter import AdaptiveRateLimiter, RateLimiterConfig
 
 logging.basicConfig(
@@ -45,8 +54,11 @@ logger = logging.getLogger(__name__)
 
 class ThreadSafeRateLimiter:
     """
-    Thread-safe rate limiter - 2 worker icin koordineli bekleme.
-    Worker'lar arasi staggering ile cakisma onlenir.
+    Thread-safe rate limiter - N worker icin koordineli bekleme.
+    Worker'lar arasi staggering ile cakisma onlenir; dakikalik limit
+    AdaptiveRateLimiter'in token bucket'i ile diger sureclerle paylasilir.
+    Insan benzeri minimum sayfa araligi (MIN_PAGE_INTERVAL + jitter) her
+    worker icin ayri, o worker'in son istek baslangicindan olculur.
     """
 
     def __init__(self, num_workers: int = 2):
@@ -57,15 +69,34 @@ class ThreadSafeRateLimiter:
                 min_delay=1.0,
                 max_delay=45.0,
                 jitter_range=0.5,
-                requests_per_minute=30,
                 cooldown_after_block=30.0,
+                # "sleep" modunda tempo navigate'teki sabit beklemeden gelir
+                min_interval=MIN_PAGE_INTERVAL if READY_MODE == "dom" else 0.0,
+                interval_jitter=MIN_PAGE_INTERVAL_JITTER,
             )
         )
         self.num_workers = num_workers
         self._request_count = 0
         self._last_request_time = 0.0
+        # thread id -> o worker'in son istek baslangici
+        self._worker_last_request: Dict[int, float] = {}
+
+    def _wait_page_interval(self) -> float:
+        """Bu worker'in minimum sayfa araligi (kilit disinda: diger worker'lari bekletmez)"""
+        config = self._limiter.config
+        last = self._worker_last_request.get(threading.get_ident())
+        if config.min_interval <= 0 or last is None:
+            return 0.0
+        interval = config.min_interval + random.uniform(0, config.interval_jitter)
+        remaining = last + interval - time.time()
+        if remaining <= 0:
+            return 0.0
+        time.sleep(remaining)
+        return remaining
 
     def wait(self, worker_id: int = 0) -> float:
+        page_wait = self._wait_page_interval()
+
         with self._lock:
             now = time.time()
 
@@ -81,15 +112,27 @@ class ThreadSafeRateLimiter:
             else:
                 actual_wait = 0
 
+            # Dakikalik limit diger sureclerle ortak bucket'tan (rate_limiter)
+            actual_wait += self._limiter._acquire_token()
+
             self._last_request_time = time.time()
+            self._worker_last_request[threading.get_ident()] = self._last_request_time
             self._request_count += 1
 
-            return actual_wait
+            return page_wait + actual_wait
+
+    @property
+    def config(self) -> RateLimiterConfig:
+        return self._limiter.config
 
     def report_success(self):
         with self._lock:
             self._limiter.report_success()
 
+    def report_slow_response(self, response_time: float):
+        with self._lock:
+            self._limiter.report_slow_response(response_time)
+
     def report_blocked(self):
         with self._lock:
             self._limiter.report_blocked()
@@ -105,26 +148,46 @@ class ThreadSafeRateLimiter:
 @dataclass
 class WorkerResult:
     worker_id: int
-    categories_completed: List[str] = field(default_factory=list)
-    total_listings: int = 0
     new_listings: int = 0
     pages_crawled: int = 0
-    smart_stops: int = 0
-    pages_saved: int = 0
+    pages_failed: int = 0
     errors: List[str] = field(default_factory=list)
     duration_seconds: float = 0.0
+    busy_seconds: float = 0.0  # sayfa cekme + parse + kayit
+    startup_seconds: float = 0.0  # Chrome baslatma
+    time_to_ready: dict = field(default_factory=dict)  # navigate hazir olma suresi
+    page_source: dict = field(default_factory=dict)  # page_source bayt / sure
+
+    @property
+    def utilization(self) -> float:
+        """Worker'in sayfa islemekle gecirdigi zaman orani (Chrome baslatma haric)"""
+        active = self.duration_seconds - self.startup_seconds
+        return self.busy_seconds / active if active > 0 else 0.0
+
+    def as_stats(self) -> dict:
+        return {
+            "pages": self.pages_crawled,
+            "failed_pages": self.pages_failed,
+            "new_listings": self.new_listings,
+            "busy_seconds": round(self.busy_seconds, 1),
+            "startup_seconds": round(self.startup_seconds, 1),
+            "duration_seconds": round(self.duration_seconds, 1),
+            "utilization": round(self.utilization, 3),
+            "time_to_ready": self.time_to_ready,
+            "page_source": self.page_source,
+        }
 
 
 class ParallelCrawlerRunner:
     """
-    2 Chrome worker ile paralel crawl yoneticisi.
-    Mevcut SahibindenSupabaseCrawler sinifini kullanir.
+    N Chrome worker ile paralel crawl yoneticisi.
+    Sayfalar PageScheduler kuyrugundan alinir; her worker kendi
+    SahibindenCrawler'ini (ayri Chrome profili) kullanir.
     """
 
-    CATEGORY_DISTRIBUTION = {
-        0: ["konut_satilik", "arsa_satilik", "bina_satilik", "bina_kiralik"],
-        1: ["konut_kiralik", "isyeri_satilik", "isyeri_kiralik"],
-    }
+    DEFAULT_WORKERS = 2
+    # Worker'lar Chrome'u ayni anda baslatmasin
+    WORKER_STAGGER_SECONDS = 2.0
 
     def __init__(
         self,
@@ -133,17 +196,52 @@ class ParallelCrawlerRunner:
         max_pages: int = 100,
         turbo: bool = False,
         sync: bool = False,
+        force: bool = False,
+        workers: int = DEFAULT_WORKERS,
+        district: str = "hendek",
+        browser_pool=None,
+        stop_event: Optional[threading.Event] = None,
+        timeout: Optional[float] = None,
     ):
         self.job_id = job_id or str(uuid.uuid4())
-        self.categories = categories or list(HENDEK_CATEGORIES.keys())
+        self.district = district
+        self.categories = [
+            key for key in (categories or list(CATEGORY_TEMPLATES.keys()))
+            if key in CATEGORY_TEMPLATES
+        ]
+        self.category_configs = {
+            key: get_category_url(key, district) for key in self.categories
+        }
         self.max_pages = max_pages
         self.turbo = turbo
         self.sync = sync
-
-        self.shared_rate_limiter = ThreadSafeRateLimiter(num_workers=2)
-
-        self.supabase: Optional[Client] = None
-        self._init_supabase()
+        self.force = force
+        self.workers = max(1, workers)
+        # browser_pool.BrowserPool: worker'lar isinmis oturum kiralar,
+        # havuzdan fazla worker acilmaz
+        self.browser_pool = browser_pool
+        # In-process (havuzlu) job: iptal bayragi ve sure siniri, her worker
+        # sayfalar arasinda kontrol eder (run_crawl_job ile ayni CrawlStopped)
+        self.stop_event = stop_event
+        self.timeout = timeout
+        self.deadline: Optional[float] = None
+        self.stop_reason: Optional[str] = None
+        if browser_pool:
+            self.workers = min(self.workers, browser_pool.size)
+
+        self.shared_rate_limiter = ThreadSafeRateLimiter(num_workers=self.workers)
+        if turbo:
+            # crawl_category(turbo=True) ile ayni ayarlar, tum worker'lar icin bir kez
+            config = self.shared_rate_limiter.config
+            config.min_delay = 0.1
+            config.base_delay = 0.5
+            config.jitter_range = 0.2
+
+        # Sync tum sayfalari gerektirir: smart stop kapali
+        self.scheduler = PageScheduler(
+            self.categories, max_pages, smart_stop=not (force or sync)
+        )
+        self._stats_lock = threading.Lock()
 
         self.stats = {
             "started_at": None,
@@ -151,18 +249,15 @@ class ParallelCrawlerRunner:
             "total_listings": 0,
             "new_listings": 0,
             "updated_listings": 0,
+            "removed_listings": 0,
             "categories_completed": [],
-            "workers": 2,
+            "workers": self.workers,
             "smart_stops": 0,
             "pages_saved": 0,
             "total_pages": 0,
             "errors": [],
         }
 
-    def _init_db(self):
-        # db is already initialized
-        pass
-
     def _create_job_record(self):
         try:
             db.execute_query(
@@ -183,8 +278,9 @@ class ParallelCrawlerRunner:
                     "running",
                     json.dumps({
                         "categories": self.categories,
+                        "district": self.district,
                         "max_pages": self.max_pages,
-                        "workers": 2,
+                        "workers": self.workers,
                         "turbo": self.turbo,
                         "sync": self.sync,
                     }),
@@ -238,151 +334,225 @@ class ParallelCrawlerRunner:
         except Exception as e:
             logger.warning(f"Job finalize failed: {e}")
 
-    def _distribute_categories(self) -> Dict[int, List[str]]:
-        distribution = {}
-        for worker_id, default_cats in self.CATEGORY_DISTRIBUTION.items():
-            distribution[worker_id] = [
-                cat for cat in default_cats if cat in self.categories
-            ]
-        return distribution
-
-    def _run_worker(self, worker_id: int, categories: List[str]) -> WorkerResult:
-        result = WorkerResult(worker_id=worker_id)
-        start_time = time.time()
-
-        if not categories:
-            logger.info(f"Worker {worker_id}: Kategori yok, atlaniyor")
-            return result
-
-        logger.info(f"🚀 Worker {worker_id} baslatiliyor: {categories}")
-
-        crawler = SahibindenSupabaseCrawler(job_id=f"{self.job_id}_w{worker_id}")
-        crawler.rate_limiter = self.shared_rate_limiter
-
-        try:
-            crawler.start_browser()
-
-            if worker_id > 0:
-                logger.info(f"Worker {worker_id}: Stagger bekleniyor (2s)...")
-                time.sleep(2.0)
+    def _category_finished(self, crawler: SahibindenCrawler, key: str, state):
+        """Kategorinin son sayfasi islendi: sync + istatistikler"""
+        config = self.category_configs[key]
+        removed = 0
+        if self.sync:
+            if state.failed or not state.listing_ids:
+                logger.warning(f"⚠️ {key}: Eksik sayfa var, sync atlaniyor")
+            elif state.truncated:
+                # Taranmayan sayfalardaki canli ilanlar kaldirilmis sayilirdi
+                logger.warning(
+                    f"⚠️ {key}: Tum sayfalar taranmadi "
+                    f"({len(state.listing_ids)}/{state.total_count or '?'} ilan), "
+                    "sync atlaniyor"
+                )
+            else:
+                # Bu worker'in tamponu once yazilsin (diger worker'lar kendi
+                # tamponlarini tutsa da o ilanlar crawl id'leri arasinda)
+                crawler.flush_listings()
+                removed = crawler.detect_and_save_removed_listings(
+                    category=config["category"],
+                    transaction=config["transaction"],
+                    current_ids=state.listing_ids,
+                    district=config.get("district"),
+                )
 
-            for cat_idx, category in enumerate(categories):
-                config = HENDEK_CATEGORIES.get(category)
-                if not config:
-                    logger.warning(
-                        f"Worker {worker_id}: Kategori bulunamadi: {category}"
-                    )
-                    continue
+        with self._stats_lock:
+            if not state.failed:
+                self.stats["categories_completed"].append(key)
+            self.stats["removed_listings"] += removed
+            self.stats["smart_stops"] += int(state.smart_stopped)
+            self.stats["pages_saved"] += state.pages_saved
+            done = len(self.stats["categories_completed"])
 
-                logger.info(
-                    f"📂 Worker {worker_id}: {category} ({cat_idx + 1}/{len(categories)})"
+        logger.info(
+            f"✅ {key} tamamlandi: {state.pages_done} sayfa, "
+            f"{len(state.listing_ids)} ilan"
+            + (f", {removed} kaldirildi" if removed else "")
+        )
+        self._update_job_progress(done, len(self.categories), f"{key} tamamlandi")
+
+    def _crawl_page(self, crawler: SahibindenCrawler, task: PageTask) -> bool:
+        """Tek sayfa: cek, ilk sayfada sayfa planini cikar, kaydet, sonucu bildir"""
+        config = self.category_configs[task.key]
+        url = config["url"]
+        page_url = url if task.page == 0 else f"{url}&pagingOffset={task.offset}"
+
+        html = crawler.navigate(page_url)
+        if not html:
+            state = self.scheduler.fail(task)
+            with self._stats_lock:
+                self.stats["errors"].append(
+                    {"category": task.key, "page": task.page + 1, "error": "Page load failed"}
                 )
+            if state:
+                self._category_finished(crawler, task.key, state)
+            return False
+
+        if task.page == 0:
+            total_count = crawler.extract_total_count(html)
+            pages = self.scheduler.plan(task.key, total_count)
+            if total_count:
+                crawler._save_category_stats(
+                    config["category"],
+                    config["transaction"],
+                    total_count,
+                    district=config.get("district"),
+                )
+            logger.info(
+                f"🎯 {task.key}: {pages if pages else '?'} sayfa kuyruga eklendi"
+            )
 
-                try:
-                    saved = crawler.crawl_category(
-                        key=category,
-                        config=config,
-                        max_pages=self.max_pages,
-                        turbo=self.turbo,
-                        sync=self.sync,
-                    )
+        listings = crawler.extract_listings(html)
+        for listing in listings:
+            listing["category"] = config["category"]
+            listing["transaction"] = config["transaction"]
+        if listings:
+            crawler._save_listings_batch(listings, district=config.get("district"))
 
-                    result.categories_completed.append(category)
-                    result.new_listings += crawler.stats.get("new_listings", 0)
-                    result.pages_crawled += crawler.stats.get("total_pages", 0)
-                    result.smart_stops += crawler.stats.get("smart_stops", 0)
-                    result.pages_saved += crawler.stats.get("pages_saved", 0)
+        has_new = any(
+            is_new_listing(parse_listing_date(listing.get("tarih", "")))
+            for listing in listings
+        )
+        ids = [listing["id"] for listing in listings if listing.get("id")]
+        state = self.scheduler.complete(task, ids, has_new)
+        if state:
+            self._category_finished(crawler, task.key, state)
+        return True
 
-                    crawler.stats["new_listings"] = 0
-                    crawler.stats["total_pages"] = 0
-                    crawler.stats["smart_stops"] = 0
-                    crawler.stats["pages_saved"] = 0
+    def _run_worker(self, worker_id: int) -> WorkerResult:
+        result = WorkerResult(worker_id=worker_id)
+        start_time = time.time()
 
-                    logger.info(f"✅ Worker {worker_id}: {category} tamamlandi")
+        # Her worker ayri Chrome profili ve crawler (seen_ids, yazma tamponu) kullanir
+        crawler = SahibindenCrawler(
+            job_id=self.job_id,
+            profile_dir=CHROME_PROFILE.with_name(f"{CHROME_PROFILE.name}_w{worker_id}"),
+            browser_pool=self.browser_pool,
+        )
+        crawler.rate_limiter = self.shared_rate_limiter
+        crawler.stop_event = self.stop_event
+        crawler.deadline = self.deadline
+        broken = False
 
-                    if cat_idx < len(categories) - 1:
-                        time.sleep(1.0)
+        try:
+            # Havuz oturumlari zaten acik: ayni anda Chrome acilisi yok, stagger gereksiz
+            if worker_id > 0 and not self.browser_pool:
+                delay = worker_id * self.WORKER_STAGGER_SECONDS
+                logger.info(f"Worker {worker_id}: Stagger bekleniyor ({delay:.0f}s)...")
+                time.sleep(delay)
 
+            logger.info(f"🚀 Worker {worker_id} baslatiliyor")
+            crawler.start_browser()
+            result.startup_seconds = time.time() - start_time
+
+            while True:
+                # Yarim kalan kategoriler bitmis sayilmaz: sync calismaz
+                crawler.check_stop()
+                task = self.scheduler.next_task()
+                if task is None:
+                    break
+                page_start = time.time()
+                try:
+                    ok = self._crawl_page(crawler, task)
                 except Exception as e:
-                    error_msg = f"{category}: {str(e)}"
+                    # Sayfa kuyruktan dusmesin: tekrar denensin / kategori kapansin
+                    state = self.scheduler.fail(task)
+                    if state:
+                        self._category_finished(crawler, task.key, state)
+                    ok = False
+                    error_msg = f"{task.key} sayfa {task.page + 1}: {e}"
                     result.errors.append(error_msg)
                     logger.error(f"❌ Worker {worker_id} hatasi: {error_msg}")
 
-            result.total_listings = len(crawler.seen_ids)
+                result.busy_seconds += time.time() - page_start
+                if ok:
+                    result.pages_crawled += 1
+                else:
+                    result.pages_failed += 1
+
+                with self._stats_lock:
+                    self.stats["total_pages"] += int(ok)
+                    pages_done = self.stats["total_pages"]
+                if ok and pages_done % 10 == 0:
+                    self._update_job_progress(
+                        len(self.stats["categories_completed"]),
+                        len(self.categories),
+                        f"{pages_done} sayfa tarandi",
+                    )
+
+        except CrawlStopped as e:
+            # Oturum saglam: havuza geri verilir
+            with self._stats_lock:
+                self.stop_reason = self.stop_reason or str(e)
+            logger.warning(f"⏹️ Worker {worker_id} durdu: {e}")
 
         except Exception as e:
+            broken = True
             result.errors.append(f"Worker init error: {str(e)}")
             logger.error(f"❌ Worker {worker_id} baslatma hatasi: {e}")
 
         finally:
             try:
-                crawler.close_browser()
-            except:
+                crawler.flush_listings()
+                crawler.close_browser(broken=broken)
+                crawler.close_log_sink()
+            except Exception:
                 pass
+            result.new_listings = crawler.stats.get("new_listings", 0)
+            result.time_to_ready = crawler.stats.get("time_to_ready", {})
+            result.page_source = crawler.stats.get("page_source", {})
             result.duration_seconds = time.time() - start_time
 
         logger.info(
             f"🏁 Worker {worker_id} bitti: "
-            f"{len(result.categories_completed)} kategori, "
+            f"{result.pages_crawled} sayfa, "
             f"{result.new_listings} yeni ilan, "
-            f"{result.duration_seconds:.1f}s"
+            f"{result.duration_seconds:.1f}s, "
+            f"doluluk %{result.utilization * 100:.0f}"
         )
 
         return result
 
     def run(self) -> Dict:
         self.stats["started_at"] = datetime.now().isoformat()
+        if self.timeout:
+            self.deadline = time.monotonic() + self.timeout
 
         logger.info("=" * 60)
         logger.info("🚀 PARALLEL CRAWLER BASLATILIYOR")
         logger.info(f"   Job ID: {self.job_id}")
         logger.info(f"   Kategoriler: {self.categories}")
-        logger.info(f"   Workers: 2")
+        logger.info(f"   Ilce: {self.district}")
+        logger.info(f"   Workers: {self.workers}")
         logger.info(f"   Max Pages: {self.max_pages}")
         logger.info(f"   Turbo: {self.turbo}")
         logger.info("=" * 60)
 
         self._create_job_record()
 
-        distribution = self._distribute_categories()
-        logger.info(f"Kategori dagilimi: {distribution}")
-
         results: List[WorkerResult] = []
 
         try:
             with ThreadPoolExecutor(
-                max_workers=2, thread_name_prefix="CrawlWorker"
+                max_workers=self.workers, thread_name_prefix="CrawlWorker"
             ) as executor:
                 futures = {
-                    executor.submit(self._run_worker, worker_id, cats): worker_id
-                    for worker_id, cats in distribution.items()
-                    if cats
+                    executor.submit(self._run_worker, worker_id): worker_id
+                    for worker_id in range(self.workers)
                 }
 
-                completed_categories = 0
                 for future in as_completed(futures):
                     worker_id = futures[future]
                     try:
                         result = future.result()
                         results.append(result)
 
-                        self.stats["total_listings"] += result.total_listings
                         self.stats["new_listings"] += result.new_listings
-                        self.stats["categories_completed"].extend(
-                            result.categories_completed
-                        )
-                        self.stats["smart_stops"] += result.smart_stops
-                        self.stats["pages_saved"] += result.pages_saved
-                        self.stats["total_pages"] += result.pages_crawled
                         self.stats["errors"].extend(result.errors)
 
-                        completed_categories += len(result.categories_completed)
-                        self._update_job_progress(
-                            completed_categories,
-                            len(self.categories),
-                            f"Worker {worker_id} tamamlandi",
-                        )
-
                     except Exception as e:
                         logger.error(f"❌ Worker {worker_id} exception: {e}")
                         self.stats["errors"].append(f"Worker {worker_id}: {str(e)}")
@@ -395,11 +565,30 @@ class ParallelCrawlerRunner:
         self.stats["completed_at"] = datetime.now().isoformat()
         self.stats["rate_limiter"] = self.shared_rate_limiter.get_stats()
 
+        categories = self.scheduler.summary()
+        self.stats["categories"] = categories
+        self.stats["total_listings"] = sum(c["listings"] for c in categories.values())
+        self.stats["worker_utilization"] = {
+            str(r.worker_id): r.as_stats()
+            for r in sorted(results, key=lambda r: r.worker_id)
+        }
+
         start = datetime.fromisoformat(self.stats["started_at"])
         end = datetime.fromisoformat(self.stats["completed_at"])
         duration = (end - start).total_seconds()
         self.stats["duration_seconds"] = duration
 
+        # Günlük fiyat özeti: job'un başladığı günden bugüne (eski günler sabit)
+        if db.refresh_price_rollup(since=start):
+            logger.info("📈 Gunluk fiyat ozeti guncellendi")
+
+        if self.stop_reason:
+            cancelled = self.stop_event is not None and self.stop_event.is_set()
+            self.stats["stopped"] = self.stop_reason
+            self._finalize_job("cancelled" if cancelled else "failed", self.stop_reason)
+            logger.warning(f"⏹️ Paralel crawler durdu: {self.stop_reason}")
+            raise CrawlStopped(self.stop_reason)
+
         self._finalize_job("completed")
 
         logger.info("\n" + "=" * 60)
@@ -416,6 +605,12 @@ class ParallelCrawlerRunner:
         logger.info(f"   Toplam sayfa: {self.stats['total_pages']}")
         logger.info(f"   Smart stops: {self.stats['smart_stops']}")
         logger.info(f"   Atlanan sayfa: {self.stats['pages_saved']}")
+        for worker_id, w in self.stats["worker_utilization"].items():
+            logger.info(
+                f"   Worker {worker_id}: {w['pages']} sayfa, "
+                f"doluluk %{w['utilization'] * 100:.0f} "
+                f"({w['busy_seconds']}s / {w['duration_seconds']}s)"
+            )
         if self.stats["errors"]:
             logger.warning(f"   Hatalar: {len(self.stats['errors'])}")
         logger.info("=" * 60)
@@ -426,6 +621,7 @@ class ParallelCrawlerRunner:
 def main():
     parser = argparse.ArgumentParser(description="Parallel Sahibinden Crawler")
     parser.add_argument("--categories", nargs="+", default=None, help="Kategoriler")
+    parser.add_argument("--district", default="hendek", help="Ilce adi (default: hendek)")
     parser.add_argument(
         "--max-pages", type=int, default=100, help="Kategori basina max sayfa"
     )
@@ -436,6 +632,15 @@ def main():
     parser.add_argument(
         "--sync", action="store_true", help="Kaldirilan ilanlari sync et"
     )
+    parser.add_argument(
+        "--force", action="store_true", help="Smart stop kapali (tum sayfalar)"
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=ParallelCrawlerRunner.DEFAULT_WORKERS,
+        help="Chrome worker sayisi",
+    )
 
     args = parser.parse_args()
 
@@ -445,6 +650,9 @@ def main():
         max_pages=args.max_pages,
         turbo=args.turbo,
         sync=args.sync,
+        force=args.force,
+        workers=args.workers,
+        district=args.district,
     )
 
     try:
@@ -459,6 +667,8 @@ def main():
             "categories_completed": stats.get("categories_completed", []),
             "smart_stops": stats.get("smart_stops", 0),
             "pages_saved": stats.get("pages_saved", 0),
+            "removed_listings": stats.get("removed_listings", 0),
+            "worker_utilization": stats.get("worker_utilization", {}),
             "errors": stats.get("errors", []),
         }
 
@@ -0,0 +1,140 @@
+"""
+Fiyat Dağılımı Sketch'i - Birleştirilebilir Log-Bucket Histogram
+================================================================
+Fiyatlar çok çarpık dağılır; ortalama tek başına yanıltıcıdır. Medyan ve
+yüzdelikler için ham fiyatları her istekte sıralamak yerine sabit göreli
+hatalı (DDSketch tarzı) bir histogram tutulur:
+
+- Fiyat p, i = ceil(ln(p) / ln(γ)) bucket'ına düşer, γ = (1 + α) / (1 - α)
+- Bucket temsilcisi 2·γ^i / (γ + 1); her yüzdelik en fazla α göreli hatalıdır
+- İki sketch bucket sayıları toplanarak birleşir (ilçe / gün / kategori
+  özetleri kayıpsız toplanır)
+- Bucket indeksi SQL'de de hesaplanır (bucket_sql), sketch'ler doğrudan
+  GROUP BY ile üretilir (sketch_aggregate_sql); DB'de {"<bucket>": sayı}
+  jsonb olarak saklanır - yüzlerce bucket, ham fiyat listesi değil
+
+Kullanım:
+    from price_sketch import merge_sketches, quantiles, sketch_aggregate_sql
+
+    sql = sketch_aggregate_sql([("COALESCE(ilce, '')", "ilce")],
+                               "FROM sahibinden_liste WHERE ...")
+    sketch = merge_sketches([row["price_sketch"] for row in rows])
+    quantiles(sketch, (0.25, 0.5, 0.75))   # {0.25: 1180000, 0.5: 1650000, ...}
+"""
+
+import math
+
+# Göreli hata (%1): 1.000.000 TL'lik medyan en fazla ±10.000 TL sapar
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LN_GAMMA = math.log(GAMMA)
+
+
+def bucket_index(price) -> int:
+    """Pozitif fiyatın bucket indeksi (bucket_sql ile aynı sonuç)"""
+    return math.ceil(math.log(price) / LN_GAMMA)
+
+
+def bucket_sql(column: str = "fiyat") -> str:
+    """bucket_index'in SQL karşılığı (sadece fiyat > 0 satırlarda kullanılır)"""
+    return f"ceil(ln({column}::float8) / {LN_GAMMA!r})::int"
+
+
+def bucket_value(index: int) -> float:
+    """Bucket temsilcisi: [γ^(i-1), γ^i] aralığının göreli orta noktası"""
+    return 2 * GAMMA**index / (GAMMA + 1)
+
+
+def sketch_aggregate_sql(keys, source_sql: str, price: str = "fiyat") -> str:
+    """
+    Özet satırları: anahtar kolonları + listing_count, priced_count, price_sum,
+    min_price, max_price, price_sketch. Önce (anahtar, bucket) sonra anahtar
+    bazında gruplanır; sıralama gerekmez.
+
+    Args:
+        keys: [(SQL ifadesi, kolon adı), ...]
+        source_sql: "FROM sahibinden_liste s WHERE ..." (JOIN içerebilir)
+        price: Fiyat kolonu ifadesi
+    """
+    key_select = ",\n                ".join(f"{expr} AS {name}" for expr, name in keys)
+    key_names = ", ".join(name for _, name in keys)
+    positions = ", ".join(str(i) for i in range(1, len(keys) + 2))
+    return f"""
+        SELECT
+            {key_names},
+            SUM(n) AS listing_count,
+            COALESCE(SUM(n) FILTER (WHERE bucket IS NOT NULL), 0) AS priced_count,
+            COALESCE(SUM(bucket_sum), 0) AS price_sum,
+            MIN(bucket_min) AS min_price,
+            MAX(bucket_max) AS max_price,
+            COALESCE(
+                jsonb_object_agg(bucket, n) FILTER (WHERE bucket IS NOT NULL),
+                '{{}}'::jsonb
+            ) AS price_sketch
+        FROM (
+            SELECT
+                {key_select},
+                CASE WHEN {price} > 0 THEN {bucket_sql(price)} END AS bucket,
+                COUNT(*) AS n,
+                SUM({price}) FILTER (WHERE {price} > 0) AS bucket_sum,
+                MIN({price}) FILTER (WHERE {price} > 0) AS bucket_min,
+                MAX({price}) FILTER (WHERE {price} > 0) AS bucket_max
+            {source_sql}
+            GROUP BY {positions}
+        ) AS buckets
+        GROUP BY {key_names}
+    """
+
+
+def build_sketch(prices) -> dict:
+    """Fiyat listesinden sketch (fiyat <= 0 / None atlanır)"""
+    sketch = {}
+    for price in prices:
+        if price and price > 0:
+            index = bucket_index(price)
+            sketch[index] = sketch.get(index, 0) + 1
+    return sketch
+
+
+def merge_sketches(sketches) -> dict:
+    """Sketch'leri birleştir; DB'den gelen str anahtarlar int'e çevrilir"""
+    merged = {}
+    for sketch in sketches:
+        for index, count in (sketch or {}).items():
+            index = int(index)
+            merged[index] = merged.get(index, 0) + int(count)
+    return merged
+
+
+QUARTILES = (0.25, 0.5, 0.75)
+
+
+def quartile_fields(sketch: dict) -> dict:
+    """API alanları: p25_price, median_price, p75_price"""
+    p25, p50, p75 = (quantiles(sketch, QUARTILES)[q] for q in QUARTILES)
+    return {"p25_price": p25, "median_price": p50, "p75_price": p75}
+
+
+def quantiles(sketch: dict, qs=QUARTILES) -> dict:
+    """
+    Yüzdelikler (PERCENTILE_DISC sırası). Boş sketch için değerler None.
+
+    Returns:
+        {q: yuvarlanmış fiyat}
+    """
+    items = sorted((int(i), int(c)) for i, c in (sketch or {}).items())
+    total = sum(count for _, count in items)
+    if total == 0:
+        return {q: None for q in qs}
+
+    result = {}
+    for q in qs:
+        # PERCENTILE_DISC ile aynı sıra: kümülatif payı >= q olan ilk değer
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for index, count in items:
+            seen += count
+            if seen >= rank:
+                result[q] = round(bucket_value(index))
+                break
+    return result
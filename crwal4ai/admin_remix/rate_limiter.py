@@ -8,18 +8,48 @@ Cloudflare ve bot detection'dan kaçınmak için akıllı bekleme sistemi.
 - Jitter (rastgele varyasyon)
 - Request tracking
 - Adaptive delay based on response time
+- Token bucket: dakikalık limit O(1) hesaplanır, bir sonraki token'a kadar
+  tam olarak uyunur (deque taraması / 2 sn'lik yoklama yok)
+- Ortak bütçe: aynı bucket'ı kullanan tüm süreçler (liste crawler, paralel
+  crawler, crawler API) tek bir dakikalık limiti paylaşır
+
+Bucket backend'i (env):
+    RATE_LIMIT_BACKEND=file      (varsayılan) kilitli durum dosyası, aynı makine
+    RATE_LIMIT_BACKEND=postgres  rate_limit_buckets tablosu (drizzle/0016), makineler arası
+    RATE_LIMIT_BACKEND=local     sadece bu süreç
+    RATE_LIMIT_BUCKET=sahibinden bucket adı (dosya adı / tablo satırı)
+    RATE_LIMIT_RPM=30            ortak dakikalık istek bütçesi (tüm süreçler için)
+    RATE_LIMIT_BURST=<RPM>       bucket kapasitesi (ardışık hızlı istek)
+    RATE_LIMIT_FILE=<yol>        file backend'i için durum dosyası
 """
 
+import os
+import struct
+from abc import ABC, abstractmethod
+import tempfile
+import threading
 import time
 import random
 import logging
-from collections import deque
 from dataclasses import dataclass, field
-from typing import Optional
+from pathlib import Path
+from typing import Optional, Tuple
 from datetime import datetime, timedelta
 
+try:
+    import fcntl
+
+    HAS_FCNTL = True
+except ImportError:  # Windows
+    import msvcrt
+
+    HAS_FCNTL = False
+
 logger = logging.getLogger(__name__)
 
+DEFAULT_BUCKET = "sahibinden"
+DEFAULT_RPM = 30
+
 
 @dataclass
 class RateLimiterConfig:
@@ -31,8 +61,259 @@ class RateLimiterConfig:
     backoff_multiplier: float = 1.5  # Block sonrası çarpan (2.0 -> 1.5)
     max_backoff_level: int = 3       # Maksimum backoff seviyesi (25 -> 3)
     cooldown_after_block: float = 10.0  # Block sonrası soğuma süresi (60.0 -> 10.0)
-    requests_per_minute: int = 100   # Dakikada maksimum istek (55 -> 100)
-    burst_limit: int = 50            # Ardışık hızlı istek limiti (25 -> 50)
+    min_interval: float = 0.0        # İki istek başlangıcı arası insan benzeri minimum (0 = kapalı)
+    interval_jitter: float = 0.0     # min_interval'e eklenen rastgele 0..jitter sn
+
+
+# ============================================================================
+# TOKEN BUCKET
+# ============================================================================
+
+
+def take_token(
+    tokens: float, updated_at: float, now: float, rate: float, capacity: float
+) -> Tuple[float, float]:
+    """
+    Bucket'ı `now` anına kadar doldur ve bir token ayır.
+
+    Token yoksa bucket eksiye düşer (rezervasyon): çağıran sırası gelene
+    kadar bekler, sonraki çağıranlar onun arkasına sıralanır.
+
+    Returns:
+        (yeni token sayısı, beklenecek süre sn)
+    """
+    tokens = min(capacity, tokens + max(0.0, now - updated_at) * rate) - 1
+    return tokens, max(0.0, -tokens / rate)
+
+
+def bucket_params_from_env() -> Tuple[float, float]:
+    """
+    Ortak bütçe (token/sn, kapasite): RATE_LIMIT_RPM / RATE_LIMIT_BURST.
+    Kapasite bir dakikalık limiti aşmaz.
+    """
+    rpm = max(1.0, float(os.getenv("RATE_LIMIT_RPM", DEFAULT_RPM)))
+    burst = float(os.getenv("RATE_LIMIT_BURST") or rpm)
+    return rpm / 60.0, max(1.0, min(burst, rpm))
+
+
+class TokenBucket(ABC):
+    """
+    Backend'lerin ortak arayüzü: reserve() durumu atomik olarak günceller,
+    acquire() dönen süre kadar uyur.
+
+    Hız ve kapasite bucket'ın özelliğidir, çağıranın config'inin değil:
+    aynı bucket'ı paylaşan tüm limiter'lar aynı bütçeye tabidir. Ortak
+    backend'lerde (file / postgres) durumu ilk oluşturan sürecin değerleri
+    durumla birlikte saklanır ve herkes onları kullanır.
+    """
+
+    name = "local"
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        env_rate, env_capacity = bucket_params_from_env()
+        self.rate = rate or env_rate
+        self.capacity = capacity or env_capacity
+
+    def _adopt_params(self, rate: float, capacity: float):
+        """Paylaşılan durumda saklı hız / kapasite bu sürecin ayarına üstün gelir"""
+        if (rate, capacity) == (self.rate, self.capacity):
+            return
+        logger.warning(
+            f"⚠️ Rate limit bucket'ı {rate * 60:g} istek/dk, kapasite {capacity:g} "
+            f"ile paylaşılıyor (bu süreç: {self.rate * 60:g}/dk, {self.capacity:g}); "
+            "ortak değer kullanılıyor"
+        )
+        self.rate, self.capacity = rate, capacity
+
+    @abstractmethod
+    def reserve(self) -> float:
+        """Bir token ayır, beklenmesi gereken süreyi (sn) döndür"""
+
+    def acquire(self) -> float:
+        """Bir token al; gerekiyorsa bir sonraki token'a kadar bekle"""
+        wait = self.reserve()
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class LocalTokenBucket(TokenBucket):
+    """Süreç içi bucket (thread-safe)"""
+
+    name = "local"
+
+    def __init__(self, rate: Optional[float] = None, capacity: Optional[float] = None):
+        super().__init__(rate, capacity)
+        self._lock = threading.Lock()
+        self._tokens: Optional[float] = None
+        self._updated_at = 0.0
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            if self._tokens is None:
+                self._tokens, self._updated_at = self.capacity, now
+            self._tokens, wait = take_token(
+                self._tokens, self._updated_at, now, self.rate, self.capacity
+            )
+            self._updated_at = now
+            return wait
+
+
+class FileTokenBucket(TokenBucket):
+    """
+    Aynı makinedeki süreçler arası bucket: durum (token, zaman, hız, kapasite)
+    32 baytlık bir dosyada tutulur, her rezervasyon dosya kilidi altında okunup
+    yazılır. Hızı değiştirmek için dosya silinir.
+    """
+
+    name = "file"
+    _STATE = struct.Struct("<dddd")
+
+    def __init__(
+        self,
+        path: Path,
+        rate: Optional[float] = None,
+        capacity: Optional[float] = None,
+    ):
+        super().__init__(rate, capacity)
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._thread_lock = threading.Lock()
+
+    def _lock(self, fd: int):
+        if HAS_FCNTL:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_LOCK, 1)
+
+    def _unlock(self, fd: int):
+        if HAS_FCNTL:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(fd, 0, os.SEEK_SET)
+            msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+    def reserve(self) -> float:
+        with self._thread_lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                self._lock(fd)
+                try:
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    raw = os.read(fd, self._STATE.size)
+                    # Süreçler arası ortak saat: time.time()
+                    now = time.time()
+                    if len(raw) == self._STATE.size:
+                        tokens, updated_at, rate, capacity = self._STATE.unpack(raw)
+                        self._adopt_params(rate, capacity)
+                    else:
+                        # Yeni (veya eski 16 baytlık biçimde) dosya
+                        rate, capacity = self.rate, self.capacity
+                        tokens, updated_at = capacity, now
+                    tokens, wait = take_token(tokens, updated_at, now, rate, capacity)
+                    os.lseek(fd, 0, os.SEEK_SET)
+                    os.write(fd, self._STATE.pack(tokens, now, rate, capacity))
+                    return wait
+                finally:
+                    self._unlock(fd)
+            finally:
+                os.close(fd)
+
+
+class PostgresTokenBucket(TokenBucket):
+    """
+    Makineler arası bucket: rate_limit_buckets (drizzle/0016, 0017) satırı tek
+    bir upsert ile güncellenir. Satır kilidi rezervasyonları sıraya koyar, saat
+    olarak veritabanının clock_timestamp()'i kullanılır. Hız ve kapasite
+    satırdadır (ilk ekleyen sürecin ayarı; değiştirmek için UPDATE).
+    Veritabanına ulaşılamazsa süreç içi bucket'a düşülür.
+    """
+
+    name = "postgres"
+
+    RESERVE_SQL = """
+        INSERT INTO rate_limit_buckets AS b (name, tokens, updated_at, rate, capacity)
+        VALUES (%(name)s, %(capacity)s - 1, clock_timestamp(), %(rate)s, %(capacity)s)
+        ON CONFLICT (name) DO UPDATE SET
+            tokens = LEAST(
+                COALESCE(b.capacity, EXCLUDED.capacity),
+                b.tokens + GREATEST(
+                    EXTRACT(EPOCH FROM clock_timestamp() - b.updated_at), 0
+                ) * COALESCE(b.rate, EXCLUDED.rate)
+            ) - 1,
+            updated_at = clock_timestamp(),
+            rate = COALESCE(b.rate, EXCLUDED.rate),
+            capacity = COALESCE(b.capacity, EXCLUDED.capacity)
+        RETURNING tokens, rate, capacity
+    """
+
+    def __init__(
+        self,
+        bucket: str = DEFAULT_BUCKET,
+        database=None,
+        rate: Optional[float] = None,
+        capacity: Optional[float] = None,
+    ):
+        super().__init__(rate, capacity)
+        self.bucket = bucket
+        self._db = database
+        self._fallback = LocalTokenBucket(self.rate, self.capacity)
+
+    def reserve(self) -> float:
+        try:
+            if self._db is None:
+                from db_manager import db
+
+                self._db = db
+            rows = self._db.execute_returning(
+                self.RESERVE_SQL,
+                {
+                    "name": self.bucket,
+                    "capacity": float(self.capacity),
+                    "rate": float(self.rate),
+                },
+            )
+        except Exception as e:  # havuz tükendi / veritabanı kapalı
+            logger.warning(f"⚠️ rate_limit_buckets hatası: {e}")
+            rows = None
+        if not rows:
+            logger.warning("⚠️ rate_limit_buckets okunamadı, süreç içi limite düşüldü")
+            return self._fallback.reserve()
+        rate, capacity = float(rows[0]["rate"]), float(rows[0]["capacity"])
+        self._adopt_params(rate, capacity)
+        return max(0.0, -float(rows[0]["tokens"]) / rate)
+
+
+_buckets = {}
+_buckets_lock = threading.Lock()
+
+
+def get_token_bucket(
+    backend: Optional[str] = None, bucket: Optional[str] = None
+) -> TokenBucket:
+    """
+    Env ayarlarına göre (RATE_LIMIT_BACKEND / RATE_LIMIT_BUCKET) süreç geneli
+    bucket. Aynı bucket'ı isteyen limiter'lar aynı örneği paylaşır.
+    """
+    backend = (backend or os.getenv("RATE_LIMIT_BACKEND", "file")).lower()
+    bucket = bucket or os.getenv("RATE_LIMIT_BUCKET", DEFAULT_BUCKET)
+    with _buckets_lock:
+        key = (backend, bucket)
+        if key not in _buckets:
+            if backend == "postgres":
+                _buckets[key] = PostgresTokenBucket(bucket)
+            elif backend == "file":
+                path = os.getenv("RATE_LIMIT_FILE") or (
+                    Path(tempfile.gettempdir()) / f"{bucket}_rate_limit.bucket"
+                )
+                _buckets[key] = FileTokenBucket(path)
+            else:
+                if backend != "local":
+                    logger.warning(f"⚠️ Bilinmeyen RATE_LIMIT_BACKEND: {backend}, local kullanılıyor")
+                _buckets[key] = LocalTokenBucket()
+        return _buckets[key]
 
 
 class AdaptiveRateLimiter:
@@ -52,17 +333,21 @@ class AdaptiveRateLimiter:
                 limiter.report_success()
     """
     
-    def __init__(self, config: Optional[RateLimiterConfig] = None):
+    def __init__(
+        self,
+        config: Optional[RateLimiterConfig] = None,
+        bucket: Optional[TokenBucket] = None,
+    ):
         self.config = config or RateLimiterConfig()
+        # Dakikalık limit: süreçler arası ortak token bucket
+        self.bucket = bucket or get_token_bucket()
         self.backoff_level = 0
         self.last_request_time: Optional[float] = None
         self.last_block_time: Optional[float] = None
-        self.request_times: deque = deque(maxlen=100)
         self.consecutive_successes = 0
         self.total_requests = 0
         self.total_blocks = 0
-        self.burst_count = 0
-        self.last_burst_reset = time.time()
+        self.total_limit_wait = 0.0
     
     def _calculate_delay(self) -> float:
         """Mevcut duruma göre bekleme süresini hesapla"""
@@ -84,27 +369,14 @@ class AdaptiveRateLimiter:
         # Sınırlar içinde tut
         return max(self.config.min_delay, min(self.config.max_delay, delay))
     
-    def _check_burst_limit(self) -> bool:
-        """Burst limit kontrolü"""
-        now = time.time()
-        
-        # Her dakika burst sayacını sıfırla
-        if now - self.last_burst_reset > 60:
-            self.burst_count = 0
-            self.last_burst_reset = now
-        
-        return self.burst_count < self.config.burst_limit
-    
-    def _check_rate_limit(self) -> bool:
-        """Dakikalık rate limit kontrolü"""
-        now = time.time()
-        minute_ago = now - 60
-        
-        # Son 1 dakikadaki istekleri say
-        recent_requests = sum(1 for t in self.request_times if t > minute_ago)
-        
-        return recent_requests < self.config.requests_per_minute
-    
+    def _acquire_token(self) -> float:
+        """Dakikalık limit: bir sonraki token'a kadar bekle"""
+        waited = self.bucket.acquire()
+        if waited > 0:
+            self.total_limit_wait += waited
+            logger.debug(f"Rate limit: {waited:.2f}s beklendi")
+        return waited
+
     def wait(self) -> float:
         """
         Sonraki istek için bekle - ULTRA HIZ MODU (minimal bekleme)
@@ -120,19 +392,27 @@ class AdaptiveRateLimiter:
                 logger.info(f"⏳ Block sonrası soğuma: {extra_wait:.1f}s")
                 time.sleep(extra_wait)
         
-        # Rate limit kontrolü (sadece aşılırsa bekle)
-        while not self._check_rate_limit():
-            logger.debug("Rate limit aşıldı, bekleniyor...")
-            time.sleep(2)  # 5s -> 2s
+        # İnsan benzeri minimum aralık: önceki isteğin başlangıcından itibaren
+        # sayılır, sayfa yükleme süresi bu aralığın içinde kalır
+        waited = 0.0
+        if self.config.min_interval > 0 and self.last_request_time:
+            interval = self.config.min_interval + random.uniform(
+                0, self.config.interval_jitter
+            )
+            remaining = self.last_request_time + interval - time.time()
+            if remaining > 0:
+                time.sleep(remaining)
+                waited += remaining
+
+        # Rate limit kontrolü (sadece token yoksa, tam gerektiği kadar bekle)
+        waited += self._acquire_token()
         
         # ULTRA HIZ: Delay hesaplama YOK, direkt geç!
         # Sadece kayıt tut
         self.last_request_time = time.time()
-        self.request_times.append(self.last_request_time)
         self.total_requests += 1
-        self.burst_count += 1
         
-        return 0  # Hiç bekleme!
+        return waited
     
     def report_success(self):
         """Başarılı istek bildir"""
@@ -179,6 +459,9 @@ class AdaptiveRateLimiter:
             "current_backoff_level": self.backoff_level,
             "current_delay": self._calculate_delay(),
             "consecutive_successes": self.consecutive_successes,
+            "bucket_backend": self.bucket.name,
+            "bucket_requests_per_minute": round(self.bucket.rate * 60, 2),
+            "total_limit_wait": round(self.total_limit_wait, 2),
         }
     
     def reset(self):
@@ -186,7 +469,6 @@ class AdaptiveRateLimiter:
         self.backoff_level = 0
         self.consecutive_successes = 0
         self.last_block_time = None
-        self.burst_count = 0
         logger.info("🔄 Rate limiter sıfırlandı")
 
 
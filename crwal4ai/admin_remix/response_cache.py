@@ -0,0 +1,234 @@
+"""
+Yanıt Cache'i - Admin API için TTL + LRU
+========================================
+Dashboard / istatistik / harita endpoint'leri veri sadece crawler yazınca
+değiştiği halde her istekte baştan hesaplanıyordu. Bu modül:
+
+- Yanıtları (route + query args) anahtarıyla process içinde tutar (TTL + LRU)
+- Her kayıt oluşturulduğu "generation" ile saklanır; generation artınca
+  tüm kayıtlar geçersiz olur
+- Generation, PostgreSQL NOTIFY kanalı dinlenerek artırılır: mining_jobs
+  üzerindeki trigger (drizzle/0010) status/progress/stats değişiminde
+  bildirim gönderir; crawler ayrı process'te çalışsa da cache temizlenir
+- ETag üretir, If-None-Match eşleşirse 304 döner
+- Hit / miss / 304 / eviction sayaçlarını tutar
+
+Kullanım:
+    from response_cache import cached_response, response_cache
+
+    @app.route("/api/dashboard")
+    @cached_response()
+    def api_dashboard(): ...
+
+    response_cache.invalidate()   # Uygulama içinden veri değiştiğinde
+    response_cache.stats()
+
+Ortam değişkenleri:
+    RESPONSE_CACHE_TTL       Kayıt ömrü, saniye (default: 60, 0 = kapalı)
+    RESPONSE_CACHE_SIZE      Maksimum kayıt (default: 256)
+    RESPONSE_CACHE_CHANNEL   NOTIFY kanalı (default: crawler_data_changed)
+"""
+
+import functools
+import hashlib
+import logging
+import os
+import select
+import threading
+import time
+from collections import OrderedDict
+
+import psycopg2
+from flask import make_response, request
+
+logger = logging.getLogger(__name__)
+
+CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "60"))
+CACHE_SIZE = int(os.getenv("RESPONSE_CACHE_SIZE", "256"))
+NOTIFY_CHANNEL = os.getenv("RESPONSE_CACHE_CHANNEL", "crawler_data_changed")
+
+# Dinleyici bağlantısı koparsa yeniden deneme aralığı (saniye)
+RECONNECT_DELAY = 5.0
+
+
+class ResponseCache:
+    """Generation sayaçlı TTL + LRU yanıt cache'i"""
+
+    def __init__(self, ttl: float = CACHE_TTL, max_entries: int = CACHE_SIZE):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.generation = 0
+
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._listener = None
+        self._listening = False
+
+        self._counters = {
+            "hits": 0,
+            "misses": 0,
+            "not_modified": 0,
+            "evictions": 0,
+            "invalidations": 0,
+            "notifications": 0,
+        }
+
+    # ------------------------------------------------------------------
+    # Kayıtlar
+    # ------------------------------------------------------------------
+
+    def get(self, key):
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            generation, expires, _ = entry
+            if generation != self.generation or now >= expires:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[2]
+
+    def put(self, key, value, generation: int, ttl: float = None):
+        expires = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            # Hesaplama sırasında veri değiştiyse eski sonucu saklama
+            if generation != self.generation:
+                return
+            self._entries[key] = (generation, expires, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._counters["evictions"] += 1
+
+    def invalidate(self, reason: str = "manual"):
+        """Generation'ı artır, tüm kayıtları düşür"""
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+            self._counters["invalidations"] += 1
+        logger.debug(f"Yanıt cache'i temizlendi ({reason})")
+
+    def count(self, name: str, n: int = 1):
+        with self._lock:
+            self._counters[name] += n
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "entries": entries,
+            "max_entries": self.max_entries,
+            "ttl": self.ttl,
+            "generation": self.generation,
+            "hit_rate": round(counters["hits"] / lookups, 3) if lookups else 0.0,
+            "listening": self._listening,
+            "channel": NOTIFY_CHANNEL,
+        }
+
+    # ------------------------------------------------------------------
+    # NOTIFY dinleyici
+    # ------------------------------------------------------------------
+
+    def start_listener(self):
+        """LISTEN thread'ini (bir kez) başlat"""
+        with self._lock:
+            if self._listener is not None:
+                return
+            self._listener = threading.Thread(
+                target=self._listen, name="response-cache-listener", daemon=True
+            )
+        self._listener.start()
+
+    def _listen(self):
+        from db_manager import db
+
+        while True:
+            conn = None
+            try:
+                # Pool dışı, autocommit: LISTEN bağlantısı sürekli açık kalır
+                conn = psycopg2.connect(db.db_url)
+                conn.autocommit = True
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {NOTIFY_CHANNEL}")
+                self._listening = True
+                # Bağlantı yokken kaçırılan değişiklikler olabilir
+                self.invalidate("listener connected")
+                logger.info(f"🔔 Yanıt cache'i '{NOTIFY_CHANNEL}' kanalını dinliyor")
+
+                while True:
+                    if select.select([conn], [], [], 60) == ([], [], []):
+                        continue
+                    conn.poll()
+                    if conn.notifies:
+                        self.count("notifications", len(conn.notifies))
+                        conn.notifies.clear()
+                        self.invalidate("notify")
+            except Exception as e:
+                logger.warning(f"⚠️ Cache dinleyici bağlantısı koptu: {e}")
+            finally:
+                self._listening = False
+                if conn is not None and not conn.closed:
+                    conn.close()
+            time.sleep(RECONNECT_DELAY)
+
+
+response_cache = ResponseCache()
+
+
+def _cache_key():
+    return request.path, tuple(sorted(request.args.items(multi=True)))
+
+
+def cached_response(ttl: float = None):
+    """
+    Flask view decorator'ı: 200 yanıtları cache'ler, ETag / 304 destekler.
+    Dinleyici bağlı değilken (DB'ye LISTEN açılamadıysa) cache devre dışıdır.
+    """
+
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            cache = response_cache
+            if (ttl if ttl is not None else cache.ttl) <= 0:
+                return view(*args, **kwargs)
+            cache.start_listener()
+
+            key = _cache_key()
+            entry = cache.get(key) if cache._listening else None
+
+            if entry is None:
+                cache.count("misses")
+                generation = cache.generation
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200 or response.direct_passthrough:
+                    return response
+
+                body = response.get_data()
+                entry = (body, response.mimetype, hashlib.sha1(body).hexdigest())
+                if cache._listening:
+                    cache.put(key, entry, generation, ttl)
+                status = "MISS"
+            else:
+                cache.count("hits")
+                status = "HIT"
+
+            body, mimetype, etag = entry
+            response = make_response(body)
+            response.mimetype = mimetype
+            response.set_etag(etag)
+            # Tarayıcı her seferinde doğrulasın; değişmediyse 304
+            response.headers["Cache-Control"] = "no-cache"
+            response.headers["X-Cache"] = status
+            response.make_conditional(request)
+            if response.status_code == 304:
+                cache.count("not_modified")
+            return response
+
+        return wrapper
+
+    return decorator
@@ -10,6 +10,7 @@ Kullanım:
    python sahibinden_crawler.py --categories arsa_satilik
    python sahibinden_crawler.py --max-pages 5
    python sahibinden_crawler.py --job-id <uuid>
+   python sahibinden_crawler.py --sync --flush-size 1000   # COPY ile toplu yazma
 """
 
 import undetected_chromedriver as uc
@@ -30,6 +31,7 @@ import logging
 import argparse
 from datetime import datetime, timedelta
 import shutil
+import threading
 from pathlib import Path
 from typing import Optional, List, Dict
 
@@ -40,6 +42,43 @@ from dotenv import load_dotenv
 # Rate Limiter import
 from rate_limiter import AdaptiveRateLimiter, RateLimiterConfig, get_rate_limiter
 
+# Liste sayfası parser (lxml / selectolax / bs4) + ortak fiyat/tarih parse
+from listing_parser import (
+    get_listing_parser,
+    parse_price,
+    parse_listing_date,
+    is_new_listing,
+    listing_date_sql,
+)
+
+# Mevcut ilan id'leri (mmap'li cache dosyası + artımlı refresh)
+from listing_id_index import ListingIdIndex
+
+# mining_logs arka plan yazıcı (kuyruk + toplu insert)
+from mining_log_sink import MiningLogSink
+
+# mining_jobs progress/stats debounce + diff yazıcı
+from job_progress import JobProgressReporter
+
+# sahibinden_liste yazma yolu (VALUES upsert / COPY tamponu)
+from listing_writer import (
+    DEFAULT_FLUSH_SIZE,
+    LISTING_COLUMNS,
+    ListingBulkWriter,
+    upsert_listings_values,
+)
+
+# İlçe / semt / mahalle ayrıştırma (admin API ile ortak)
+from location_utils import normalize_district, parse_konum_to_semt_mahalle
+
+# Harita mahalle özetleri (neighborhood_stats) artımlı bakımı
+from neighborhood_stats import (
+    current_keys,
+    keys_from_rows,
+    mahalle_key_sql,
+    refresh_neighborhood_stats,
+)
+
 # Load environment
 load_dotenv()
 
@@ -54,212 +93,13 @@ SCRIPT_DIR = Path(__file__).parent
 CHROME_PROFILE = SCRIPT_DIR / "uc_chrome_profile_4c8afaa6"
 
 
-# Helper function: Parse price string to integer
-def parse_price(price_str):
-    """
-    Fiyat string'ini integer'a çevirir.
-    Örnek: "9.300.000 TL" -> 9300000
-    """
-    if not price_str:
-        return 0
-    try:
-        # String'i temizle: sadece rakamları al
-        cleaned = "".join(filter(str.isdigit, str(price_str)))
-        return int(cleaned) if cleaned else 0
-    except:
-        return 0
-
-
-def parse_konum_to_semt_mahalle(konum_text):
-    """
-    Konum metnini semt ve mahalle olarak ayır - CamelCase pattern
-
-    Strateji:
-    1. CamelCase pattern kullan: İlk büyük harf grubu = semt, ikinci büyük harf grubu = mahalle
-    2. Örnek: "TığcılarYahyalar Mah." -> "Tığcılar" + "Yahyalar Mah."
-    3. Örnek: "MerkezYeni Mah." -> "Merkez" + "Yeni Mah."
-    4. Örnek: "KöylerDağdibi Mh." -> "Köyler" + "Dağdibi Mh."
-
-    Returns:
-        tuple: (semt, mahalle) veya (None, mahalle) veya (semt, None)
-    """
-    if not konum_text:
-        return None, None
-
-    # Boşluk varsa zaten ayrılmış demektir
-    if " " in konum_text and not konum_text[0].isupper():
-        return None, konum_text
-
-    # CamelCase pattern'i bul: Büyük harfle başlayan kelime grupları
-    import re
-
-    pattern = r"[A-ZÇĞİÖŞÜ][a-zçğıöşü]*"
-    matches = re.findall(pattern, konum_text)
-
-    if len(matches) == 0:
-        # Hiç büyük harf yok, tüm metin mahalle
-        return None, konum_text
-
-    elif len(matches) == 1:
-        # Tek kelime var
-        # Eğer yaygın semt isimlerinden biriyse semt, değilse mahalle
-        common_semts = ["Merkez", "Köyler", "İstiklal", "Tepekum", "Semerciler"]
-        if matches[0] in common_semts:
-            # Kalan kısmı al
-            remaining = konum_text[len(matches[0]) :].strip()
-            if remaining:
-                return matches[0], remaining
-            else:
-                return matches[0], None
-        else:
-            return None, konum_text
-
-    else:
-        # İki veya daha fazla kelime var
-        # İlk kelime = semt, geri kalanı = mahalle
-        semt = matches[0]
-
-        # Semt'ten sonraki kısmı al
-        semt_end_index = konum_text.find(semt) + len(semt)
-        mahalle = konum_text[semt_end_index:].strip()
-
-        if not mahalle:
-            # Sadece semt var
-            return semt, None
-
-        return semt, mahalle
-
-
-def normalize_district(district_str):
-    """
-    İlçe ismini normalize et - case sensitivity düzelt
-    Örnek: "adapazari" -> "Adapazarı", "hendek" -> "Hendek"
-    """
-    if not district_str:
-        return None
-
-    district_lower = district_str.lower().strip()
-
-    # İlçe mapping
-    district_map = {
-        "adapazari": "Adapazarı",
-        "adapazarı": "Adapazarı",
-        "akyazi": "Akyazı",
-        "akyazı": "Akyazı",
-        "hendek": "Hendek",
-    }
-
-    return district_map.get(district_lower, district_str.title())
-
-
-def parse_listing_date(date_str: str) -> Optional[datetime]:
-    """
-    İlan tarihini parse et
-
-    Formatlar:
-    - "Bugün 14:30" -> bugün saat 14:30
-    - "Dün 09:15" -> dün saat 09:15
-    - "15 Ocak" -> bu yıl 15 Ocak
-    - "20 Aralık 2024" -> 20 Aralık 2024
-
-    Returns:
-        datetime object veya None
-    """
-    if not date_str:
-        return None
-
-    try:
-        now = datetime.now()
-        date_str = date_str.strip()
-
-        # "Bugün 14:30" formatı
-        if date_str.startswith("Bugün"):
-            time_part = date_str.replace("Bugün", "").strip()
-            if time_part:
-                hour, minute = map(int, time_part.split(":"))
-                return now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            return now
-
-        # "Dün 09:15" formatı
-        if date_str.startswith("Dün"):
-            time_part = date_str.replace("Dün", "").strip()
-            yesterday = now - timedelta(days=1)
-            if time_part:
-                hour, minute = map(int, time_part.split(":"))
-                return yesterday.replace(
-                    hour=hour, minute=minute, second=0, microsecond=0
-                )
-            return yesterday
-
-        # Türkçe ay isimleri
-        months = {
-            "Ocak": 1,
-            "Şubat": 2,
-            "Mart": 3,
-            "Nisan": 4,
-            "Mayıs": 5,
-            "Haziran": 6,
-            "Temmuz": 7,
-            "Ağustos": 8,
-            "Eylül": 9,
-            "Ekim": 10,
-            "Kasım": 11,
-            "Aralık": 12,
-        }
-
-        # "15 Ocak" veya "15 Ocak 2024" formatı
-        parts = date_str.split()
-        if len(parts) >= 2:
-            day = int(parts[0])
-            month_name = parts[1]
-
-            # Yıl belirtilmişse kullan, yoksa akıllı tahmin yap
-            if len(parts) >= 3:
-                year = int(parts[2])
-            else:
-                # Yıl yok - akıllı tahmin: Ocak → 2026, diğerleri → 2025
-                if month_name in months:
-                    month = months[month_name]
-                    year = 2026 if month == 1 else 2025
-                else:
-                    year = now.year
-
-            if month_name in months:
-                month = months[month_name]
-                return datetime(year, month, day)
-
-        return None
-
-    except Exception as e:
-        logger.debug(f"Tarih parse hatası: {date_str} -> {e}")
-        return None
-
-
-def is_new_listing(listing_date: Optional[datetime]) -> bool:
-    """
-    İlan yeni mi kontrol et (bugün veya dün yayınlanmış mı)
-
-    Args:
-        listing_date: İlan tarihi
-
-    Returns:
-        True ise yeni ilan (bugün veya dün), False ise eski
-    """
-    if not listing_date:
-        return False
-
-    now = datetime.now()
-
-    # Bugün mü?
-    if listing_date.date() == now.date():
-        return True
-
-    # Dün mü?
-    yesterday = now - timedelta(days=1)
-    if listing_date.date() == yesterday.date():
-        return True
-
-    return False
+def diff_status(diff: int) -> str:
+    """Sahibinden - DB farkından senkron durumu"""
+    if diff > 0:
+        return "new"  # Yeni ilanlar var
+    if diff < 0:
+        return "removed"  # İlanlar kaldırılmış
+    return "synced"  # Senkron
 
 
 # Sakarya İlçeleri
@@ -356,7 +196,18 @@ HENDEK_CATEGORIES = {
 PAGE_DELAY_MIN = 0.5  # Minimum sayfa arası bekleme (1 -> 0.5)
 PAGE_DELAY_MAX = 1  # Maksimum sayfa arası bekleme (3 -> 1.5)
 CATEGORY_DELAY = 2  # Kategori arası bekleme (5 -> 2)
+# In-process (havuzlu) job'lar için üst süre; alt süreç yolundaki timeout ile aynı
+CRAWL_JOB_TIMEOUT = 3600
 MAX_PAGES_PER_CATEGORY = 100
+
+# Sayfa hazır olma (navigate): "dom" = DOM koşulları beklenir (sonuç satırları,
+# data-totalmatches), "sleep" = eski sabit 3-3.8 sn bekleme
+READY_MODE = os.getenv("CRAWLER_READY_MODE", "dom").lower()
+READY_POLL_INTERVAL = 0.1
+# "dom" modunda insan benzeri tempo rate limiter'dadır: iki sayfa isteğinin
+# başlangıçları arası en az MIN_PAGE_INTERVAL + 0..JITTER sn (yükleme dahil)
+MIN_PAGE_INTERVAL = float(os.getenv("CRAWLER_MIN_PAGE_INTERVAL", "3.0"))
+MIN_PAGE_INTERVAL_JITTER = float(os.getenv("CRAWLER_MIN_PAGE_INTERVAL_JITTER", "0.8"))
 SMART_STOP_THRESHOLD = 10  # 3 sayfa üst üste eski ilan varsa dur
 
 USER_AGENTS = [
@@ -367,13 +218,161 @@ USER_AGENTS = [
 VIEWPORTS = [(1920, 1080), (1366, 768), (1536, 864)]
 
 
+def chrome_options(profile_dir: Path):
+    """Chrome ayarları - Normal WebDriver için optimize edilmiş"""
+
+    profile_dir.mkdir(exist_ok=True)
+
+    # Gerçek kullanıcı gibi görünmek için güncel User-Agent
+    user_agent = (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
+    )
+
+    options = uc.ChromeOptions()
+
+    options.add_argument(f"user-agent={user_agent}")
+    options.add_argument(f"--window-size=1920,1080")
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--lang=tr-TR")
+
+    return options
+
+
+def clean_profile_dir(profile_dir: Path):
+    if profile_dir.exists():
+        try:
+            logger.info(f"🧹 Temizlik başlatılıyor: {profile_dir}")
+            for i in range(3):
+                try:
+                    shutil.rmtree(profile_dir, ignore_errors=True)
+                    if not profile_dir.exists():
+                        logger.info("✅ Profil dizini başarıyla temizlendi.")
+                        break
+                    time.sleep(1)
+                except Exception as e:
+                    logger.warning(f"⚠️ Temizlik denemesi {i + 1} başarısız: {e}")
+
+            profile_dir.mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logger.error(f"❌ Profil temizleme kritik hatası: {e}")
+
+
+def launch_chrome(profile_dir: Path = CHROME_PROFILE):
+    """Temiz profille Chrome başlat (crawler ve tarayıcı havuzu ortak kullanır)"""
+    clean_profile_dir(profile_dir)
+
+    logger.info("🚀 Chrome başlatılıyor (Temiz Oturum)...")
+
+    options = chrome_options(profile_dir)
+
+    try:
+        driver = uc.Chrome(options=options)
+    except Exception as e:
+        logger.error(f"❌ Chrome başlatılamadı: {e}")
+        shutil.rmtree(profile_dir, ignore_errors=True)
+        driver = uc.Chrome(options=options)
+
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        logger.info("🛡️ Browser cache ve cookies temizlendi.")
+    except:
+        pass
+
+    driver.execute_script(
+        "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
+    )
+
+    logger.info("✅ Chrome hazır!")
+    return driver
+
+
+# Havuz oturumları açılışta bir kez ana sayfaya gider (Cloudflare çerezi)
+WARM_UP_URL = "https://www.sahibinden.com/"
+WARM_UP_TIMEOUT = 30
+CHALLENGE_MARKERS = ("checking your browser", "just a moment", "olağan dışı")
+
+
+def warm_up_session(driver, timeout: int = WARM_UP_TIMEOUT) -> bool:
+    """Ana sayfayı aç, Cloudflare challenge'ı geçene kadar bekle"""
+    driver.get(WARM_UP_URL)
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        title = (driver.title or "").lower()
+        if title and not any(marker in title for marker in CHALLENGE_MARKERS):
+            logger.info("🔥 Oturum ısındı (ana sayfa yüklendi)")
+            return True
+        time.sleep(1)
+    logger.warning("⚠️ Isınma zaman aşımı - oturum yine de havuza alındı")
+    return False
+
+
+# Havuz doluysa oturum için en fazla bu kadar beklenir
+BROWSER_LEASE_TIMEOUT = 600
+
+# Sayfa durumu tek execute_script ile okunur (page_source serileştirmesi yok).
+# Önce ucuz selector'lar; metin sadece sayfa henüz hazır değilse, ilk 2000
+# karakteriyle kontrol edilir
+READY_PROBE_JS = """
+if (document.querySelector('.classifiedDetailTitle, #classifiedDetailTitle') ||
+    document.querySelector('#searchCategoryContainer')) return 'ready';
+const total = document.querySelector('[data-totalmatches]');
+if (total && (total.getAttribute('data-totalmatches') === '0' ||
+    document.querySelector('#searchResultsTable tbody tr.searchResultsItem') ||
+    document.readyState === 'complete')) return 'ready';
+const text = ((document.title || '') + ' ' +
+    (document.body ? document.body.textContent.slice(0, 2000) : '')).toLowerCase();
+if (text.includes('checking your browser') || text.includes('just a moment') ||
+    text.includes('olağan dışı')) return 'challenge';
+if (text.includes('access denied') || text.includes('403 forbidden')) return 'blocked';
+return 'loading';
+"""
+
+# Döndürülen HTML'de challenge işaretleri sadece bu kadar karakterlik başta
+# aranır (challenge sayfaları küçüktür, işaret <title> / ilk metindedir)
+CHALLENGE_SCAN_CHARS = 8192
+
+
+class CrawlStopped(Exception):
+    """Job iptal edildi veya süre sınırı doldu (sayfalar arasında kontrol edilir)"""
+
+
 class SahibindenCrawler:
     """PostgreSQL entegrasyonlu Sahibinden crawler"""
 
-    def __init__(self, job_id: Optional[str] = None):
+    def __init__(
+        self,
+        job_id: Optional[str] = None,
+        flush_size: int = DEFAULT_FLUSH_SIZE,
+        profile_dir: Optional[Path] = None,
+        browser_pool=None,
+    ):
         self.driver = None
         self.job_id = job_id
-        self.seen_ids = set()
+        # Paralel worker'lar aynı Chrome profilini paylaşamaz (profile kilidi)
+        self.profile_dir = Path(profile_dir) if profile_dir else CHROME_PROFILE
+        # browser_pool.BrowserPool: Chrome job'lar arası açık kalır, oturum kiralanır
+        self.browser_pool = browser_pool
+        self.browser_session = None
+        self.seen_ids = ListingIdIndex()
+        # In-process job'larda iptal / süre sınırı (sayfalar arasında kontrol edilir)
+        self.stop_event: Optional[threading.Event] = None
+        self.deadline: Optional[float] = None  # time.monotonic()
+
+        # Job log'ları kuyruk üzerinden toplu yazılır (crawl döngüsünü bekletmez)
+        self.log_sink = MiningLogSink(job_id) if job_id else None
+        self.progress_reporter = JobProgressReporter(job_id) if job_id else None
+
+        # DB ilan sayıları: {(category, transaction): count} - tek grouped sorgu
+        self._category_counts = None
+        self._category_counts_district = None
+        self._stale_category_counts = set()
+        # navigate: driver.get başlangıcından sayfanın hazır olmasına kadar geçen süreler
+        self._ready_samples: List[float] = []
         self.stats = {
             "started_at": None,
             "completed_at": None,
@@ -389,11 +388,42 @@ class SahibindenCrawler:
             # SMART CRAWLER stats
             "smart_stops": 0,  # Kaç kez smart stop tetiklendi
             "pages_saved": 0,  # Smart stop ile kaç sayfa atlandı
+            # navigate başına page_source: sayfa, serileştirme, bayt, süre (sn)
+            "page_source": {"pages": 0, "fetches": 0, "bytes": 0, "seconds": 0.0},
+            # Sayfa hazır olma süresi (sn) - bkz. _record_ready
+            "time_to_ready": {
+                "mode": READY_MODE,
+                "pages": 0,
+                "avg": None,
+                "p50": None,
+                "p95": None,
+                "max": None,
+                "timeouts": 0,
+                "challenges": 0,
+            },
         }
 
         # Turbo modu durumu
         self.turbo_mode = False
 
+        # Liste parser backend'i (LISTING_PARSER env ile değiştirilebilir)
+        self.listing_parser = get_listing_parser()
+        logger.info(f"🧩 Liste parser: {self.listing_parser.name}")
+
+        # Yazılacak satırların eski mahalle özet anahtarları (flush'ta yenilenir)
+        self._pending_stats_keys = set()
+
+        # COPY tabanlı toplu yazma (flush_size=0 ise her sayfa anında yazılır)
+        self.listing_writer = (
+            ListingBulkWriter(
+                flush_size=flush_size, on_flush=self._refresh_neighborhood_stats
+            )
+            if flush_size > 0
+            else None
+        )
+        if self.listing_writer:
+            logger.info(f"💾 Toplu yazma aktif: {flush_size} satırda bir COPY")
+
         # Adaptive Rate Limiter - CLOUDFLARE BYPASS MODU
         self.rate_limiter = AdaptiveRateLimiter(
             RateLimiterConfig(
@@ -404,8 +434,10 @@ class SahibindenCrawler:
                 backoff_multiplier=1.5,  # Block sonrası çarpan (2.0 -> 2.5)
                 max_backoff_level=10,  # Maksimum backoff seviyesi (15 -> 20)
                 cooldown_after_block=45.0,  # Block sonrası soğuma (30 -> 45)
-                requests_per_minute=35,  # Dakikada max istek (55 -> 20) - ÇOK YAVAŞ
-                burst_limit=100,  # Ardışık hızlı istek limiti (100 -> 50)
+                # Dakikalık limit ortak bucket'ta: RATE_LIMIT_RPM / RATE_LIMIT_BURST
+                # "sleep" modunda tempo navigate'teki sabit beklemeden gelir
+                min_interval=MIN_PAGE_INTERVAL if READY_MODE == "dom" else 0.0,
+                interval_jitter=MIN_PAGE_INTERVAL_JITTER,
             )
         )
 
@@ -420,17 +452,15 @@ class SahibindenCrawler:
     def _load_existing_ids(self):
         """Mevcut ID'leri yükle (duplicate kontrolü için)"""
         try:
-            result = db.execute_query("SELECT id FROM sahibinden_liste")
-            self.seen_ids = {str(r["id"]) for r in result}
-            logger.info(f"📥 {len(self.seen_ids)} mevcut ID yüklendi")
+            self.seen_ids = ListingIdIndex.load()
         except Exception as e:
             logger.warning(f"⚠️ Mevcut ID'ler yüklenemedi: {e}")
 
     def _update_job_progress(
         self, current: int, total: int, message: str = "", extra_data: dict = None
     ):
-        """Job progress güncelle"""
-        if not self.job_id:
+        """Job progress güncelle (debounce'lu, sadece değişen stats alanları yazılır)"""
+        if not self.progress_reporter:
             return
         try:
             percentage = int((current / total * 100)) if total > 0 else 0
@@ -442,45 +472,83 @@ class SahibindenCrawler:
             if message:
                 progress_data["message"] = message
 
-            stats_to_save = {**self.stats, **(extra_data or {})}
-
-            db.execute_query(
-                "UPDATE mining_jobs SET progress = %s, stats = %s, updated_at = NOW() WHERE id = %s",
-                (json.dumps(progress_data), json.dumps(stats_to_save), self.job_id),
-                fetch=False,
+            self.progress_reporter.update(
+                progress=progress_data,
+                stats={**self.stats, **(extra_data or {})},
+                force=bool(extra_data) or current >= total,
             )
         except Exception as e:
             logger.warning(f"Progress güncellenemedi: {e}")
 
     def _update_job_stats(self, extra_data: dict = None):
         """Job stats'ı güncelle (category_comparison gibi ekstra veriler için)"""
-        if not self.job_id:
+        if not self.progress_reporter:
             return
         try:
-            stats_to_save = {**self.stats, **(extra_data or {})}
-            db.execute_query(
-                "UPDATE mining_jobs SET stats = %s, updated_at = NOW() WHERE id = %s",
-                (json.dumps(stats_to_save), self.job_id),
-                fetch=False,
+            self.progress_reporter.update(
+                stats={**self.stats, **(extra_data or {})}, force=True
             )
             logger.debug(f"Job stats güncellendi: {extra_data}")
         except Exception as e:
             logger.warning(f"Job stats güncellenemedi: {e}")
 
+    def flush_job_progress(self):
+        """Bekleyen progress/stats'ı yaz (atlanan yazım sayısı ile birlikte)"""
+        if not self.progress_reporter:
+            return
+        reporter = self.progress_reporter
+        reporter.update(
+            stats={
+                **self.stats,
+                "progress_writes": {
+                    "written": reporter.writes + 1,
+                    "suppressed": reporter.suppressed,
+                },
+            },
+            force=True,
+        )
+
     def _add_log(self, level: str, message: str, data: dict = None):
         """Mining log ekle"""
         # Job ID yoksa log yazma (mining_logs tablosu job_id gerektirir)
-        if not self.job_id:
+        if not self.log_sink:
             return
 
-        try:
-            db.execute_query(
-                "INSERT INTO mining_logs (job_id, level, message, data, created_at) VALUES (%s, %s, %s, %s, NOW())",
-                (self.job_id, level, message, json.dumps(data) if data else None),
-                fetch=False,
-            )
-        except Exception as e:
-            logger.debug(f"Log yazılamadı: {e}")
+        self.log_sink.log(level, message, data)
+
+    def _load_category_counts(self, district: str = None) -> Dict[tuple, int]:
+        """
+        Tüm kategori/işlem tipi DB sayılarını tek GROUP BY sorgusuyla yükle.
+        Sonuç önbelleklenir; crawl edilen kategori bayatlamış sayılır ve
+        istendiğinde sorgu tekrar çalışır.
+        """
+        district_norm = normalize_district(district)
+        if (
+            self._category_counts is None
+            or self._category_counts_district != district_norm
+        ):
+            rows = db.get_listing_counts(district=district_norm)
+            if rows is None:
+                raise RuntimeError("Kategori sayıları okunamadı")
+
+            counts = {}
+            for row in rows:
+                key = (row["category"], row["transaction"])
+                counts[key] = counts.get(key, 0) + row["count"]
+
+            self._category_counts = counts
+            self._category_counts_district = district_norm
+            self._stale_category_counts.clear()
+
+        return self._category_counts
+
+    def _get_category_count(
+        self, category: str, transaction: str, district: str = None
+    ) -> int:
+        """Tek kategori/işlem tipinin DB sayısı (önbellekten)"""
+        if (category, transaction) in self._stale_category_counts:
+            self._category_counts = None
+        return self._load_category_counts(district).get((category, transaction), 0)
 
     def _save_category_stats(
         self,
@@ -490,44 +558,14 @@ class SahibindenCrawler:
         district: str = None,
     ):
         try:
-            district_norm = normalize_district(district)
-
-            sql = "SELECT COUNT(*) as count FROM sahibinden_liste WHERE category = %s AND transaction = %s"
-            params = [category, transaction]
-
-            if district_norm:
-                sql += " AND ilce = %s"
-                params.append(district_norm)
-
-            db_result = db.execute_one(sql, tuple(params))
-            database_count = db_result["count"] if db_result else 0
+            database_count = self._get_category_count(category, transaction, district)
 
             # Farkı hesapla
             diff = sahibinden_count - database_count
+            status = diff_status(diff)
 
-            # Status belirle
-            if diff > 0:
-                status = "new"
-            elif diff < 0:
-                status = "removed"
-            else:
-                status = "synced"
-
-            # Upsert (insert or update)
-            db.execute_query(
-                """
-                INSERT INTO category_stats (category, transaction, sahibinden_count, database_count, diff, status, last_checked_at)
-                VALUES (%s, %s, %s, %s, %s, %s, NOW())
-                ON CONFLICT (category, transaction) 
-                DO UPDATE SET 
-                    sahibinden_count = EXCLUDED.sahibinden_count,
-                    database_count = EXCLUDED.database_count,
-                    diff = EXCLUDED.diff,
-                    status = EXCLUDED.status,
-                    last_checked_at = NOW()
-                """,
-                (category, transaction, sahibinden_count, database_count, diff, status),
-                fetch=False,
+            db.upsert_category_stats(
+                [(category, transaction, sahibinden_count, database_count, diff, status)]
             )
             logger.info(
                 f"📊 Category stats kaydedildi: {category}/{transaction} - Sahibinden: {sahibinden_count}, DB: {database_count}, Fark: {diff}"
@@ -606,61 +644,27 @@ class SahibindenCrawler:
             if not db_data_list:
                 return 0, 0
 
-            # BATCH UPSERT - TEK QUERY İLE TÜM İLANLAR!
-            try:
-                # VALUES kısmını hazırla
-                values_list = []
-                params_list = []
-
-                for data in db_data_list:
-                    values_list.append(
-                        "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, NOW())"
-                    )
-                    params_list.extend(
-                        [
-                            data["id"],
-                            data["baslik"],
-                            data["link"],
-                            data["fiyat"],
-                            data["konum"],
-                            data["tarih"],
-                            data["resim"],
-                            data["category"],
-                            data["transaction"],
-                            data.get("ilce"),
-                            data.get("semt"),
-                            data.get("mahalle"),
-                        ]
-                    )
-
-                values_str = ", ".join(values_list)
-
-                batch_query = f"""
-                    INSERT INTO sahibinden_liste (id, baslik, link, fiyat, konum, tarih, resim, category, transaction, ilce, semt, mahalle, crawled_at)
-                    VALUES {values_str}
-                    ON CONFLICT (id) 
-                    DO UPDATE SET 
-                        baslik = EXCLUDED.baslik,
-                        link = EXCLUDED.link,
-                        fiyat = EXCLUDED.fiyat,
-                        konum = EXCLUDED.konum,
-                        tarih = EXCLUDED.tarih,
-                        resim = EXCLUDED.resim,
-                        category = EXCLUDED.category,
-                        transaction = EXCLUDED.transaction,
-                        ilce = EXCLUDED.ilce,
-                        semt = EXCLUDED.semt,
-                        mahalle = EXCLUDED.mahalle,
-                        crawled_at = NOW()
-                """
-
-                db.execute_query(batch_query, tuple(params_list), fetch=False)
-
-            except Exception as e:
-                logger.error(f"❌ Batch upsert hatası: {e}")
+            # BATCH UPSERT - tek query (VALUES) veya sayfalar arası COPY tamponu
+            rows = [tuple(data[c] for c in LISTING_COLUMNS) for data in db_data_list]
+            self._pending_stats_keys |= current_keys(
+                [data["id"] for data in db_data_list]
+            )
+            if self.listing_writer:
+                written = self.listing_writer.add(rows)
+            else:
+                written = upsert_listings_values(rows)
+                if written:
+                    self._refresh_neighborhood_stats(rows)
+            if not written:
+                # Sayaçlar, seen_ids ve new_listings yazılmamış ilanları saymasın
+                logger.error(f"❌ Batch upsert hatası: {len(rows)} ilan yazılamadı")
                 return 0, 0
 
             # Yeni vs güncellenen sayısını hesapla ve yeni ilanları new_listings'e kaydet
+            locations = {
+                data["id"]: (data["ilce"], data["semt"], data["mahalle"])
+                for data in db_data_list
+            }
             new_count = 0
             updated_count = 0
             new_listings_data = []
@@ -685,6 +689,9 @@ class SahibindenCrawler:
 
                 # Sadece gerçekten yeni ilanları (bugün veya dün) new_listings'e ekle
                 if is_new:
+                    ilce, semt, mahalle = locations.get(
+                        int(listing_id), (None, None, None)
+                    )
                     new_listing_data = {
                         "listing_id": int(listing_id),
                         "baslik": listing.get("baslik", "")[:255],
@@ -697,6 +704,9 @@ class SahibindenCrawler:
                         "first_seen_at": listing_date.isoformat()
                         if listing_date
                         else datetime.now().isoformat(),
+                        "ilce": ilce,
+                        "semt": semt,
+                        "mahalle": mahalle,
                     }
                     new_listings_data.append(new_listing_data)
                     logger.debug(
@@ -720,6 +730,9 @@ class SahibindenCrawler:
                                 nld["transaction"],
                                 nld["resim"],
                                 nld["first_seen_at"],
+                                nld["ilce"],
+                                nld["semt"],
+                                nld["mahalle"],
                             )
                         )
 
@@ -727,8 +740,8 @@ class SahibindenCrawler:
                     # NOT: id field'ı otomatik oluşturulur (SERIAL), manuel insert etmiyoruz
                     db.execute_batch(
                         """
-                        INSERT INTO new_listings (listing_id, baslik, link, fiyat, konum, category, transaction, resim, first_seen_at)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+                        INSERT INTO new_listings (listing_id, baslik, link, fiyat, konum, category, transaction, resim, first_seen_at, ilce, semt, mahalle)
+                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
                         ON CONFLICT (listing_id) DO UPDATE SET
                             baslik = EXCLUDED.baslik,
                             link = EXCLUDED.link,
@@ -737,7 +750,10 @@ class SahibindenCrawler:
                             category = EXCLUDED.category,
                             transaction = EXCLUDED.transaction,
                             resim = EXCLUDED.resim,
-                            first_seen_at = EXCLUDED.first_seen_at
+                            first_seen_at = EXCLUDED.first_seen_at,
+                            ilce = EXCLUDED.ilce,
+                            semt = EXCLUDED.semt,
+                            mahalle = EXCLUDED.mahalle
                         """,
                         values_list,
                     )
@@ -871,77 +887,28 @@ class SahibindenCrawler:
             logger.error(f"❌ Kayıt hatası: {e}")
             return False
 
-    def _get_chrome_options(self):
-        """Chrome ayarları - Normal WebDriver için optimize edilmiş"""
-
-        CHROME_PROFILE.mkdir(exist_ok=True)
-
-        # Gerçek kullanıcı gibi görünmek için güncel User-Agent
-        user_agent = (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
-        )
-
-        options = uc.ChromeOptions()
-
-        options.add_argument(f"user-agent={user_agent}")
-        options.add_argument(f"--window-size=1920,1080")
-        options.add_argument(f"--user-data-dir={CHROME_PROFILE}")
-        options.add_argument("--disable-blink-features=AutomationControlled")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--lang=tr-TR")
-
-        return options
-
-    def _clean_profile_dir(self):
-        if CHROME_PROFILE.exists():
-            try:
-                logger.info(f"🧹 Temizlik başlatılıyor: {CHROME_PROFILE}")
-                for i in range(3):
-                    try:
-                        shutil.rmtree(CHROME_PROFILE, ignore_errors=True)
-                        if not CHROME_PROFILE.exists():
-                            logger.info("✅ Profil dizini başarıyla temizlendi.")
-                            break
-                        time.sleep(1)
-                    except Exception as e:
-                        logger.warning(f"⚠️ Temizlik denemesi {i + 1} başarısız: {e}")
-                
-                CHROME_PROFILE.mkdir(parents=True, exist_ok=True)
-            except Exception as e:
-                logger.error(f"❌ Profil temizleme kritik hatası: {e}")
-
     def start_browser(self):
-        self._clean_profile_dir()
-        
-        logger.info("🚀 Chrome başlatılıyor (Temiz Oturum)...")
-
-        options = self._get_chrome_options()
-        
-        try:
-            self.driver = uc.Chrome(options=options)
-        except Exception as e:
-            logger.error(f"❌ Chrome başlatılamadı: {e}")
-            shutil.rmtree(CHROME_PROFILE, ignore_errors=True)
-            self.driver = uc.Chrome(options=options)
-
-        try:
-            self.driver.execute_cdp_cmd("Network.clearBrowserCache", {})
-            self.driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
-            logger.info("🛡️ Browser cache ve cookies temizlendi.")
-        except:
-            pass
-
-        self.driver.execute_script(
-            "Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"
-        )
+        """Chrome başlat; havuz varsa ısınmış bir oturum kirala"""
+        if self.browser_pool:
+            self.browser_session = self.browser_pool.acquire(timeout=BROWSER_LEASE_TIMEOUT)
+            self.driver = self.browser_session.driver
+            logger.info(
+                f"🧊 Havuz oturumu {self.browser_session.slot} kiralandı "
+                f"({self.browser_session.pages} sayfa, {self.browser_session.leases}. kiralama)"
+            )
+            return
 
-        logger.info("✅ Chrome hazır!")
+        self.driver = launch_chrome(self.profile_dir)
 
+    def close_browser(self, broken: bool = False):
+        """Browser'ı kapat (havuz oturumuysa havuza geri ver)"""
+        if self.browser_session:
+            session, self.browser_session = self.browser_session, None
+            self.driver = None
+            self.browser_pool.release(session, broken=broken)
+            logger.info(f"🧊 Havuz oturumu {session.slot} bırakıldı ({session.pages} sayfa)")
+            return
 
-    def close_browser(self):
-        """Browser'ı kapat"""
         if self.driver:
             try:
                 logger.info("🔒 Chrome kapatılıyor...")
@@ -972,33 +939,30 @@ class SahibindenCrawler:
 
     def _wait_for_cloudflare(self, timeout: int = 10) -> bool:
         """Cloudflare bekle - ULTRA HIZ (timeout: 30 -> 10)"""
-        start = time.time()
-
-        while time.time() - start < timeout:
-            try:
-                ps = self.driver.page_source.lower()
-
-                # İçerik kontrolü - hemen dön
-                if "searchresultstable" in ps or "classifieddetailtitle" in ps:
-                    return True
-
-                # 403 kontrolü
-                if "access denied" in ps or "403 forbidden" in ps:
-                    return False
-
-                # Çok kısa bekleme
-                time.sleep(0.3)  # 0.5s -> 0.3s
-
-            except:
-                time.sleep(0.3)
-
-        return False  # Timeout - yine de devam et
+        # İçerik / 403 kontrolü JS probe ile (her yoklamada page_source yok)
+        return self._wait_until_ready(timeout) == "ready"
+
+    def _page_source(self) -> str:
+        """driver.page_source (tam DOM serileştirmesi) - bayt ve süre sayılır"""
+        start = time.perf_counter()
+        html = self.driver.page_source
+        elapsed = time.perf_counter() - start
+
+        # Karakter değil UTF-8 bayt (Türkçe karakterler 2 bayt)
+        size = len(html.encode("utf-8"))
+        fetch = self.stats["page_source"]
+        fetch["fetches"] += 1
+        fetch["bytes"] += size
+        fetch["seconds"] = round(fetch["seconds"] + elapsed, 3)
+        logger.debug(f"📦 page_source: {size / 1024:.0f} KB, {elapsed * 1000:.0f} ms")
+        return html
 
     def _handle_devam_et(self) -> bool:
         """'Devam Et' butonunu hızlıca tıkla"""
         try:
-            ps = self.driver.page_source.lower()
-            if "devam et" in ps or "btn-continue" in ps:
+            if self.driver.execute_script(
+                "return !!document.getElementById('btn-continue')"
+            ):
                 btn = WebDriverWait(self.driver, 5).until(  # 10s -> 5s
                     EC.element_to_be_clickable((By.ID, "btn-continue"))
                 )
@@ -1009,6 +973,104 @@ class SahibindenCrawler:
             pass
         return False
 
+    def _probe_page_state(self) -> str:
+        """Sayfa durumu: ready / challenge / blocked / loading (READY_PROBE_JS)"""
+        try:
+            return self.driver.execute_script(READY_PROBE_JS) or "loading"
+        except Exception:
+            return "loading"
+
+    def _wait_until_ready(self, timeout: float) -> str:
+        """
+        Sonuç satırları / data-totalmatches (veya detay başlığı, kategori
+        listesi) görünene kadar kısa aralıklarla yokla. Challenge ve 403
+        hemen döner; süre dolarsa "timeout".
+        """
+        deadline = time.time() + timeout
+        while True:
+            state = self._probe_page_state()
+            if state != "loading":
+                return state
+            if time.time() >= deadline:
+                return "timeout"
+            time.sleep(READY_POLL_INTERVAL)
+
+    def _wait_for_manual_challenge(self, limit: int = 300) -> str:
+        """Cloudflare/Bot challenge: tarayıcıda manuel geçiş için bekle (max 5 dk)"""
+        logger.warning("⚠️ Cloudflare/Bot challenge tespit edildi!")
+        logger.warning(
+            "👤 MANUEL DOĞRULAMA GEREKLİ - Lütfen tarayıcıda doğrulamayı geçin..."
+        )
+
+        challenge_start = time.time()
+        last_reminder = 0
+        while time.time() - challenge_start < limit:
+            state = self._wait_until_ready(1.0)
+
+            if state == "ready":
+                logger.info("✅ Manuel doğrulama geçildi, devam ediliyor!")
+                return state
+
+            if state == "blocked":
+                logger.error("❌ 403 - Erişim engellendi")
+                self.rate_limiter.report_blocked()
+                self.stats["blocks_detected"] += 1
+                # 403 durumunda bile devam et (sen manuel geçebilirsin)
+                logger.warning("⏳ 30 saniye bekleniyor, sonra devam edilecek...")
+                time.sleep(30)
+                return self._probe_page_state()
+
+            # Her 10 saniyede bir hatırlat
+            elapsed = int(time.time() - challenge_start)
+            if elapsed - last_reminder >= 10:
+                last_reminder = elapsed
+                logger.info(f"⏳ Manuel doğrulama bekleniyor... ({elapsed}s / {limit}s)")
+
+        # Timeout olsa bile devam et
+        logger.warning("⚠️ Manuel doğrulama timeout - yine de devam ediliyor")
+        return "timeout"
+
+    def _legacy_ready_wait(self, timeout: int):
+        """CRAWLER_READY_MODE=sleep: sabit 3-3.8 sn bekleme + içerik yoklama"""
+        # Varyasyonlu bekleme (3, 3.25, 3.10, 3.5 saniye gibi)
+        wait_times = [3.0, 3.25, 3.10, 3.5, 3.15, 3.8, 3.3, 3.6]
+        time.sleep(random.choice(wait_times))
+
+        # Sayfa başlığını kontrol et
+        try:
+            page_title = self.driver.title
+            logger.info(f"📄 Sayfa başlığı: {page_title[:100]}")
+        except:
+            logger.warning("⚠️ Sayfa başlığı okunamadı")
+
+        # Cloudflare challenge kontrolü - MANUEL GEÇİŞ İÇİN BEKLEME
+        if self._probe_page_state() == "challenge":
+            self.stats["time_to_ready"]["challenges"] += 1
+            self._wait_for_manual_challenge()
+
+        # Normal sayfa yükleme kontrolü
+        logger.info("⏳ Sayfa içeriği kontrol ediliyor...")
+        if not self._wait_for_cloudflare(timeout):
+            logger.warning("⚠️ Sayfa yüklenemedi ama devam ediliyor...")
+            # Block bildir ama None dönme, devam et
+            self.rate_limiter.report_blocked()
+            self.stats["blocks_detected"] += 1
+
+    def _record_ready(self, seconds: float, timed_out: bool = False):
+        """Sayfa hazır olma süresini stats["time_to_ready"]'e işle"""
+        ready = self.stats["time_to_ready"]
+        if timed_out:
+            ready["timeouts"] += 1
+            return
+        samples = self._ready_samples
+        samples.append(seconds)
+        ordered = sorted(samples)
+        ready["pages"] = len(samples)
+        ready["avg"] = round(sum(samples) / len(samples), 3)
+        ready["p50"] = round(ordered[len(ordered) // 2], 3)
+        ready["p95"] = round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3)
+        ready["max"] = round(ordered[-1], 3)
+
     def navigate(self, url: str, timeout: int = 5) -> Optional[str]:
         """Sayfaya git - Rate limiter ile + Cloudflare bypass"""
         logger.info(f"🌐 {url[:5]}...")
@@ -1018,83 +1080,34 @@ class SahibindenCrawler:
         wait_time = self.rate_limiter.wait()
 
         start_time = time.time()
+        if self.browser_session:
+            self.browser_session.pages += 1
 
         try:
             logger.info(f"⏳ Sayfaya gidiliyor... (driver.get)")
             self.driver.get(url)
             logger.info(f"✓ driver.get() tamamlandı ({time.time() - start_time:.1f}s)")
 
-            # Varyasyonlu bekleme (3, 3.25, 3.10, 3.5 saniye gibi)
-            wait_times = [3.0, 3.25, 3.10, 3.5, 3.15, 3.8, 3.3, 3.6]
-            wait_time = random.choice(wait_times)
-            time.sleep(wait_time)
-
-            # Sayfa başlığını kontrol et
-            try:
-                page_title = self.driver.title
-                logger.info(f"📄 Sayfa başlığı: {page_title[:100]}")
-            except:
-                logger.warning("⚠️ Sayfa başlığı okunamadı")
-
-            # Cloudflare challenge kontrolü - MANUEL GEÇİŞ İÇİN BEKLEME
-            page_source = self.driver.page_source.lower()
-
-            if (
-                "checking your browser" in page_source
-                or "just a moment" in page_source
-                or "olağan dışı" in page_source
-            ):
-                logger.warning("⚠️ Cloudflare/Bot challenge tespit edildi!")
-                logger.warning(
-                    "👤 MANUEL DOĞRULAMA GEREKLİ - Lütfen tarayıcıda doğrulamayı geçin..."
-                )
-
-                # Manuel geçiş için bekle (max 5 dakika)
-                challenge_start = time.time()
-                while time.time() - challenge_start < 300:  # 5 dakika
-                    time.sleep(2)
-                    page_source = self.driver.page_source.lower()
-
-                    if (
-                        "searchresultstable" in page_source
-                        or "classifieddetailtitle" in page_source
-                    ):
-                        logger.info("✅ Manuel doğrulama geçildi, devam ediliyor!")
-                        break
+            if READY_MODE == "sleep":
+                self._legacy_ready_wait(timeout)
+            else:
+                state = self._wait_until_ready(timeout)
+                ready_seconds = time.time() - start_time
 
-                    if "access denied" in page_source or "403" in page_source:
-                        logger.error("❌ 403 - Erişim engellendi")
-                        self.rate_limiter.report_blocked()
-                        self.stats["blocks_detected"] += 1
-                        # 403 durumunda bile devam et (sen manuel geçebilirsin)
-                        logger.warning(
-                            "⏳ 30 saniye bekleniyor, sonra devam edilecek..."
-                        )
-                        time.sleep(30)
-                        break
+                if state == "challenge":
+                    self.stats["time_to_ready"]["challenges"] += 1
+                    state = self._wait_for_manual_challenge()
+                    ready_seconds = time.time() - start_time
 
-                    # Her 10 saniyede bir hatırlat
-                    if int(time.time() - challenge_start) % 10 == 0:
-                        elapsed = int(time.time() - challenge_start)
-                        logger.info(
-                            f"⏳ Manuel doğrulama bekleniyor... ({elapsed}s / 300s)"
-                        )
+                if state == "ready":
+                    self._record_ready(ready_seconds)
+                    logger.info(f"✓ Sayfa hazır ({ready_seconds:.2f}s)")
                 else:
-                    # Timeout olsa bile devam et
-                    logger.warning(
-                        "⚠️ Manuel doğrulama timeout - yine de devam ediliyor"
-                    )
-                    pass
-
-            # Normal sayfa yükleme kontrolü
-            logger.info("⏳ Sayfa içeriği kontrol ediliyor...")
-            if not self._wait_for_cloudflare(timeout):
-                logger.warning("⚠️ Sayfa yüklenemedi ama devam ediliyor...")
-                # Block bildir ama None dönme, devam et
-                self.rate_limiter.report_blocked()
-                self.stats["blocks_detected"] += 1
-                # return None yerine boş sayfa dön, sonraki sayfaya geç
-                pass
+                    self._record_ready(ready_seconds, timed_out=True)
+                    logger.warning(f"⚠️ Sayfa hazır değil ({state}) ama devam ediliyor...")
+                    # Block bildir ama None dönme, devam et
+                    self.rate_limiter.report_blocked()
+                    self.stats["blocks_detected"] += 1
 
             # Başarılı - rate limiter'a bildir
             response_time = time.time() - start_time
@@ -1110,7 +1123,15 @@ class SahibindenCrawler:
             # Tek scroll yeterli
             self._human_like_scroll()
 
-            return self.driver.page_source
+            # Belge navigasyon başına bir kez çekilir, aynı string parse edilir
+            html = self._page_source()
+            self.stats["page_source"]["pages"] += 1
+            head = html[:CHALLENGE_SCAN_CHARS].lower()
+            if any(marker in head for marker in CHALLENGE_MARKERS):
+                logger.warning("⚠️ Dönen sayfa challenge sayfası")
+                self.rate_limiter.report_blocked()
+                self.stats["blocks_detected"] += 1
+            return html
 
         except Exception as e:
             logger.error(f"❌ Navigate hatası: {e}")
@@ -1122,55 +1143,8 @@ class SahibindenCrawler:
             return None
 
     def extract_listings(self, html: str) -> List[Dict]:
-        """HTML'den ilan listesini çıkar"""
-        soup = BeautifulSoup(html, "html.parser")
-        listings = []
-
-        rows = soup.select("#searchResultsTable tbody tr.searchResultsItem")
-
-        for row in rows:
-            try:
-                listing = {}
-                listing["id"] = row.get("data-id", "")
-
-                title_el = row.select_one("a.classifiedTitle")
-                if title_el:
-                    listing["baslik"] = title_el.get("title", "").strip()
-                    href = title_el.get("href", "")
-                    if href and href != "#":
-                        listing["link"] = (
-                            f"https://www.sahibinden.com{href}"
-                            if href.startswith("/")
-                            else href
-                        )
-                    elif listing["id"]:
-                        listing["link"] = (
-                            f"https://www.sahibinden.com/ilan/{listing['id']}"
-                        )
-
-                price_el = row.select_one("td.searchResultsPriceValue span")
-                if price_el:
-                    listing["fiyat"] = price_el.get_text(strip=True)
-
-                loc_el = row.select_one("td.searchResultsLocationValue")
-                if loc_el:
-                    listing["konum"] = " ".join(loc_el.get_text(strip=True).split())
-
-                date_el = row.select_one("td.searchResultsDateValue span")
-                if date_el:
-                    listing["tarih"] = date_el.get_text(strip=True)
-
-                img_el = row.select_one("td.searchResultsLargeThumbnail img")
-                if img_el:
-                    listing["resim"] = img_el.get("src", "")
-
-                if listing.get("id") and listing.get("link"):
-                    listings.append(listing)
-
-            except:
-                continue
-
-        return listings
+        """HTML'den ilan listesini çıkar (backend: listing_parser)"""
+        return self.listing_parser.parse(html)
 
     def extract_total_count(self, html: str) -> Optional[int]:
         """
@@ -1318,30 +1292,19 @@ class SahibindenCrawler:
     ) -> Dict:
         try:
             comparison = {}
-            district_norm = normalize_district(district)
-
-            for category, sahibinden_count in sahibinden_counts.items():
-                sql = (
-                    "SELECT COUNT(*) as count FROM sahibinden_liste WHERE category = %s"
-                )
-                params = [category]
-
-                if district_norm:
-                    sql += " AND ilce = %s"
-                    params.append(district_norm)
 
-                result = db.execute_one(sql, tuple(params))
+            # Tüm sayılar tek sorguda: (category, transaction) -> count
+            db_counts = self._load_category_counts(district)
+            category_totals = {}
+            for (category, _), count in db_counts.items():
+                category_totals[category] = category_totals.get(category, 0) + count
 
-                db_count = result["count"] if result else 0
+            for category, sahibinden_count in sahibinden_counts.items():
+                db_count = category_totals.get(category, 0)
                 diff = sahibinden_count - db_count
 
                 # Status belirleme
-                if diff > 0:
-                    status = "new"  # Yeni ilanlar var
-                elif diff < 0:
-                    status = "removed"  # İlanlar kaldırılmış
-                else:
-                    status = "synced"  # Senkron
+                status = diff_status(diff)
 
                 comparison[category] = {
                     "sahibinden": sahibinden_count,
@@ -1430,6 +1393,8 @@ class SahibindenCrawler:
         category_crawled_ids = set()
 
         while page < actual_max_pages:
+            # Eksik kategoride sync çalışmasın diye döngüden çıkmak yerine hata
+            self.check_stop()
             page_url = url if page == 0 else f"{url}&pagingOffset={page * 50}"
             logger.info(f"\n📄 Sayfa {page + 1} taranıyor...")
 
@@ -1639,6 +1604,12 @@ class SahibindenCrawler:
 
             page += 1
 
+        # Tamponda kalan ilanları yaz (removed tespiti DB'yi okuduğu için önce)
+        self.flush_listings()
+
+        # Bu kategorinin önbellekteki DB sayısı artık güncel değil
+        self._stale_category_counts.add((category, transaction))
+
         # Kategori tamamlandı - Kaldırılan ilanları tespit et
         if sync:
             logger.info(f"\n🗑️ Sync Modu: Kaldırılan ilanları tespit ediyor...")
@@ -1685,164 +1656,130 @@ class SahibindenCrawler:
         )
         return saved_count
 
+    def check_stop(self):
+        """İptal istendiyse veya süre dolduysa CrawlStopped fırlat"""
+        if self.stop_event is not None and self.stop_event.is_set():
+            raise CrawlStopped("Crawler kullanıcı tarafından durduruldu")
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            raise CrawlStopped("Zaman aşımı: job süre sınırını aştı")
+
+    def close_log_sink(self):
+        """Kuyrukta bekleyen log'ları yaz ve yazıcı thread'i durdur"""
+        if self.log_sink:
+            self.log_sink.close()
+
+    def _refresh_neighborhood_stats(self, rows):
+        """Yazılan satırların eski ve yeni mahalle özetlerini (harita) güncelle"""
+        keys = self._pending_stats_keys | keys_from_rows(rows)
+        self._pending_stats_keys = set()
+        refresh_neighborhood_stats(keys)
+
+    def flush_listings(self) -> bool:
+        """Toplu yazma tamponunu veritabanına boşalt"""
+        if not self.listing_writer:
+            return True
+        return self.listing_writer.flush()
+
     def detect_and_save_removed_listings(
         self, category: str, transaction: str, current_ids: set, district: str = None
     ) -> int:
-        try:
-            district_norm = normalize_district(district)
+        """
+        DB'de olup crawl'da görülmeyen ilanları removed_listings'e taşı.
 
-            sql = "SELECT id, baslik, link, fiyat, konum, category, transaction, resim, tarih, ilce, semt, mahalle FROM sahibinden_liste WHERE category = %s AND transaction = %s"
+        Tamamı PostgreSQL içinde, tek ifadede (tek transaction) çalışır:
+        crawl edilen id'ler bir kez dizi olarak gönderilir, anti-join ile
+        bulunan ilanlar sahibinden_liste'den silinip removed_listings'e yazılır.
+        Tablo Python belleğine hiç taşınmaz.
+        """
+        if not current_ids:
+            # Boş crawl büyük ihtimalle hata: tüm kategoriyi silme
+            logger.warning(
+                f"   ⚠️ {category}/{transaction}: Crawl edilen ilan yok, kaldırma tespiti atlandı"
+            )
+            return 0
 
-            params = [category, transaction]
+        try:
+            district_norm = normalize_district(district)
+            district_filter = "AND s.ilce = %s" if district_norm else ""
 
+            params = [[int(lid) for lid in current_ids], category, transaction]
             if district_norm:
-                sql += " AND ilce = %s"
                 params.append(district_norm)
 
-            results = db.execute_query(sql, tuple(params))
-            db_listings = {str(r["id"]): r for r in results}
+            listing_date = listing_date_sql("g.tarih")
 
-            db_ids = set(db_listings.keys())
+            result = db.execute_returning(
+                f"""
+                WITH crawled AS (
+                    SELECT DISTINCT unnest(%s::bigint[]) AS id
+                ),
+                gone AS (
+                    DELETE FROM sahibinden_liste s
+                    WHERE s.category = %s AND s.transaction = %s
+                      {district_filter}
+                      AND NOT EXISTS (SELECT 1 FROM crawled c WHERE c.id = s.id)
+                    RETURNING s.id, s.baslik, s.link, s.fiyat, s.konum, s.category,
+                              s.transaction, s.resim, s.tarih, s.ilce, s.semt, s.mahalle
+                ),
+                archived AS (
+                    INSERT INTO removed_listings
+                    (listing_id, baslik, link, fiyat, konum, category, transaction, resim,
+                     last_seen_at, removed_at, removal_reason, days_active, price_changes, last_price, ilce, semt, mahalle)
+                    SELECT
+                        g.id,
+                        left(COALESCE(g.baslik, ''), 255),
+                        left(COALESCE(g.link, ''), 500),
+                        g.fiyat,
+                        left(COALESCE(g.konum, ''), 255),
+                        g.category,
+                        g.transaction,
+                        left(COALESCE(g.resim, ''), 500),
+                        COALESCE({listing_date}, NOW()),
+                        NOW(),
+                        'not_found_in_crawl',
+                        (CURRENT_DATE - ({listing_date})::date),
+                        0,
+                        g.fiyat,
+                        g.ilce,
+                        g.semt,
+                        g.mahalle
+                    FROM gone g
+                    ON CONFLICT (listing_id) DO UPDATE SET
+                        removed_at = NOW(),
+                        removal_reason = EXCLUDED.removal_reason
+                    RETURNING 1
+                )
+                SELECT
+                    (SELECT COUNT(*) FROM gone) AS removed,
+                    (SELECT COUNT(*) FROM archived) AS archived,
+                    (SELECT json_agg(DISTINCT jsonb_build_array(
+                        COALESCE(g.ilce, ''), {mahalle_key_sql("g.konum")},
+                        COALESCE(g.category, ''), COALESCE(g.transaction, '')))
+                     FROM gone g) AS stats_keys
+                """,
+                tuple(params),
+            )
 
-            # Kaldırılan ilanları bul (DB'de var ama crawl'da yok)
-            removed_ids = db_ids - current_ids
+            if result is None:
+                logger.error(
+                    f"❌ Kaldırılan ilan tespiti başarısız: {category}/{transaction}"
+                )
+                return 0
 
-            if not removed_ids:
+            removed_count = result[0]["removed"]
+            if not removed_count:
                 logger.info(f"   ✅ {category}/{transaction}: Kaldırılan ilan yok")
                 return 0
 
+            refresh_neighborhood_stats(result[0]["stats_keys"] or [])
+
             logger.info(
-                f"   📤 {category}/{transaction}: {len(removed_ids)} ilan kaldırılmış tespit edildi"
+                f"   ✅ {removed_count} ilan yayından kaldırıldı (Arşive taşındı)"
+            )
+            self._add_log(
+                "info",
+                f"{category}/{transaction}: {removed_count} ilan arşivlendi ve silindi",
             )
-
-            # ❌ SORUN: Her ilan için tek tek price_history sorgusu (389 sorgu!)
-            # ÇÖZÜM: Batch sorgu yap
-
-            # Önce tüm listing_id'leri topla
-            listing_ids = [int(lid) for lid in removed_ids]
-
-            # price_history tablosu yok, price_changes her zaman 0
-            price_history_map = {}
-
-            # Batch listeleri
-            removed_listings_batch = []
-            removed_ids_list = []
-
-            # Kaldırılan ilanları removed_listings tablosuna kaydet
-            removed_count = 0
-            for listing_id in removed_ids:
-                listing = db_listings[listing_id]
-
-                # İlanın ne kadar süre aktif kaldığını hesapla
-                days_active = None
-                if listing.get("tarih"):
-                    try:
-                        created_date = datetime.fromisoformat(str(listing["tarih"]))
-                        days_active = (datetime.now() - created_date).days
-                    except:
-                        pass
-
-                # Fiyat geçmişini batch sorgudan al
-                price_changes = price_history_map.get(listing_id, 0)
-
-                # removed_listings tablosuna kaydet
-                # last_seen_at için tarih string'ini parse et veya now() kullan
-                parsed_date = parse_listing_date(listing.get("tarih", ""))
-                last_seen_iso = (
-                    parsed_date.isoformat()
-                    if parsed_date
-                    else datetime.now().isoformat()
-                )
-
-                removed_data = {
-                    "listing_id": int(listing_id),
-                    "baslik": listing.get("baslik", "")[:255],
-                    "link": listing.get("link", "")[:500],
-                    "fiyat": listing.get("fiyat"),
-                    "konum": listing.get("konum", "")[:255],
-                    "category": category,
-                    "transaction": transaction,
-                    "resim": listing.get("resim", "")[:500],
-                    "last_seen_at": last_seen_iso,
-                    "removed_at": datetime.now().isoformat(),
-                    "removal_reason": "not_found_in_crawl",
-                    "days_active": days_active,
-                    "price_changes": price_changes,
-                    "last_price": listing.get("fiyat"),
-                    "ilce": listing.get("ilce"),
-                    "semt": listing.get("semt"),
-                    "mahalle": listing.get("mahalle"),
-                }
-
-                removed_listings_batch.append(removed_data)
-                removed_ids_list.append(listing_id)
-
-            # BATCH INSERT: removed_listings tablosuna toplu kaydet
-            if removed_listings_batch:
-                try:
-                    values_list = []
-                    for data in removed_listings_batch:
-                        values_list.append(
-                            (
-                                data["listing_id"],
-                                data["baslik"],
-                                data["link"],
-                                data["fiyat"],
-                                data["konum"],
-                                data["category"],
-                                data["transaction"],
-                                data["resim"],
-                                data["last_seen_at"],
-                                data["removal_reason"],
-                                data["days_active"],
-                                data["price_changes"],
-                                data["last_price"],
-                                data.get("ilce"),
-                                data.get("semt"),
-                                data.get("mahalle"),
-                            )
-                        )
-
-                    db.execute_batch(
-                        """
-                        INSERT INTO removed_listings 
-                        (listing_id, baslik, link, fiyat, konum, category, transaction, resim, 
-                         last_seen_at, removed_at, removal_reason, days_active, price_changes, last_price, ilce, semt, mahalle) 
-                        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, NOW(), %s, %s, %s, %s, %s, %s, %s) 
-                        ON CONFLICT (listing_id) DO UPDATE SET
-                            removed_at = NOW(),
-                            removal_reason = EXCLUDED.removal_reason
-                        """,
-                        values_list,
-                    )
-
-                    logger.info(
-                        f"   ✅ {len(removed_listings_batch)} kaldırılan ilan removed_listings tablosuna kaydedildi"
-                    )
-                except Exception as e:
-                    logger.error(f"❌ Batch insert hatası (removed_listings): {e}")
-
-            # BATCH DELETE: Ana tablodan toplu sil
-            if removed_ids_list:
-                try:
-                    # String ID'leri integer'a çevir
-                    int_ids = [int(lid) for lid in removed_ids_list]
-                    db.execute_query(
-                        "DELETE FROM sahibinden_liste WHERE id = ANY(%s)",
-                        (int_ids,),
-                        fetch=False,
-                    )
-                    removed_count = len(removed_ids_list)
-                    logger.info(
-                        f"   ✅ {removed_count} ilan yayından kaldırıldı (Arşive taşındı)"
-                    )
-                    self._add_log(
-                        "info",
-                        f"{category}/{transaction}: {removed_count} ilan arşivlendi ve silindi",
-                    )
-                except Exception as e:
-                    logger.error(f"❌ Batch delete hatası (sahibinden_liste): {e}")
-
             return removed_count
 
         except Exception as e:
@@ -1878,30 +1815,22 @@ class SahibindenCrawler:
                         sahibinden_counts, district=district
                     )
 
-                    # Sahibinden sayılarını category_stats tablosuna kaydet
+                    # Kategori toplamlarını category_stats'a tek batch'te yaz
+                    # (ana sayfa sayıları işlem tipine ayrılmadığı için transaction='all')
                     try:
-                        category_stats_data = {
-                            "konut_satilik": sahibinden_counts.get("konut", 0),
-                            "konut_kiralik": 0,  # Şu an sadece satılık taranıyor
-                            "arsa_satilik": sahibinden_counts.get("arsa", 0),
-                            "isyeri_satilik": sahibinden_counts.get("isyeri", 0),
-                            "isyeri_kiralik": 0,  # Şu an sadece satılık taranıyor
-                            "bina_satilik": sahibinden_counts.get("bina", 0),
-                            "job_id": self.job_id,
-                            "created_at": datetime.now().isoformat(),
-                        }
-                        db.execute_query(
-                            """
-                            INSERT INTO category_stats (category, transaction, sahibinden_count, database_count, diff, status, last_checked_at)
-                            VALUES ('all', 'all', 0, 0, 0, 'legacy', NOW())
-                            """,
-                            fetch=False,
+                        db.upsert_category_stats(
+                            [
+                                (
+                                    category,
+                                    "all",
+                                    c["sahibinden"],
+                                    c["database"],
+                                    c["diff"],
+                                    c["status"],
+                                )
+                                for category, c in comparison.items()
+                            ]
                         )
-                        # Actually wait, this table has different columns in this specific call?
-                        # Let's adjust to match the likely schema or just use execute_query for what it wants.
-                        # The code above was using: konut_satilik, arsa_satilik etc.
-                        # I'll just skip this specific legacy logging or adapt it.
-                        # Actually I'll use a more generic SQL insert if the table supports it.
                         logger.info(
                             "✅ Kategori istatistikleri category_stats tablosuna kaydedildi"
                         )
@@ -1977,10 +1906,18 @@ class SahibindenCrawler:
             raise
 
         finally:
+            # Kesintide tamponda kalan ilanlar kaybolmasın
+            self.flush_listings()
             self.close_browser()
 
         self.stats["completed_at"] = datetime.now().isoformat()
 
+        # Günlük fiyat özeti: job'un başladığı günden bugüne (eski günler sabit)
+        if db.refresh_price_rollup(
+            since=datetime.fromisoformat(self.stats["started_at"])
+        ):
+            logger.info("📈 Günlük fiyat özeti güncellendi")
+
         # Final stats
         logger.info("\n" + "=" * 60)
         logger.info("📊 ÖZET")
@@ -1991,6 +1928,19 @@ class SahibindenCrawler:
         logger.info(f"   Kaldırılan: {self.stats['removed_listings']}")
         logger.info(f"   Toplam sayfa: {self.stats['total_pages']}")
         logger.info(f"   Block algılanan: {self.stats['blocks_detected']}")
+        fetch = self.stats["page_source"]
+        if fetch["pages"]:
+            logger.info(
+                f"   page_source: {fetch['fetches'] / fetch['pages']:.1f}/sayfa, "
+                f"ort {fetch['bytes'] / fetch['fetches'] / 1024:.0f} KB, "
+                f"{fetch['seconds'] / fetch['fetches'] * 1000:.0f} ms"
+            )
+        ready = self.stats["time_to_ready"]
+        if ready["pages"]:
+            logger.info(
+                f"   Sayfa hazır olma: ort {ready['avg']}s, p95 {ready['p95']}s "
+                f"({ready['mode']}, {ready['timeouts']} zaman aşımı)"
+            )
 
         # SMART CRAWLER stats
         if self.stats["smart_stops"] > 0:
@@ -2007,10 +1957,120 @@ class SahibindenCrawler:
             "Crawler tamamlandı",
             self.stats,
         )
+        self.flush_job_progress()
 
         return self.stats
 
 
+def run_crawl_job(
+    categories: List[str],
+    district: str = "hendek",
+    max_pages: int = 100,
+    job_id: Optional[str] = None,
+    force: bool = False,
+    reverse_sort: bool = False,
+    sync: bool = False,
+    turbo: bool = False,
+    flush_size: int = DEFAULT_FLUSH_SIZE,
+    browser_pool=None,
+    stop_event: Optional[threading.Event] = None,
+    timeout: Optional[float] = None,
+) -> dict:
+    """
+    Kategorileri sırayla tara, API'nin beklediği sonuç sözlüğünü döndür.
+    CLI (__main__) ve admin panelinin havuzlu in-process job'ları ortak kullanır.
+
+    stop_event set edilirse veya timeout (sn) dolarsa bir sonraki sayfadan
+    önce CrawlStopped fırlatılır (sync atlanır, tampon yine yazılır).
+    """
+    crawler = SahibindenCrawler(
+        job_id=job_id, flush_size=flush_size, browser_pool=browser_pool
+    )
+    crawler.stop_event = stop_event
+    if timeout:
+        crawler.deadline = time.monotonic() + timeout
+
+    broken = False
+    try:
+        # Browser'ı başlat (havuz varsa ısınmış oturum kiralanır). try içinde:
+        # kiralama / Chrome açılışı başarısız olsa da log sink'i kapatılsın
+        crawler.start_browser()
+
+        # Çoklu kategori desteği
+        total_saved = 0
+
+        for category_key in categories:
+            # İlçeye göre kategori config oluştur
+            try:
+                category_config = get_category_url(category_key, district)
+                logger.info(f"📍 İlçe: {district.upper()}")
+            except ValueError as e:
+                logger.warning(f"⚠️ {e}, atlanıyor...")
+                continue
+
+            # Kategoriyi crawl et
+            saved = crawler.crawl_category(
+                category_key,
+                category_config,
+                max_pages=max_pages,
+                force=force,
+                reverse_sort=reverse_sort,
+                sync=sync,
+                turbo=turbo,
+            )
+            total_saved += saved
+
+            # Tamamlanan kategorileri kaydet
+            crawler.stats["categories_completed"].append(category_key)
+
+            # Kategoriler arası bekleme (sadece başka kategori varsa)
+            remaining = [
+                k for k in categories if k not in crawler.stats["categories_completed"]
+            ]
+            if remaining:
+                logger.info(
+                    f"⏳ Sonraki kategori için {CATEGORY_DELAY} saniye bekleniyor... (Kalan: {len(remaining)})"
+                )
+                time.sleep(CATEGORY_DELAY)
+            else:
+                logger.info(
+                    f"✅ Tüm kategoriler tamamlandı ({len(categories)} kategori)"
+                )
+
+        return {
+            "success": True,
+            "total_listings": crawler.stats["total_listings"],
+            "new_listings": crawler.stats["new_listings"],
+            "removed_listings": crawler.stats["removed_listings"],
+            "duplicates": crawler.stats["duplicates_skipped"],
+            "pages_crawled": crawler.stats["total_pages"],
+            "time_to_ready": crawler.stats["time_to_ready"],
+            "page_source": crawler.stats["page_source"],
+            "categories": categories,
+            "categories_completed": crawler.stats["categories_completed"],
+            "job_id": job_id,
+            "message": f"{crawler.stats['total_pages']} sayfa tarandı, {crawler.stats['total_listings']} ilan bulundu, {crawler.stats['removed_listings']} ilan kaldırıldı",
+        }
+
+    except CrawlStopped:
+        # Sayfalar arasında durdu: oturum sağlam, havuza geri verilir
+        raise
+
+    except BaseException:
+        # Hata sonrası oturum havuza sağlam diye geri verilmez
+        broken = True
+        raise
+
+    finally:
+        # Tamponda kalan ilanları yaz, browser'ı her durumda kapat / havuza ver
+        crawler.flush_listings()
+        logger.info("🔒 Chrome kapatılıyor...")
+        crawler.close_browser(broken=broken)
+        logger.info("✅ Chrome kapatıldı")
+        crawler.flush_job_progress()
+        crawler.close_log_sink()
+
+
 # ============================================================================
 # MAIN - API için argparse desteği
 # ============================================================================
@@ -2054,89 +2114,32 @@ if __name__ == "__main__":
     parser.add_argument(
         "--turbo", action="store_true", help="Enable Turbo Mode (minimal delays)"
     )
+    parser.add_argument(
+        "--flush-size",
+        type=int,
+        default=DEFAULT_FLUSH_SIZE,
+        help="COPY ile toplu yazma eşiği (satır). 0 = her sayfa anında yazılır",
+    )
 
     args = parser.parse_args()
 
     try:
-        # Crawler oluştur
-        crawler = SahibindenCrawler(job_id=args.job_id)
-
-        # Browser'ı başlat
-        crawler.start_browser()
-
-        try:
-            # Çoklu kategori desteği
-            total_saved = 0
-
-            for category_key in args.categories:
-                # İlçeye göre kategori config oluştur
-                try:
-                    category_config = get_category_url(category_key, args.district)
-                    logger.info(f"📍 İlçe: {args.district.upper()}")
-                except ValueError as e:
-                    logger.warning(f"⚠️ {e}, atlanıyor...")
-                    continue
-
-                # Kategoriyi crawl et
-                saved = crawler.crawl_category(
-                    category_key,
-                    category_config,
-                    max_pages=args.max_pages,
-                    force=args.force,
-                    reverse_sort=args.reverse_sort,
-                    sync=args.sync,
-                    turbo=args.turbo,
-                )
-                total_saved += saved
-
-                # Tamamlanan kategorileri kaydet
-                crawler.stats["categories_completed"].append(category_key)
-
-                # Kategoriler arası bekleme (sadece başka kategori varsa)
-                remaining = [
-                    k
-                    for k in args.categories
-                    if k not in crawler.stats["categories_completed"]
-                ]
-                if remaining:
-                    logger.info(
-                        f"⏳ Sonraki kategori için {CATEGORY_DELAY} saniye bekleniyor... (Kalan: {len(remaining)})"
-                    )
-                    time.sleep(CATEGORY_DELAY)
-                else:
-                    logger.info(
-                        f"✅ Tüm kategoriler tamamlandı ({len(args.categories)} kategori)"
-                    )
-
-            # JSON output (API için)
-            result = {
-                "success": True,
-                "total_listings": crawler.stats["total_listings"],
-                "new_listings": crawler.stats["new_listings"],
-                "removed_listings": crawler.stats["removed_listings"],
-                "duplicates": crawler.stats["duplicates_skipped"],
-                "pages_crawled": crawler.stats["total_pages"],
-                "categories": args.categories,
-                "categories_completed": crawler.stats["categories_completed"],
-                "job_id": args.job_id,
-                "message": f"{crawler.stats['total_pages']} sayfa tarandı, {crawler.stats['total_listings']} ilan bulundu, {crawler.stats['removed_listings']} ilan kaldırıldı",
-            }
-
-            print(json.dumps(result))
-            sys.stdout.flush()  # Stdout'u flush et
-            logger.info("✅ Crawler başarıyla tamamlandı")
-
-        except Exception as crawl_error:
-            logger.error(f"Crawl hatası: {crawl_error}")
-            print(json.dumps({"success": False, "error": str(crawl_error)}))
-            sys.stdout.flush()
-            raise
+        result = run_crawl_job(
+            args.categories,
+            district=args.district,
+            max_pages=args.max_pages,
+            job_id=args.job_id,
+            force=args.force,
+            reverse_sort=args.reverse_sort,
+            sync=args.sync,
+            turbo=args.turbo,
+            flush_size=args.flush_size,
+        )
 
-        finally:
-            # Browser'ı her durumda kapat
-            logger.info("🔒 Chrome kapatılıyor...")
-            crawler.close_browser()
-            logger.info("✅ Chrome kapatıldı")
+        # JSON output (API için)
+        print(json.dumps(result))
+        sys.stdout.flush()  # Stdout'u flush et
+        logger.info("✅ Crawler başarıyla tamamlandı")
 
     except Exception as e:
         logger.error(f"Crawler hatası: {e}")
@@ -17,10 +17,16 @@ Kullanım:
 import asyncio
 import json
 import os
+import sys
 from datetime import datetime
+from pathlib import Path
 from typing import Optional
 from sahibinden_crawl4ai import SahibindenCrawl4AI
 
+# Ortak liste parser (admin_remix/listing_parser.py)
+sys.path.append(str(Path(__file__).parent / "admin_remix"))
+from listing_parser import get_listing_parser
+
 # Hendek kategorileri ve URL'leri
 HENDEK_CATEGORIES = {
     "konut_satilik": {
@@ -76,6 +82,7 @@ OUTPUT_FILE = "hendek_tum_ilanlar.json"
 class BatchCrawler:
     def __init__(self, headless: bool = False):
         self.crawler = SahibindenCrawl4AI()
+        self.listing_parser = get_listing_parser()
         self.headless = headless
         self.all_listings = []
         self.stats = {
@@ -153,7 +160,7 @@ class BatchCrawler:
                     })
                     break
 
-                listings = await self.crawler.extract_listings(result["html"])
+                listings = self.listing_parser.parse(result["html"])
 
                 if not listings:
                     print(f"   ℹ️ Bu sayfada ilan yok, kategori tamamlandı")
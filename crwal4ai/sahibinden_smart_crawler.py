@@ -19,7 +19,7 @@ from bs4 import BeautifulSoup
 import time
 import logging
 import argparse
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 from typing import Optional, List, Dict, Set, Tuple
 from supabase import create_client, Client
@@ -31,6 +31,16 @@ import sys
 # Import Decision Engine
 from crawl_decision_engine import CrawlDecisionEngine
 
+# Ortak liste parser (admin_remix/listing_parser.py)
+sys.path.append(str(Path(__file__).parent / "admin_remix"))
+from listing_parser import (
+    get_listing_parser,
+    parse_price,
+    parse_listing_date,
+    is_new_listing,
+)
+from listing_id_index import ListingIdIndex, SYNC_SAFETY_MARGIN
+
 # Load environment
 load_dotenv()
 
@@ -94,87 +104,6 @@ BATCH_SIZE_LARGE = 200   # For categories with > 500 listings (4x faster DB thro
 
 
 
-def parse_price(price_str: str) -> int:
-    """Fiyat string'ini integer'a çevirir"""
-    if not price_str:
-        return 0
-    try:
-        cleaned = ''.join(filter(str.isdigit, str(price_str)))
-        return int(cleaned) if cleaned else 0
-    except:
-        return 0
-
-
-def parse_listing_date(date_str: str) -> Optional[datetime]:
-    """İlan tarihini parse et"""
-    if not date_str:
-        return None
-    
-    try:
-        now = datetime.now()
-        date_str = date_str.strip()
-        
-        # "Bugün 14:30"
-        if date_str.startswith("Bugün"):
-            time_part = date_str.replace("Bugün", "").strip()
-            if time_part and ":" in time_part:
-                hour, minute = map(int, time_part.split(":"))
-                return now.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            return now
-        
-        # "Dün 09:15"
-        if date_str.startswith("Dün"):
-            time_part = date_str.replace("Dün", "").strip()
-            yesterday = now - timedelta(days=1)
-            if time_part and ":" in time_part:
-                hour, minute = map(int, time_part.split(":"))
-                return yesterday.replace(hour=hour, minute=minute, second=0, microsecond=0)
-            return yesterday
-        
-        # Türkçe ay isimleri
-        months = {
-            "Ocak": 1, "Şubat": 2, "Mart": 3, "Nisan": 4,
-            "Mayıs": 5, "Haziran": 6, "Temmuz": 7, "Ağustos": 8,
-            "Eylül": 9, "Ekim": 10, "Kasım": 11, "Aralık": 12
-        }
-        
-        # "15 Ocak" veya "15 Ocak 2024"
-        parts = date_str.split()
-        if len(parts) >= 2:
-            day = int(parts[0])
-            month_name = parts[1]
-            year = int(parts[2]) if len(parts) >= 3 else now.year
-            
-            if month_name in months:
-                month = months[month_name]
-                return datetime(year, month, day)
-        
-        return None
-        
-    except Exception as e:
-        logger.debug(f"Tarih parse hatası: {date_str} -> {e}")
-        return None
-
-
-def is_new_listing(listing_date: Optional[datetime]) -> bool:
-    """İlan yeni mi? (Bugün veya dün)"""
-    if not listing_date:
-        return False
-    
-    now = datetime.now()
-    
-    # Bugün mü?
-    if listing_date.date() == now.date():
-        return True
-    
-    # Dün mü?
-    yesterday = now - timedelta(days=1)
-    if listing_date.date() == yesterday.date():
-        return True
-    
-    return False
-
-
 class SmartSahibindenCrawler:
     """Akıllı Sahibinden Crawler - Optimized"""
     
@@ -182,7 +111,7 @@ class SmartSahibindenCrawler:
         self.driver = None
         self.job_id = job_id
         self.supabase: Optional[Client] = None
-        self.db_listing_ids: Set[int] = set()
+        self.db_listing_ids = ListingIdIndex()
         
         self.stats = {
             "started_at": None,
@@ -197,6 +126,8 @@ class SmartSahibindenCrawler:
             "category_comparison": {},
         }
         
+        self.listing_parser = get_listing_parser()
+        
         self._init_supabase()
         self._load_db_listing_ids()
         
@@ -213,14 +144,41 @@ class SmartSahibindenCrawler:
         logger.info("✅ Supabase bağlantısı kuruldu")
     
     def _load_db_listing_ids(self):
-        """Veritabanındaki tüm ilan ID'lerini yükle"""
+        """Veritabanındaki ilan ID'lerini yükle (cache + sadece değişenler)"""
+
+        # PostgREST naive zamanı UTC sayar: yerel saatle yazılırsa (örn. UTC+3)
+        # her refresh saatlerce yeni / kaldırılan id'yi kaçırır
+        def _utc_iso(epoch):
+            return datetime.fromtimestamp(epoch, tz=timezone.utc).isoformat()
+
+        def fetch_ids(since):
+            sync_epoch = time.time()
+            query = self.supabase.table("sahibinden_liste").select("id")
+            if since is not None:
+                since_iso = _utc_iso(since - SYNC_SAFETY_MARGIN)
+                query = query.gt("crawled_at", since_iso)
+            result = query.execute()
+            return (int(r["id"]) for r in result.data), sync_epoch
+
+        def fetch_removed(since):
+            since_iso = _utc_iso(since - SYNC_SAFETY_MARGIN)
+            result = (
+                self.supabase.table("removed_listings")
+                .select("listing_id")
+                .gt("removed_at", since_iso)
+                .execute()
+            )
+            return (int(r["listing_id"]) for r in result.data)
+
         try:
-            result = self.supabase.table("sahibinden_liste").select("id").execute()
-            self.db_listing_ids = {int(r["id"]) for r in result.data}
-            logger.info(f"📥 {len(self.db_listing_ids)} mevcut ilan ID'si yüklendi")
+            self.db_listing_ids = ListingIdIndex.load(
+                SCRIPT_DIR / "admin_remix" / "cache" / "smart_listing_ids.bin",
+                fetch_ids=fetch_ids,
+                fetch_removed=fetch_removed,
+            )
         except Exception as e:
             logger.error(f"❌ DB ID'leri yüklenemedi: {e}")
-            self.db_listing_ids = set()
+            self.db_listing_ids = ListingIdIndex()
 
     def _update_category_stats(self, category: str, transaction: str, sahibinden_count: int):
         """category_stats tablosunu güncelle"""
@@ -343,69 +301,31 @@ class SmartSahibindenCrawler:
             return 3  # Large: exit after 3 old pages
     
     def _parse_listings_from_page(self, html: str, category: str, transaction: str) -> List[Dict]:
-        """Sayfadan ilanları parse et"""
+        """Sayfadan ilanları parse et (ortak listing_parser ile)"""
         listings = []
         
         try:
-            soup = BeautifulSoup(html, 'html.parser')
-            
-            # İlan kartlarını bul
-            listing_cards = soup.find_all('tr', {'class': 'searchResultsItem'})
-            
-            for card in listing_cards:
-                try:
-                    # ID
-                    listing_id = card.get('data-id')
-                    if not listing_id:
-                        continue
-                    
-                    listing_id = int(listing_id)
-                    
-                    # Başlık ve link
-                    title_elem = card.find('a', {'class': 'classifiedTitle'})
-                    if not title_elem:
-                        continue
-                    
-                    baslik = title_elem.get_text(strip=True)
-                    link = "https://www.sahibinden.com" + title_elem['href']
-                    
-                    # Fiyat
-                    price_elem = card.find('td', {'class': 'searchResultsPriceValue'})
-                    fiyat_str = price_elem.get_text(strip=True) if price_elem else ""
-                    fiyat = parse_price(fiyat_str)
-                    
-                    # Konum
-                    location_elem = card.find('td', {'class': 'searchResultsLocationValue'})
-                    konum = location_elem.get_text(strip=True) if location_elem else ""
-                    
-                    # Tarih
-                    date_elem = card.find('td', {'class': 'searchResultsDateValue'})
-                    tarih_str = date_elem.get_text(strip=True) if date_elem else ""
-                    
-                    # Resim
-                    img_elem = card.find('img')
-                    resim = img_elem.get('data-src') or img_elem.get('src', '') if img_elem else ""
-                    
-                    listing = {
-                        "id": listing_id,
-                        "baslik": baslik,
-                        "link": link,
-                        "fiyat": fiyat,
-                        "konum": konum,
-                        "tarih": tarih_str,
-                        "resim": resim,
-                        "category": category,
-                        "transaction": transaction,
-                    }
-                    
-                    listings.append(listing)
-                    
-                except Exception as e:
-                    logger.debug(f"İlan parse hatası: {e}")
-                    continue
-            
+            rows = self.listing_parser.parse_rows(html, category, transaction)
         except Exception as e:
             logger.error(f"❌ Sayfa parse hatası: {e}")
+            return listings
+        
+        for row in rows:
+            try:
+                listings.append({
+                    "id": int(row.id),
+                    "baslik": row.baslik,
+                    "link": row.link,
+                    "fiyat": row.price_value,
+                    "konum": row.konum or "",
+                    "tarih": row.tarih or "",
+                    "resim": row.resim_lazy or row.resim or "",
+                    "category": row.category,
+                    "transaction": row.transaction,
+                })
+            except ValueError as e:
+                logger.debug(f"İlan parse hatası: {e}")
+                continue
         
         return listings
     
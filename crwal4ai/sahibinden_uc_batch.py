@@ -18,10 +18,10 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.action_chains import ActionChains
-from bs4 import BeautifulSoup
 import time
 import json
 import os
+import sys
 import random
 import logging
 import argparse
@@ -30,6 +30,10 @@ from pathlib import Path
 from typing import Optional, List, Dict
 from dotenv import load_dotenv
 
+# Ortak liste parser (admin_remix/listing_parser.py)
+sys.path.append(str(Path(__file__).parent / "admin_remix"))
+from listing_parser import get_listing_parser
+
 # Load environment
 load_dotenv()
 
@@ -110,6 +114,7 @@ class SahibindenUCCrawler:
             "errors": [],
         }
         self.checkpoint = self._load_checkpoint()
+        self.listing_parser = get_listing_parser()
         
         # Initialize Supabase if job_id provided
         if self.job_id and HAS_SUPABASE:
@@ -386,56 +391,8 @@ class SahibindenUCCrawler:
             pass
     
     def extract_listings(self, html: str) -> List[Dict]:
-        """HTML'den ilan listesini çıkar"""
-        soup = BeautifulSoup(html, 'html.parser')
-        listings = []
-        
-        rows = soup.select('#searchResultsTable tbody tr.searchResultsItem')
-        
-        for row in rows:
-            try:
-                listing = {}
-                
-                # ID
-                listing["id"] = row.get("data-id", "")
-                
-                # Başlık ve link
-                title_el = row.select_one("a.classifiedTitle")
-                if title_el:
-                    listing["baslik"] = title_el.get("title", "").strip()
-                    href = title_el.get("href", "")
-                    if href and href != "#":
-                        listing["link"] = f"https://www.sahibinden.com{href}" if href.startswith("/") else href
-                    elif listing["id"]:
-                        listing["link"] = f"https://www.sahibinden.com/ilan/{listing['id']}"
-                
-                # Fiyat
-                price_el = row.select_one("td.searchResultsPriceValue span")
-                if price_el:
-                    listing["fiyat"] = price_el.get_text(strip=True)
-                
-                # Konum
-                loc_el = row.select_one("td.searchResultsLocationValue")
-                if loc_el:
-                    listing["konum"] = " ".join(loc_el.get_text(strip=True).split())
-                
-                # Tarih
-                date_el = row.select_one("td.searchResultsDateValue span")
-                if date_el:
-                    listing["tarih"] = date_el.get_text(strip=True)
-                
-                # Resim
-                img_el = row.select_one("td.searchResultsLargeThumbnail img")
-                if img_el:
-                    listing["resim"] = img_el.get("src", "")
-                
-                if listing.get("id") and listing.get("link"):
-                    listings.append(listing)
-                    
-            except Exception as e:
-                continue
-        
-        return listings
+        """HTML'den ilan listesini çıkar (ortak listing_parser ile)"""
+        return self.listing_parser.parse(html)
     
     def crawl_category(self, key: str, config: dict, max_pages: int) -> List[Dict]:
         """Tek kategoriyi crawl et"""
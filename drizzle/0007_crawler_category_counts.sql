@@ -0,0 +1,8 @@
+-- Migration: Crawler category reconciliation index
+-- Purpose: Crawler'ın ön analiz adımındaki tek GROUP BY sorgusu
+--          (category, transaction, ilce bazında COUNT) index-only scan ile çalışsın
+
+CREATE INDEX IF NOT EXISTS idx_sahibinden_liste_cat_trans_ilce
+ON sahibinden_liste(category, transaction, ilce);
+
+COMMENT ON INDEX idx_sahibinden_liste_cat_trans_ilce IS 'Covering index for grouped category/transaction/ilce counts (crawler reconciliation)';
@@ -0,0 +1,22 @@
+-- Migration: Keyset pagination indexes
+-- Purpose: Admin API listelerinin cursor modu (sıralama ifadesi, id) üzerinden
+--          seek eder; ifadeler crwal4ai/admin_remix/pagination.py ile birebir aynı olmalı
+-- Not: Zaman kolonları timestamptz; sentinel 'infinity'::timestamptz olmalı
+--      ('infinity'::timestamp STABLE cast gerektirir, index ifadesinde reddedilir)
+
+CREATE INDEX IF NOT EXISTS idx_sahibinden_liste_crawled_at_id
+ON sahibinden_liste ((COALESCE(crawled_at, 'infinity'::timestamptz)), id);
+
+CREATE INDEX IF NOT EXISTS idx_sahibinden_liste_fiyat_id
+ON sahibinden_liste ((COALESCE(fiyat, 9223372036854775807)), id);
+
+CREATE INDEX IF NOT EXISTS idx_new_listings_first_seen_listing_id
+ON new_listings ((COALESCE(first_seen_at, 'infinity'::timestamptz)), listing_id);
+
+CREATE INDEX IF NOT EXISTS idx_removed_listings_removed_listing_id
+ON removed_listings ((COALESCE(removed_at, 'infinity'::timestamptz)), listing_id);
+
+COMMENT ON INDEX idx_sahibinden_liste_crawled_at_id IS 'Keyset pagination for /api/listings sort_by=date_desc';
+COMMENT ON INDEX idx_sahibinden_liste_fiyat_id IS 'Keyset pagination for /api/listings sort_by=price_asc/price_desc';
+COMMENT ON INDEX idx_new_listings_first_seen_listing_id IS 'Keyset pagination for /api/new-listings';
+COMMENT ON INDEX idx_removed_listings_removed_listing_id IS 'Keyset pagination for /api/removed-listings';
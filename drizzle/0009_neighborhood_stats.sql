@@ -0,0 +1,45 @@
+-- Migration: Neighborhood aggregates for the crawler map
+-- Purpose: /api/map/neighborhoods tüm sahibinden_liste'yi taramak yerine
+--          (ilce, mahalle, category, transaction) özet tablosundan okur.
+--          Mahalle ifadesi crwal4ai/admin_remix/neighborhood_stats.py
+--          mahalle_key_sql() ile birebir aynı olmalı.
+
+CREATE TABLE IF NOT EXISTS neighborhood_stats (
+    id bigserial PRIMARY KEY,
+    ilce text NOT NULL DEFAULT '',
+    mahalle text NOT NULL,
+    category text NOT NULL DEFAULT '',
+    transaction text NOT NULL DEFAULT '',
+    listing_count integer NOT NULL DEFAULT 0,
+    priced_count integer NOT NULL DEFAULT 0,
+    price_sum numeric NOT NULL DEFAULT 0,
+    min_price bigint,
+    max_price bigint,
+    updated_at timestamp with time zone DEFAULT now(),
+    CONSTRAINT neighborhood_stats_key UNIQUE (ilce, mahalle, category, transaction)
+);
+
+-- Artımlı yenileme: etkilenen mahalle anahtarlarının satırlarını bulur
+CREATE INDEX IF NOT EXISTS idx_sahibinden_liste_map_mahalle
+ON sahibinden_liste ((btrim(replace(replace(replace(replace(konum, 'Merkez', ''), 'Köyler', ''), ' Mah.', ''), ' Mh.', ''), E' \t\r\n')), category, transaction);
+
+-- İlk doldurma
+INSERT INTO neighborhood_stats
+    (ilce, mahalle, category, transaction, listing_count, priced_count, price_sum, min_price, max_price)
+SELECT
+    COALESCE(ilce, ''),
+    btrim(replace(replace(replace(replace(konum, 'Merkez', ''), 'Köyler', ''), ' Mah.', ''), ' Mh.', ''), E' \t\r\n'),
+    COALESCE(category, ''),
+    COALESCE(transaction, ''),
+    COUNT(*),
+    COUNT(*) FILTER (WHERE fiyat > 0),
+    COALESCE(SUM(fiyat) FILTER (WHERE fiyat > 0), 0),
+    MIN(fiyat) FILTER (WHERE fiyat > 0),
+    MAX(fiyat) FILTER (WHERE fiyat > 0)
+FROM sahibinden_liste
+WHERE btrim(replace(replace(replace(replace(konum, 'Merkez', ''), 'Köyler', ''), ' Mah.', ''), ' Mh.', ''), E' \t\r\n') <> ''
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (ilce, mahalle, category, transaction) DO NOTHING;
+
+COMMENT ON TABLE neighborhood_stats IS 'Per-neighborhood listing counts and price aggregates for /api/map/neighborhoods (maintained by the crawler)';
+COMMENT ON INDEX idx_sahibinden_liste_map_mahalle IS 'Incremental neighborhood_stats refresh by derived mahalle key';
@@ -0,0 +1,18 @@
+-- Migration: Crawler data change notifications
+-- Purpose: Admin panelin yanıt cache'i (crwal4ai/admin_remix/response_cache.py)
+--          'crawler_data_changed' kanalını dinler. Crawler job'u başladığında,
+--          ilerlediğinde veya bittiğinde bildirim gider; cache generation'ı artar.
+
+CREATE OR REPLACE FUNCTION notify_crawler_data_changed() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_notify('crawler_data_changed', NEW.id::text || ':' || COALESCE(NEW.status, ''));
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS mining_jobs_notify_data_changed ON mining_jobs;
+CREATE TRIGGER mining_jobs_notify_data_changed
+AFTER INSERT OR UPDATE OF status, progress, stats ON mining_jobs
+FOR EACH ROW EXECUTE FUNCTION notify_crawler_data_changed();
+
+COMMENT ON FUNCTION notify_crawler_data_changed() IS 'NOTIFY crawler_data_changed on mining_jobs writes (admin response cache invalidation)';
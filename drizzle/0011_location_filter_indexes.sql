@@ -0,0 +1,37 @@
+-- Migration: Normalized district / mahalle filters
+-- Purpose: İlçe ve mahalle filtreleri LOWER(konum) LIKE '%x%' yerine normalize
+--          edilmiş ilce / mahalle kolonları üzerinden çalışır. İfadeler
+--          crwal4ai/admin_remix/location_utils.py (ilce_key_sql / mahalle_column_key_sql)
+--          ile birebir aynı olmalı. Eski kayıtlar için: python backfill_locations.py
+
+-- new_listings'te konum kolonları yoktu (crawler artık dolduruyor)
+ALTER TABLE new_listings ADD COLUMN IF NOT EXISTS ilce varchar(255);
+ALTER TABLE new_listings ADD COLUMN IF NOT EXISTS semt varchar(255);
+ALTER TABLE new_listings ADD COLUMN IF NOT EXISTS mahalle varchar(255);
+
+ALTER TABLE removed_listings ADD COLUMN IF NOT EXISTS ilce varchar(255);
+ALTER TABLE removed_listings ADD COLUMN IF NOT EXISTS semt varchar(255);
+ALTER TABLE removed_listings ADD COLUMN IF NOT EXISTS mahalle varchar(255);
+
+-- Sayım / fiyat trendi (ilçe + tarih aralığı)
+CREATE INDEX IF NOT EXISTS idx_sahibinden_liste_lower_ilce_crawled
+ON sahibinden_liste (lower(ilce), crawled_at);
+
+-- Emsal ilanlar (ilçe + mahalle)
+CREATE INDEX IF NOT EXISTS idx_sahibinden_liste_lower_ilce_mahalle
+ON sahibinden_liste (lower(ilce), lower(regexp_replace(mahalle, '\s+(mahallesi|mah\.?|mh\.?)$', '', 'i')));
+
+CREATE INDEX IF NOT EXISTS idx_new_listings_lower_ilce_created
+ON new_listings (lower(ilce), created_at);
+
+CREATE INDEX IF NOT EXISTS idx_removed_listings_lower_ilce_removed
+ON removed_listings (lower(ilce), removed_at);
+
+CREATE INDEX IF NOT EXISTS idx_removed_listings_lower_ilce_mahalle
+ON removed_listings (lower(ilce), lower(regexp_replace(mahalle, '\s+(mahallesi|mah\.?|mh\.?)$', '', 'i')));
+
+COMMENT ON INDEX idx_sahibinden_liste_lower_ilce_crawled IS 'District filter (lower(ilce)) for dashboard counts, category stats and price trends';
+COMMENT ON INDEX idx_sahibinden_liste_lower_ilce_mahalle IS 'District + neighborhood filter for valuation comparables';
+COMMENT ON INDEX idx_new_listings_lower_ilce_created IS 'District filter for new listing counts';
+COMMENT ON INDEX idx_removed_listings_lower_ilce_removed IS 'District filter for removed listing counts';
+COMMENT ON INDEX idx_removed_listings_lower_ilce_mahalle IS 'District + neighborhood filter for archived valuation comparables';
@@ -0,0 +1,22 @@
+-- Migration: Listing title search
+-- Purpose: /api/listings?search= baslik ILIKE '%x%' (tam tablo taraması) yerine
+--          Türkçe katlanmış başlık tsvector'ü + GIN index kullanır. Eşleme
+--          crwal4ai/admin_remix/listing_search.py (FOLD_FROM / FOLD_TO) ile
+--          birebir aynı olmalı.
+
+-- İ/I/ı -> i, ş -> s, ğ -> g, ü -> u, ö -> o, ç -> c, şapkalılar; "+/.,-" -> boşluk
+CREATE OR REPLACE FUNCTION search_fold(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$
+    SELECT lower(translate($1, 'İIıŞşĞğÜüÖöÇçÂâÎîÛû+/.,-', 'iiissgguuooccaaiiuu     '))
+$$;
+
+-- Generated kolon: crawler / COPY upsert değişmeden her yazımda güncellenir
+ALTER TABLE sahibinden_liste ADD COLUMN IF NOT EXISTS baslik_tsv tsvector
+GENERATED ALWAYS AS (to_tsvector('simple', search_fold(COALESCE(baslik, '')))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_sahibinden_liste_baslik_tsv
+ON sahibinden_liste USING gin (baslik_tsv);
+
+COMMENT ON FUNCTION search_fold(text) IS 'Turkish-insensitive folding for listing title search';
+COMMENT ON COLUMN sahibinden_liste.baslik_tsv IS 'Folded title tokens for /api/listings search (prefix tsquery)';
+COMMENT ON INDEX idx_sahibinden_liste_baslik_tsv IS 'Title search for /api/listings?search=';
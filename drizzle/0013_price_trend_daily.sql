@@ -0,0 +1,59 @@
+-- Migration: Daily price-trend rollup
+-- Purpose: /api/stats/price-trends her istekte sahibinden_liste'yi DATE(crawled_at)
+--          ile gruplamak yerine günlük özet tablodan okur. Satırlar her crawl
+--          job'unun sonunda job'un başladığı günden bugüne yeniden hesaplanır;
+--          bugünün verisi hâlâ ham tablodan okunur.
+--          price_sketch: {"<bucket>": adet} log-bucket histogram, bucket =
+--          ceil(ln(fiyat) / ln(γ)), γ = 1.01 / 0.99 (crwal4ai/admin_remix/price_sketch.py)
+
+CREATE TABLE IF NOT EXISTS price_trend_daily (
+    day date NOT NULL,
+    ilce text NOT NULL DEFAULT '',
+    category text NOT NULL DEFAULT '',
+    transaction text NOT NULL DEFAULT '',
+    listing_count integer NOT NULL DEFAULT 0,
+    priced_count integer NOT NULL DEFAULT 0,
+    price_sum numeric NOT NULL DEFAULT 0,
+    min_price bigint,
+    max_price bigint,
+    price_sketch jsonb NOT NULL DEFAULT '{}'::jsonb,
+    updated_at timestamp with time zone DEFAULT now(),
+    CONSTRAINT price_trend_daily_key PRIMARY KEY (day, ilce, category, transaction)
+);
+
+-- İlçe filtresi (district_condition: lower(ilce) = lower(%s))
+CREATE INDEX IF NOT EXISTS idx_price_trend_daily_lower_ilce_day
+ON price_trend_daily (lower(ilce), day);
+
+-- Mevcut ham veriden ilk doldurma
+INSERT INTO price_trend_daily (day, ilce, category, transaction, listing_count,
+                               priced_count, price_sum, min_price, max_price, price_sketch)
+WITH buckets AS (
+    SELECT
+        DATE(crawled_at) AS day,
+        COALESCE(ilce, '') AS ilce,
+        COALESCE(category, '') AS category,
+        COALESCE(transaction, '') AS transaction,
+        CASE WHEN fiyat > 0 THEN ceil(ln(fiyat::float8) / 0.020000666706669435)::int END AS bucket,
+        COUNT(*) AS n,
+        SUM(fiyat) FILTER (WHERE fiyat > 0) AS price_sum,
+        MIN(fiyat) FILTER (WHERE fiyat > 0) AS min_price,
+        MAX(fiyat) FILTER (WHERE fiyat > 0) AS max_price
+    FROM sahibinden_liste
+    WHERE crawled_at IS NOT NULL
+    GROUP BY 1, 2, 3, 4, 5
+)
+SELECT day, ilce, category, transaction,
+       SUM(n),
+       COALESCE(SUM(n) FILTER (WHERE bucket IS NOT NULL), 0),
+       COALESCE(SUM(price_sum), 0),
+       MIN(min_price),
+       MAX(max_price),
+       COALESCE(jsonb_object_agg(bucket, n) FILTER (WHERE bucket IS NOT NULL), '{}'::jsonb)
+FROM buckets
+GROUP BY 1, 2, 3, 4
+ON CONFLICT (day, ilce, category, transaction) DO NOTHING;
+
+COMMENT ON TABLE price_trend_daily IS 'Daily price rollup per district/category/transaction, refreshed at the end of each crawl job';
+COMMENT ON COLUMN price_trend_daily.price_sketch IS 'Mergeable log-bucket price histogram (1% relative accuracy) for median / percentiles';
+COMMENT ON INDEX idx_price_trend_daily_lower_ilce_day IS 'District filter for /api/stats/price-trends';
@@ -0,0 +1,32 @@
+-- Migration: Neighborhood price quantile sketches
+-- Purpose: /api/map/neighborhoods ve /api/stats/neighborhoods p25 / medyan / p75
+--          değerlerini ham fiyatları sıralamadan neighborhood_stats'taki
+--          birleştirilebilir sketch'lerden okur. Crawler her batch'te etkilenen
+--          anahtarların sketch'ini yeniden hesaplar (neighborhood_stats.py).
+--          Bucket ifadesi crwal4ai/admin_remix/price_sketch.py bucket_sql() ile aynı.
+
+ALTER TABLE neighborhood_stats
+ADD COLUMN IF NOT EXISTS price_sketch jsonb NOT NULL DEFAULT '{}'::jsonb;
+
+-- Mevcut anahtarların sketch'lerini doldur
+UPDATE neighborhood_stats n
+SET price_sketch = f.price_sketch
+FROM (
+    SELECT ilce, mahalle, category, transaction, jsonb_object_agg(bucket, cnt) AS price_sketch
+    FROM (
+        SELECT
+            COALESCE(ilce, '') AS ilce,
+            btrim(replace(replace(replace(replace(konum, 'Merkez', ''), 'Köyler', ''), ' Mah.', ''), ' Mh.', ''), E' \t\r\n') AS mahalle,
+            COALESCE(category, '') AS category,
+            COALESCE(transaction, '') AS transaction,
+            ceil(ln(fiyat::float8) / 0.020000666706669435)::int AS bucket,
+            COUNT(*) AS cnt
+        FROM sahibinden_liste
+        WHERE fiyat > 0
+        GROUP BY 1, 2, 3, 4, 5
+    ) buckets
+    GROUP BY 1, 2, 3, 4
+) f
+WHERE (n.ilce, n.mahalle, n.category, n.transaction) = (f.ilce, f.mahalle, f.category, f.transaction);
+
+COMMENT ON COLUMN neighborhood_stats.price_sketch IS 'Mergeable log-bucket price histogram (1% relative accuracy) for p25 / median / p75';
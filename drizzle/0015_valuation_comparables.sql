@@ -0,0 +1,44 @@
+-- Migration: Indexed valuation comparables
+-- Purpose: Emsal ilanlar (DatabaseManager.get_valuation_comparables) aktif ve
+--          arşiv ilanları tek sorguda, (kategori, işlem, ilçe, fiyat bandı,
+--          mahalle) index'inden okur ve benzerliğe göre sıralar.
+--          price_band / area_m2 ifadeleri crwal4ai/admin_remix/comparables.py
+--          (price_band_sql, LN_PRICE_BAND) ile birebir aynı olmalı.
+
+-- Fiyat bandı: floor(ln(fiyat) / ln(1.25)), her band %25 genişliğinde
+ALTER TABLE sahibinden_liste
+ADD COLUMN IF NOT EXISTS price_band smallint
+GENERATED ALWAYS AS (
+    CASE WHEN fiyat > 0 THEN floor(ln(fiyat::float8) / 0.22314355131420976)::smallint END
+) STORED;
+
+-- m² detay verisinden ("120", "1.250 m²" -> 1250); boş / 0 ise NULL
+ALTER TABLE sahibinden_liste
+ADD COLUMN IF NOT EXISTS area_m2 integer
+GENERATED ALWAYS AS (
+    NULLIF(NULLIF(left(regexp_replace(m2, '[^0-9]', '', 'g'), 7), '')::integer, 0)
+) STORED;
+
+ALTER TABLE removed_listings
+ADD COLUMN IF NOT EXISTS price_band smallint
+GENERATED ALWAYS AS (
+    CASE WHEN last_price > 0 THEN floor(ln(last_price::float8) / 0.22314355131420976)::smallint END
+) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_sahibinden_liste_comparables
+ON sahibinden_liste (
+    category, transaction, lower(ilce), price_band,
+    lower(regexp_replace(mahalle, '\s+(mahallesi|mah\.?|mh\.?)$', '', 'i'))
+);
+
+CREATE INDEX IF NOT EXISTS idx_removed_listings_comparables
+ON removed_listings (
+    category, transaction, lower(ilce), price_band,
+    lower(regexp_replace(mahalle, '\s+(mahallesi|mah\.?|mh\.?)$', '', 'i'))
+);
+
+COMMENT ON COLUMN sahibinden_liste.price_band IS 'floor(ln(fiyat) / ln(1.25)) - 25% price band for valuation comparables';
+COMMENT ON COLUMN sahibinden_liste.area_m2 IS 'Numeric m2 parsed from detail data (NULL when unknown)';
+COMMENT ON COLUMN removed_listings.price_band IS 'floor(ln(last_price) / ln(1.25)) - 25% price band for archived comparables';
+COMMENT ON INDEX idx_sahibinden_liste_comparables IS 'Valuation comparables: category + transaction + district + price band + neighborhood';
+COMMENT ON INDEX idx_removed_listings_comparables IS 'Archived valuation comparables: category + transaction + district + price band + neighborhood';
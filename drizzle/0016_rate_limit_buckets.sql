@@ -0,0 +1,16 @@
+-- Migration: Shared crawler rate-limit buckets
+-- Purpose: RATE_LIMIT_BACKEND=postgres iken crawler süreçleri (liste crawler,
+--          paralel crawler, crawler API) tek bir dakikalık istek bütçesini
+--          paylaşır. Her istek bucket satırını tek bir upsert ile günceller
+--          (crwal4ai/admin_remix/rate_limiter.py PostgresTokenBucket); satır
+--          kilidi eşzamanlı rezervasyonları sıraya koyar. tokens eksiye
+--          düşebilir: sıradaki isteklerin ayırdığı, henüz dolmamış token'lar.
+
+CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+    name text PRIMARY KEY,
+    tokens double precision NOT NULL,
+    updated_at timestamp with time zone NOT NULL DEFAULT clock_timestamp()
+);
+
+COMMENT ON TABLE rate_limit_buckets IS 'Token buckets shared by crawler processes (one row per bucket)';
+COMMENT ON COLUMN rate_limit_buckets.tokens IS 'Tokens left at updated_at; negative = reserved by waiting requests';
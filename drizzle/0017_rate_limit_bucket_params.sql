@@ -0,0 +1,14 @@
+-- Migration: Rate-limit bucket parameters
+-- Purpose: Token hızı ve kapasitesi her çağıranın config'inden değil bucket
+--          satırından okunur; aynı bucket'ı paylaşan tüm crawler süreçleri
+--          tek bir dakikalık bütçeye tabi olur. Satırı ilk ekleyen süreç
+--          RATE_LIMIT_RPM / RATE_LIMIT_BURST değerlerini yazar, mevcut
+--          satırlarda NULL ise ilk rezervasyonda doldurulur
+--          (crwal4ai/admin_remix/rate_limiter.py PostgresTokenBucket).
+--          Bütçeyi değiştirmek için: UPDATE rate_limit_buckets SET rate = ..., capacity = ...
+
+ALTER TABLE rate_limit_buckets ADD COLUMN IF NOT EXISTS rate double precision;
+ALTER TABLE rate_limit_buckets ADD COLUMN IF NOT EXISTS capacity double precision;
+
+COMMENT ON COLUMN rate_limit_buckets.rate IS 'Refill rate in tokens per second, shared by every caller of the bucket';
+COMMENT ON COLUMN rate_limit_buckets.capacity IS 'Maximum tokens (burst size), shared by every caller of the bucket';
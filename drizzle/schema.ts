@@ -1,6 +1,12 @@
-import { pgTable, index, foreignKey, uuid, varchar, text, integer, boolean, timestamp, jsonb, numeric, unique, date, time, bigserial, bigint, check, pgEnum } from "drizzle-orm/pg-core"
+import { pgTable, index, foreignKey, uuid, varchar, text, integer, boolean, timestamp, jsonb, numeric, unique, date, time, bigserial, bigint, smallint, doublePrecision, check, pgEnum, customType, primaryKey } from "drizzle-orm/pg-core"
 import { sql } from "drizzle-orm"
 
+const tsvector = customType<{ data: string }>({
+	dataType() {
+		return "tsvector"
+	},
+})
+
 export const aiProvider = pgEnum("ai_provider", ['deepseek', 'openai', 'anthropic', 'google-gemini', 'openrouter'])
 export const appointmentStatus = pgEnum("appointment_status", ['pending', 'confirmed', 'completed', 'cancelled'])
 export const appointmentType = pgEnum("appointment_type", ['kahve', 'property_visit', 'valuation', 'consultation'])
@@ -623,6 +629,9 @@ export const newListings = pgTable("new_listings", {
 	firstSeenAt: timestamp("first_seen_at", { withTimezone: true, mode: 'string' }).defaultNow(),
 	createdAt: timestamp("created_at", { withTimezone: true, mode: 'string' }).defaultNow(),
 	updatedAt: timestamp("updated_at", { withTimezone: true, mode: 'string' }).defaultNow(),
+	ilce: varchar({ length: 255 }),
+	semt: varchar({ length: 255 }),
+	mahalle: varchar({ length: 255 }),
 }, (table) => [
 	unique("new_listings_listing_id_key").on(table.listingId),
 ]);
@@ -649,7 +658,16 @@ export const removedListings = pgTable("removed_listings", {
 	daysActive: integer("days_active"),
 	priceChanges: integer("price_changes").default(0),
 	notes: text(),
+	ilce: varchar({ length: 255 }),
+	semt: varchar({ length: 255 }),
+	mahalle: varchar({ length: 255 }),
+	priceBand: smallint("price_band").generatedAlwaysAs(sql`
+CASE
+    WHEN (last_price > 0) THEN (floor((ln((last_price)::double precision) / (0.22314355131420976)::double precision)))::smallint
+    ELSE NULL::smallint
+END`),
 }, (table) => [
+	index("idx_removed_listings_comparables").using("btree", table.category.asc().nullsLast().op("text_ops"), table.transaction.asc().nullsLast().op("text_ops"), sql`lower((ilce)::text)`, table.priceBand.asc().nullsLast().op("int2_ops"), sql`lower(regexp_replace((mahalle)::text, '\\s+(mahallesi|mah\\.?|mh\\.?)$'::text, ''::text, 'i'::text))`),
 	unique("removed_listings_listing_id_key").on(table.listingId),
 ]);
 
@@ -668,6 +686,51 @@ export const categoryStats = pgTable("category_stats", {
 	unique("category_stats_category_transaction_key").on(table.category, table.transaction),
 ]);
 
+export const neighborhoodStats = pgTable("neighborhood_stats", {
+	id: bigserial({ mode: "bigint" }).primaryKey().notNull(),
+	ilce: text().default('').notNull(),
+	mahalle: text().notNull(),
+	category: text().default('').notNull(),
+	transaction: text().default('').notNull(),
+	listingCount: integer("listing_count").default(0).notNull(),
+	pricedCount: integer("priced_count").default(0).notNull(),
+	priceSum: numeric("price_sum").default('0').notNull(),
+	// You can use { mode: "bigint" } if numbers are exceeding js number limitations
+	minPrice: bigint("min_price", { mode: "number" }),
+	// You can use { mode: "bigint" } if numbers are exceeding js number limitations
+	maxPrice: bigint("max_price", { mode: "number" }),
+	priceSketch: jsonb("price_sketch").default({}).notNull(),
+	updatedAt: timestamp("updated_at", { withTimezone: true, mode: 'string' }).defaultNow(),
+}, (table) => [
+	unique("neighborhood_stats_key").on(table.ilce, table.mahalle, table.category, table.transaction),
+]);
+
+export const priceTrendDaily = pgTable("price_trend_daily", {
+	day: date().notNull(),
+	ilce: text().default('').notNull(),
+	category: text().default('').notNull(),
+	transaction: text().default('').notNull(),
+	listingCount: integer("listing_count").default(0).notNull(),
+	pricedCount: integer("priced_count").default(0).notNull(),
+	priceSum: numeric("price_sum").default('0').notNull(),
+	// You can use { mode: "bigint" } if numbers are exceeding js number limitations
+	minPrice: bigint("min_price", { mode: "number" }),
+	// You can use { mode: "bigint" } if numbers are exceeding js number limitations
+	maxPrice: bigint("max_price", { mode: "number" }),
+	priceSketch: jsonb("price_sketch").default({}).notNull(),
+	updatedAt: timestamp("updated_at", { withTimezone: true, mode: 'string' }).defaultNow(),
+}, (table) => [
+	primaryKey({ columns: [table.day, table.ilce, table.category, table.transaction], name: "price_trend_daily_key"}),
+]);
+
+export const rateLimitBuckets = pgTable("rate_limit_buckets", {
+	name: text().primaryKey().notNull(),
+	tokens: doublePrecision().notNull(),
+	updatedAt: timestamp("updated_at", { withTimezone: true, mode: 'string' }).default(sql`clock_timestamp()`).notNull(),
+	rate: doublePrecision(),
+	capacity: doublePrecision(),
+});
+
 export const sahibindenListe = pgTable("sahibinden_liste", {
 	// You can use { mode: "bigint" } if numbers are exceeding js number limitations
 	id: bigint({ mode: "number" }).primaryKey().notNull(),
@@ -702,7 +765,16 @@ export const sahibindenListe = pgTable("sahibinden_liste", {
 	ilce: varchar({ length: 255 }),
 	semt: varchar({ length: 100 }),
 	mahalle: varchar({ length: 200 }),
+	priceBand: smallint("price_band").generatedAlwaysAs(sql`
+CASE
+    WHEN (fiyat > 0) THEN (floor((ln((fiyat)::double precision) / (0.22314355131420976)::double precision)))::smallint
+    ELSE NULL::smallint
+END`),
+	areaM2: integer("area_m2").generatedAlwaysAs(sql`NULLIF((NULLIF("left"(regexp_replace(m2, '[^0-9]'::text, ''::text, 'g'::text), 7), ''::text))::integer, 0)`),
+	baslikTsv: tsvector("baslik_tsv").generatedAlwaysAs(sql`to_tsvector('simple'::regconfig, search_fold(COALESCE(baslik, ''::text)))`),
 }, (table) => [
+	index("idx_sahibinden_liste_baslik_tsv").using("gin", table.baslikTsv.asc().nullsLast().op("tsvector_ops")),
+	index("idx_sahibinden_liste_comparables").using("btree", table.category.asc().nullsLast().op("text_ops"), table.transaction.asc().nullsLast().op("text_ops"), sql`lower((ilce)::text)`, table.priceBand.asc().nullsLast().op("int2_ops"), sql`lower(regexp_replace((mahalle)::text, '\\s+(mahallesi|mah\\.?|mh\\.?)$'::text, ''::text, 'i'::text))`),
 	index("idx_sahibinden_liste_ilce_semt").using("btree", table.ilce.asc().nullsLast().op("text_ops"), table.semt.asc().nullsLast().op("text_ops")),
 	index("idx_sahibinden_liste_mahalle").using("btree", table.mahalle.asc().nullsLast().op("text_ops")),
 	index("idx_sahibinden_liste_semt").using("btree", table.semt.asc().nullsLast().op("text_ops")),